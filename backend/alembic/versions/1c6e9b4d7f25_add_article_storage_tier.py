@@ -0,0 +1,31 @@
+"""add storage_tier to article_queue
+
+Revision ID: 1c6e9b4d7f25
+Revises: d5f1a8e3c729
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c6e9b4d7f25'
+down_revision: Union[str, None] = 'd5f1a8e3c729'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant default is stored in the catalog, so this doesn't rewrite the table
+    op.add_column('article_queue', sa.Column(
+        'storage_tier', sa.String(10), nullable=False, server_default='hot'
+    ))
+    op.add_column('article_queue', sa.Column('tiered_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('article_queue', 'tiered_at')
+    op.drop_column('article_queue', 'storage_tier')
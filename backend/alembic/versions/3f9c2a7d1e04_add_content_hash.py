@@ -0,0 +1,32 @@
+"""add content_hash to pdfs and article_queue
+
+Revision ID: 3f9c2a7d1e04
+Revises: 
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d1e04'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('pdfs', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_pdfs_content_hash'), 'pdfs', ['content_hash'], unique=True)
+    op.add_column('article_queue', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_article_queue_content_hash'), 'article_queue', ['content_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_article_queue_content_hash'), table_name='article_queue')
+    op.drop_column('article_queue', 'content_hash')
+    op.drop_index(op.f('ix_pdfs_content_hash'), table_name='pdfs')
+    op.drop_column('pdfs', 'content_hash')
@@ -0,0 +1,43 @@
+"""backfill article_queue.content_hash; allow one PDF under several DOIs
+
+Revision ID: 4d8a2c6e1f93
+Revises: 9e4b7c1a2f58
+Create Date: 2026-10-20 09:00:00.000000
+
+Hashes are taken from content-addressed keys (.../<sha256>.pdf); PDFs stored
+under other keys are hashed from S3 by scripts/hash_article_pdfs.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8a2c6e1f93'
+down_revision: Union[str, None] = '9e4b7c1a2f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Feeds can list the same PDF for a preprint and its published DOI
+    op.drop_index('ix_article_queue_content_hash', table_name='article_queue')
+    op.create_index('ix_article_queue_content_hash', 'article_queue', ['content_hash'], unique=False)
+    op.execute(r"""
+        UPDATE article_queue
+        SET content_hash = substring(pdf_s3_key from '([0-9a-f]{64})\.pdf$')
+        WHERE content_hash IS NULL AND pdf_s3_key ~ '(^|/)[0-9a-f]{64}\.pdf$'
+    """)
+
+
+def downgrade() -> None:
+    # Keep the oldest article per hash so the unique index can be rebuilt
+    op.execute("""
+        UPDATE article_queue a SET content_hash = NULL
+        WHERE EXISTS (
+            SELECT 1 FROM article_queue b
+            WHERE b.content_hash = a.content_hash AND b.id < a.id
+        )
+    """)
+    op.drop_index('ix_article_queue_content_hash', table_name='article_queue')
+    op.create_index('ix_article_queue_content_hash', 'article_queue', ['content_hash'], unique=True)
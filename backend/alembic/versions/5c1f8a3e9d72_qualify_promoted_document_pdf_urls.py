@@ -0,0 +1,65 @@
+"""store the article queue bucket in promoted documents' pdf_s3_url
+
+Revision ID: 5c1f8a3e9d72
+Revises: 7e2b9d4c1a58
+Create Date: 2026-10-20 11:00:00.000000
+
+Promotion used to copy the bare article key, which readers resolved
+against AWS_BUCKET_NAME; promoted PDFs live in the article queue bucket.
+Its name is taken from `-x article_bucket=...` or the
+AWS_ARTICLE_QUEUE_BUCKET environment variable:
+
+    alembic -x article_bucket=my-article-queue upgrade head
+"""
+import os
+from typing import Optional, Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1f8a3e9d72'
+down_revision: Union[str, None] = '7e2b9d4c1a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PROMOTED = """
+    FROM article_queue a
+    WHERE a.doi = d.doi AND a.pdf_s3_key = d.pdf_s3_url
+"""
+
+
+def _article_bucket() -> Optional[str]:
+    return context.get_x_argument(as_dictionary=True).get('article_bucket') or os.environ.get('AWS_ARTICLE_QUEUE_BUCKET')
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    bucket = _article_bucket()
+    if not bucket:
+        # Without a bucket the URLs would become NULL; only fine when nothing was promoted
+        promoted = bind.execute(sa.text(f'SELECT count(*) FROM documents d WHERE EXISTS (SELECT 1 {PROMOTED})')).scalar()
+        if promoted:
+            raise RuntimeError(
+                f'{promoted} promoted documents need the article queue bucket: '
+                'run with -x article_bucket=<name> or set AWS_ARTICLE_QUEUE_BUCKET'
+            )
+        return
+    bind.execute(sa.text(f"""
+        UPDATE documents d
+        SET pdf_s3_url = 's3://' || :bucket || '/' || d.pdf_s3_url
+        {PROMOTED}
+    """), {"bucket": bucket})
+
+
+def downgrade() -> None:
+    bucket = _article_bucket()
+    if not bucket:
+        raise RuntimeError('Run with -x article_bucket=<name> or set AWS_ARTICLE_QUEUE_BUCKET')
+    op.get_bind().execute(sa.text("""
+        UPDATE documents
+        SET pdf_s3_url = substr(pdf_s3_url, length(:prefix) + 1)
+        WHERE starts_with(pdf_s3_url, :prefix)
+    """), {"prefix": f"s3://{bucket}/"})
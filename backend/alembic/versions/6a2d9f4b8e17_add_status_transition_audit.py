@@ -0,0 +1,70 @@
+"""status transition audit table; per-row notify can be suppressed
+
+Revision ID: 6a2d9f4b8e17
+Revises: 1c6e9b4d7f25
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a2d9f4b8e17'
+down_revision: Union[str, None] = '1c6e9b4d7f25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _notify_function(suppressible: bool) -> str:
+    # Bulk transitions set app.suppress_row_notify and send one event per batch instead
+    guard = """
+            IF current_setting('app.suppress_row_notify', true) = 'on' THEN
+                RETURN NULL;
+            END IF;""" if suppressible else ""
+    return f"""
+        CREATE OR REPLACE FUNCTION notify_row_change() RETURNS trigger AS $$
+        DECLARE
+            row_data record;
+            row_status text;
+        BEGIN{guard}
+            IF TG_OP = 'DELETE' THEN
+                row_data := OLD;
+            ELSE
+                row_data := NEW;
+            END IF;
+            EXECUTE format('SELECT ($1).%I::text', TG_ARGV[0]) USING row_data INTO row_status;
+            PERFORM pg_notify('row_changes', json_build_object(
+                'table', TG_TABLE_NAME,
+                'op', lower(TG_OP),
+                'id', row_data.id,
+                'status', row_status,
+                'version', txid_current()
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """
+
+
+def upgrade() -> None:
+    op.create_table(
+        'status_transitions',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('table_name', sa.String(50), nullable=False),
+        sa.Column('to_status', sa.String(50), nullable=False),
+        sa.Column('row_ids', postgresql.JSONB(), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_status_transitions_created_at', 'status_transitions', ['created_at'])
+    op.execute(_notify_function(suppressible=True))
+
+
+def downgrade() -> None:
+    op.execute(_notify_function(suppressible=False))
+    op.drop_index('ix_status_transitions_created_at', table_name='status_transitions')
+    op.drop_table('status_transitions')
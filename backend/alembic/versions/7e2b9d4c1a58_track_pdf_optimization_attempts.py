@@ -0,0 +1,34 @@
+"""record article PDF sizes and failed optimization attempts
+
+Revision ID: 7e2b9d4c1a58
+Revises: 4d8a2c6e1f93
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2b9d4c1a58'
+down_revision: Union[str, None] = '4d8a2c6e1f93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('article_queue', sa.Column('pdf_original_size', sa.BigInteger(), nullable=True))
+    op.add_column('article_queue', sa.Column('pdf_optimized_size', sa.BigInteger(), nullable=True))
+    op.add_column('article_queue', sa.Column(
+        'pdf_optimize_attempts', sa.Integer(), nullable=False, server_default='0'
+    ))
+    op.add_column('pdfs', sa.Column('optimize_attempts', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('pdfs', 'optimize_attempts')
+    op.drop_column('article_queue', 'pdf_optimize_attempts')
+    op.drop_column('article_queue', 'pdf_optimized_size')
+    op.drop_column('article_queue', 'pdf_original_size')
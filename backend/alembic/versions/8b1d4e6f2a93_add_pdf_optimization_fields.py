@@ -0,0 +1,32 @@
+"""add optimized PDF variant fields
+
+Revision ID: 8b1d4e6f2a93
+Revises: 3f9c2a7d1e04
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1d4e6f2a93'
+down_revision: Union[str, None] = '3f9c2a7d1e04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('pdfs', sa.Column('original_size', sa.BigInteger(), nullable=True))
+    op.add_column('pdfs', sa.Column('optimized_size', sa.BigInteger(), nullable=True))
+    op.add_column('pdfs', sa.Column('optimized_s3_key', sa.String(length=255), nullable=True))
+    op.add_column('article_queue', sa.Column('pdf_optimized_s3_key', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('article_queue', 'pdf_optimized_s3_key')
+    op.drop_column('pdfs', 'optimized_s3_key')
+    op.drop_column('pdfs', 'optimized_size')
+    op.drop_column('pdfs', 'original_size')
@@ -0,0 +1,43 @@
+"""document MinHash signatures and LSH band buckets
+
+Revision ID: 9e4b7c1a2f58
+Revises: 6a2d9f4b8e17
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b7c1a2f58'
+down_revision: Union[str, None] = '6a2d9f4b8e17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'document_signatures',
+        sa.Column('document_id', sa.Integer(), sa.ForeignKey('documents.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('signature', sa.LargeBinary(), nullable=False),
+        sa.Column('num_perm', sa.Integer(), nullable=False),
+        sa.Column('shingle_count', sa.Integer(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    # (band, bucket) leads the key so a lookup is one index probe per band
+    op.create_table(
+        'document_lsh_bands',
+        sa.Column('band', sa.SmallInteger(), primary_key=True),
+        sa.Column('bucket', sa.BigInteger(), primary_key=True),
+        sa.Column('document_id', sa.Integer(), sa.ForeignKey('documents.id', ondelete='CASCADE'), primary_key=True),
+    )
+    op.create_index('ix_document_lsh_bands_document_id', 'document_lsh_bands', ['document_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_lsh_bands_document_id', table_name='document_lsh_bands')
+    op.drop_table('document_lsh_bands')
+    op.drop_table('document_signatures')
@@ -0,0 +1,55 @@
+"""track article changes with a per-row version instead of timestamps
+
+Revision ID: a6d3e8b2f914
+Revises: 5c1f8a3e9d72
+Create Date: 2026-10-20 12:00:00.000000
+
+updated_at > promoted_at compares transaction start times, so a write
+committed while a promotion batch was running could look promoted.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d3e8b2f914'
+down_revision: Union[str, None] = '5c1f8a3e9d72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns promotion copies into documents, sections and chunks
+PROMOTED_COLUMNS = ('doi', 'title', 'authors', 'publication_date', 'status', 'pdf_s3_key', 'annotation_data')
+
+
+def upgrade() -> None:
+    op.add_column('article_queue', sa.Column('change_version', sa.BigInteger(), nullable=False, server_default='0'))
+    op.add_column('article_queue', sa.Column('promoted_version', sa.BigInteger(), nullable=True))
+    # Rows promoted after their last change count as promoted at version 0
+    op.execute("""
+        UPDATE article_queue SET promoted_version = 0
+        WHERE promoted_at IS NOT NULL AND (updated_at IS NULL OR updated_at <= promoted_at)
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION article_queue_bump_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_version := OLD.change_version + 1;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    changed = ' OR '.join(f'OLD.{c} IS DISTINCT FROM NEW.{c}' for c in PROMOTED_COLUMNS)
+    op.execute(f"""
+        CREATE TRIGGER article_queue_bump_version
+        BEFORE UPDATE ON article_queue
+        FOR EACH ROW WHEN ({changed})
+        EXECUTE FUNCTION article_queue_bump_version()
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER article_queue_bump_version ON article_queue')
+    op.execute('DROP FUNCTION article_queue_bump_version()')
+    op.drop_column('article_queue', 'promoted_version')
+    op.drop_column('article_queue', 'change_version')
@@ -0,0 +1,83 @@
+"""store JSON as jsonb, extracted text as bytea, lz4 TOAST compression
+
+Revision ID: a9d3f6c2e514
+Revises: f7b3d1e9a428
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3f6c2e514'
+down_revision: Union[str, None] = 'f7b3d1e9a428'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = [
+    ('article_queue', 'annotation_data'),
+    ('sections', 'coordinates'),
+    ('sections', 'rect'),
+    ('text_chunks', 'chunk_metadata'),
+]
+
+# Columns mapped to CompressedText; existing rows get the raw (0x00) header
+TEXT_COLUMNS = [
+    ('sections', 'text'),
+    ('text_chunks', 'chunk_text'),
+]
+
+
+def _supports_lz4() -> bool:
+    # Per-column TOAST compression arrived in Postgres 14
+    return op.get_bind().dialect.server_version_info >= (14,)
+
+
+def upgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(),
+            postgresql_using=f'{column}::jsonb',
+        )
+    for table, column in TEXT_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.LargeBinary(),
+            postgresql_using=f"'\\x00'::bytea || convert_to({column}, 'UTF8')",
+        )
+    if _supports_lz4():
+        # Applies to newly written values; VACUUM FULL rewrites old ones
+        for table, column in JSON_COLUMNS + TEXT_COLUMNS:
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} SET COMPRESSION lz4')
+
+
+def downgrade() -> None:
+    # zstd-compressed values (header 0x01) can't be decoded in SQL
+    for table, column in TEXT_COLUMNS:
+        op.execute(f"""
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM {table} WHERE get_byte({column}, 0) <> 0) THEN
+                    RAISE EXCEPTION '{table}.{column} has zstd-compressed rows; rewrite them with TEXT_COMPRESSION=none first';
+                END IF;
+            END $$
+        """)
+        op.alter_column(
+            table, column,
+            type_=sa.Text(),
+            postgresql_using=f"convert_from(substring({column} from 2), 'UTF8')",
+        )
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(),
+            postgresql_using=f'{column}::json',
+        )
+    if _supports_lz4():
+        for table, column in JSON_COLUMNS + TEXT_COLUMNS:
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} SET COMPRESSION default')
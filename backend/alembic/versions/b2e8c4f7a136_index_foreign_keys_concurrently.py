@@ -0,0 +1,53 @@
+"""index sections/text_chunks foreign keys, BRIN on created_at
+
+Revision ID: b2e8c4f7a136
+Revises: a9d3f6c2e514
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e8c4f7a136'
+down_revision: Union[str, None] = 'a9d3f6c2e514'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name -> (table, column, access method)
+INDEXES = {
+    'ix_sections_document_id': ('sections', 'document_id', 'btree'),
+    'ix_text_chunks_document_id': ('text_chunks', 'document_id', 'btree'),
+    'ix_text_chunks_section_id': ('text_chunks', 'section_id', 'btree'),
+    # Rows arrive roughly in created_at order, so a few-KB BRIN replaces a full btree
+    'ix_sections_created_at_brin': ('sections', 'created_at', 'brin'),
+    'ix_text_chunks_created_at_brin': ('text_chunks', 'created_at', 'brin'),
+    'ix_documents_created_at_brin': ('documents', 'created_at', 'brin'),
+    'ix_article_queue_created_at_brin': ('article_queue', 'created_at', 'brin'),
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; writes keep flowing while each builds
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for name, (table, column, method) in INDEXES.items():
+            # A failed concurrent build leaves an INVALID index behind that IF NOT EXISTS would keep
+            invalid = bind.execute(sa.text("""
+                SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = :name AND NOT i.indisvalid
+            """), {'name': name}).first()
+            if invalid:
+                op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING {method} ({column})'
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
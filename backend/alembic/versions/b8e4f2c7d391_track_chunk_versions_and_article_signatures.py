@@ -0,0 +1,94 @@
+"""version chunk content per document and fingerprint article PDFs
+
+Revision ID: b8e4f2c7d391
+Revises: a6d3e8b2f914
+Create Date: 2026-10-20 14:00:00.000000
+
+Chunk writes never touched documents.updated_at, and comparing it (naive)
+with document_signatures.computed_at (aware) depended on the session time
+zone, so edited documents kept their old signatures. A statement-level
+trigger on text_chunks now bumps documents.chunks_version instead.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4f2c7d391'
+down_revision: Union[str, None] = 'a6d3e8b2f914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# One statement-level trigger per operation: each gets its own transition tables
+TRIGGERS = {
+    'INSERT': 'REFERENCING NEW TABLE AS new_chunks',
+    'UPDATE': 'REFERENCING OLD TABLE AS old_chunks NEW TABLE AS new_chunks',
+    'DELETE': 'REFERENCING OLD TABLE AS old_chunks',
+}
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('chunks_version', sa.BigInteger(), nullable=False, server_default='0'))
+    op.add_column('document_signatures', sa.Column('chunks_version', sa.BigInteger(), nullable=False, server_default='0'))
+    # Signatures that the old timestamp check would have recomputed stay stale
+    op.execute("""
+        UPDATE document_signatures s SET chunks_version = -1
+        FROM documents d
+        WHERE d.id = s.document_id AND d.updated_at > s.computed_at
+    """)
+    # One UPDATE per statement and document, however many chunks it wrote.
+    # The version is bookkeeping for the signature job, so the bump doesn't
+    # send a row_changes event per document (the bulk paths' suppress flag
+    # is set around it and restored afterwards)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION text_chunks_bump_document() RETURNS trigger AS $$
+        DECLARE
+            suppressed text := current_setting('app.suppress_row_notify', true);
+        BEGIN
+            PERFORM set_config('app.suppress_row_notify', 'on', true);
+            IF TG_OP = 'INSERT' THEN
+                UPDATE documents SET chunks_version = chunks_version + 1
+                WHERE id IN (SELECT document_id FROM new_chunks);
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE documents SET chunks_version = chunks_version + 1
+                WHERE id IN (SELECT document_id FROM old_chunks);
+            ELSE
+                UPDATE documents SET chunks_version = chunks_version + 1
+                WHERE id IN (
+                    SELECT unnest(ARRAY[o.document_id, n.document_id])
+                    FROM old_chunks o JOIN new_chunks n ON n.id = o.id
+                    WHERE n.chunk_text IS DISTINCT FROM o.chunk_text OR n.document_id <> o.document_id
+                );
+            END IF;
+            PERFORM set_config('app.suppress_row_notify', coalesce(suppressed, ''), true);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for operation, transition in TRIGGERS.items():
+        op.execute(f"""
+            CREATE TRIGGER text_chunks_bump_document_{operation.lower()}
+            AFTER {operation} ON text_chunks {transition}
+            FOR EACH STATEMENT EXECUTE FUNCTION text_chunks_bump_document()
+        """)
+
+    op.create_table(
+        'article_signatures',
+        sa.Column('article_id', sa.Integer(), sa.ForeignKey('article_queue.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('pdf_s3_key', sa.String(), nullable=False),
+        sa.Column('signature', sa.LargeBinary(), nullable=False),
+        sa.Column('num_perm', sa.Integer(), nullable=False),
+        sa.Column('shingle_count', sa.Integer(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('article_signatures')
+    for operation in TRIGGERS:
+        op.execute(f'DROP TRIGGER text_chunks_bump_document_{operation.lower()} ON text_chunks')
+    op.execute('DROP FUNCTION text_chunks_bump_document()')
+    op.drop_column('document_signatures', 'chunks_version')
+    op.drop_column('documents', 'chunks_version')
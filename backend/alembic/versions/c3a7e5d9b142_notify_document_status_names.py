@@ -0,0 +1,75 @@
+"""report document status names, not ids, in row_changes events
+
+Revision ID: c3a7e5d9b142
+Revises: b8e4f2c7d391
+Create Date: 2026-10-20 16:00:00.000000
+
+Article events carry the status name; document events carried the
+DocumentStatus id as text, so one status filter couldn't serve both.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a7e5d9b142'
+down_revision: Union[str, None] = 'b8e4f2c7d391'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _notify_function(resolve_names: bool) -> str:
+    # With a second argument the status column holds an id into that lookup table
+    resolve = """
+            IF TG_NARGS > 1 AND row_status IS NOT NULL THEN
+                EXECUTE format('SELECT name FROM %I WHERE id = $1', TG_ARGV[1])
+                USING row_status::integer INTO row_status;
+            END IF;""" if resolve_names else ""
+    return f"""
+        CREATE OR REPLACE FUNCTION notify_row_change() RETURNS trigger AS $$
+        DECLARE
+            row_data record;
+            row_status text;
+        BEGIN
+            IF current_setting('app.suppress_row_notify', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                row_data := OLD;
+            ELSE
+                row_data := NEW;
+            END IF;
+            EXECUTE format('SELECT ($1).%I::text', TG_ARGV[0]) USING row_data INTO row_status;{resolve}
+            PERFORM pg_notify('row_changes', json_build_object(
+                'table', TG_TABLE_NAME,
+                'op', lower(TG_OP),
+                'id', row_data.id,
+                'status', row_status,
+                'version', txid_current()
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """
+
+
+def _documents_trigger(*args: str) -> None:
+    op.execute('DROP TRIGGER IF EXISTS documents_notify_row_change ON documents')
+    arguments = ', '.join(f"'{arg}'" for arg in args)
+    op.execute(f"""
+        CREATE TRIGGER documents_notify_row_change
+        AFTER INSERT OR UPDATE OR DELETE ON documents
+        FOR EACH ROW EXECUTE FUNCTION notify_row_change({arguments})
+    """)
+
+
+def upgrade() -> None:
+    op.execute(_notify_function(resolve_names=True))
+    _documents_trigger('status_id', 'document_statuses')
+
+
+def downgrade() -> None:
+    _documents_trigger('status_id')
+    op.execute(_notify_function(resolve_names=False))
@@ -0,0 +1,28 @@
+"""add source and confidence to sections
+
+Revision ID: c4e7a9b2d815
+Revises: 8b1d4e6f2a93
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e7a9b2d815'
+down_revision: Union[str, None] = '8b1d4e6f2a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sections', sa.Column('source', sa.String(length=20), server_default='manual', nullable=False))
+    op.add_column('sections', sa.Column('confidence', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sections', 'confidence')
+    op.drop_column('sections', 'source')
@@ -0,0 +1,140 @@
+"""hash-partition text_chunks by document_id
+
+Revision ID: d5f1a8e3c729
+Revises: b2e8c4f7a136
+Create Date: 2026-10-19 18:30:00.000000
+
+Runs online: the partitioned copy is kept in sync by a trigger while it is
+backfilled in small autocommitted batches, and the only exclusive lock is
+the final rename, guarded by lock_timeout.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f1a8e3c729'
+down_revision: Union[str, None] = 'b2e8c4f7a136'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS = 16
+BATCH_SIZE = 20000
+COLUMNS = 'id, document_id, section_id, chunk_text, embedding, chunk_metadata, created_at, updated_at'
+
+# Created under temporary names, renamed once the old table is gone
+INDEXES = {
+    'ix_text_chunks_document_id': 'btree (document_id)',
+    'ix_text_chunks_section_id': 'btree (section_id)',
+    'ix_text_chunks_created_at_brin': 'brin (created_at)',
+}
+CONSTRAINTS = {
+    'text_chunks_pkey': 'PRIMARY KEY (id, document_id)',
+    'text_chunks_document_id_fkey': 'FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE',
+    'text_chunks_section_id_fkey': 'FOREIGN KEY (section_id) REFERENCES sections (id) ON DELETE CASCADE',
+}
+
+
+def _backfill(source: str, target: str) -> None:
+    bind = op.get_bind()
+    low, high = bind.execute(sa.text(f'SELECT min(id), max(id) FROM {source}')).first()
+    if low is None:
+        return
+    columns = ', '.join(f's.{c.strip()}' for c in COLUMNS.split(','))
+    for start in range(low, high + 1, BATCH_SIZE):
+        # The row locks re-check each row when the batch reads it: a chunk or
+        # document deleted after the statement's snapshot is skipped instead of
+        # copied (the sync trigger has already removed it), and deletes that
+        # come later wait for this batch, then remove what it copied
+        op.execute(f"""
+            INSERT INTO {target} ({COLUMNS})
+            SELECT {columns} FROM {source} s
+            JOIN documents d ON d.id = s.document_id
+            WHERE s.id >= {start} AND s.id < {start + BATCH_SIZE}
+            FOR SHARE OF s FOR KEY SHARE OF d
+            ON CONFLICT DO NOTHING
+        """)
+
+
+def upgrade() -> None:
+    # The partition key is part of the primary key, so it can't be NULL;
+    # NOT VALID + VALIDATE checks existing rows without blocking writes
+    op.execute("""
+        ALTER TABLE text_chunks
+        ADD CONSTRAINT text_chunks_document_id_not_null CHECK (document_id IS NOT NULL) NOT VALID
+    """)
+    op.execute("""
+        CREATE TABLE text_chunks_partitioned (LIKE text_chunks INCLUDING DEFAULTS INCLUDING STORAGE)
+        PARTITION BY HASH (document_id)
+    """)
+    op.execute('ALTER TABLE text_chunks_partitioned ALTER COLUMN document_id SET NOT NULL')
+    for name, definition in CONSTRAINTS.items():
+        op.execute(f'ALTER TABLE text_chunks_partitioned ADD CONSTRAINT {name}_new {definition}')
+    for i in range(PARTITIONS):
+        op.execute(f"""
+            CREATE TABLE text_chunks_p{i} PARTITION OF text_chunks_partitioned
+            FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {i})
+        """)
+    for name, definition in INDEXES.items():
+        op.execute(f'CREATE INDEX {name}_new ON text_chunks_partitioned USING {definition}')
+    if op.get_bind().dialect.server_version_info >= (14,):
+        for column in ('chunk_text', 'chunk_metadata'):
+            op.execute(f'ALTER TABLE text_chunks_partitioned ALTER COLUMN {column} SET COMPRESSION lz4')
+
+    # Mirror every write to the old table until the swap
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION text_chunks_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                DELETE FROM text_chunks_partitioned WHERE id = OLD.id AND document_id = OLD.document_id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO text_chunks_partitioned ({COLUMNS})
+                SELECT {', '.join(f'NEW.{c.strip()}' for c in COLUMNS.split(','))}
+                ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER text_chunks_sync AFTER INSERT OR UPDATE OR DELETE ON text_chunks
+        FOR EACH ROW EXECUTE FUNCTION text_chunks_sync()
+    """)
+
+    with op.get_context().autocommit_block():
+        op.execute('ALTER TABLE text_chunks VALIDATE CONSTRAINT text_chunks_document_id_not_null')
+        _backfill('text_chunks', 'text_chunks_partitioned')
+
+    # Swap: brief ACCESS EXCLUSIVE lock; fail fast instead of queueing behind long readers
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute('LOCK TABLE text_chunks IN ACCESS EXCLUSIVE MODE')
+    op.execute('DROP TRIGGER text_chunks_sync ON text_chunks')
+    op.execute('DROP FUNCTION text_chunks_sync()')
+    op.execute('ALTER SEQUENCE text_chunks_id_seq OWNED BY text_chunks_partitioned.id')
+    op.execute('DROP TABLE text_chunks')
+    op.execute('ALTER TABLE text_chunks_partitioned RENAME TO text_chunks')
+    for name in CONSTRAINTS:
+        op.execute(f'ALTER TABLE text_chunks RENAME CONSTRAINT {name}_new TO {name}')
+    for name in INDEXES:
+        op.execute(f'ALTER INDEX {name}_new RENAME TO {name}')
+
+
+def downgrade() -> None:
+    # Offline: copies everything back into a plain table under an exclusive lock
+    op.execute('LOCK TABLE text_chunks IN ACCESS EXCLUSIVE MODE')
+    op.execute('CREATE TABLE text_chunks_plain (LIKE text_chunks INCLUDING DEFAULTS INCLUDING STORAGE)')
+    op.execute(f'INSERT INTO text_chunks_plain ({COLUMNS}) SELECT {COLUMNS} FROM text_chunks')
+    op.execute('ALTER SEQUENCE text_chunks_id_seq OWNED BY text_chunks_plain.id')
+    op.execute('DROP TABLE text_chunks')
+    op.execute('ALTER TABLE text_chunks_plain RENAME TO text_chunks')
+    op.execute('ALTER TABLE text_chunks ALTER COLUMN document_id DROP NOT NULL')
+    op.execute('ALTER TABLE text_chunks ADD CONSTRAINT text_chunks_pkey PRIMARY KEY (id)')
+    for name, definition in CONSTRAINTS.items():
+        if name != 'text_chunks_pkey':
+            op.execute(f'ALTER TABLE text_chunks ADD CONSTRAINT {name} {definition}')
+    op.execute('CREATE INDEX ix_text_chunks_id ON text_chunks (id)')
+    for name, definition in INDEXES.items():
+        op.execute(f'CREATE INDEX {name} ON text_chunks USING {definition}')
@@ -0,0 +1,26 @@
+"""add promoted_at to article_queue
+
+Revision ID: e2a5c8f1b367
+Revises: c4e7a9b2d815
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a5c8f1b367'
+down_revision: Union[str, None] = 'c4e7a9b2d815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('article_queue', sa.Column('promoted_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('article_queue', 'promoted_at')
@@ -0,0 +1,63 @@
+"""notify row_changes on article_queue and documents writes
+
+Revision ID: f7b3d1e9a428
+Revises: e2a5c8f1b367
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b3d1e9a428'
+down_revision: Union[str, None] = 'e2a5c8f1b367'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Table -> column reported as "status" in the event
+WATCHED_TABLES = {
+    'article_queue': 'status',
+    'documents': 'status_id',
+}
+
+
+def upgrade() -> None:
+    # Payload stays tiny (NOTIFY caps it at 8000 bytes); clients refetch what they need
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_row_change() RETURNS trigger AS $$
+        DECLARE
+            row_data record;
+            row_status text;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                row_data := OLD;
+            ELSE
+                row_data := NEW;
+            END IF;
+            EXECUTE format('SELECT ($1).%I::text', TG_ARGV[0]) USING row_data INTO row_status;
+            PERFORM pg_notify('row_changes', json_build_object(
+                'table', TG_TABLE_NAME,
+                'op', lower(TG_OP),
+                'id', row_data.id,
+                'status', row_status,
+                'version', txid_current()
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    for table, status_column in WATCHED_TABLES.items():
+        op.execute(f"""
+            CREATE TRIGGER {table}_notify_row_change
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_row_change('{status_column}')
+        """)
+
+
+def downgrade() -> None:
+    for table in WATCHED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_row_change ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_row_change()")
@@ -3,6 +3,11 @@ from app.api.v1.endpoints.documents import router as documents_router
 from app.api.v1.endpoints.pdf import router as pdf_router
 from app.api.v1.endpoints.article_queue import router as article_queue_router
 from app.api.v1.endpoints.s3 import router as s3_router
+from app.api.v1.endpoints.thumbnails import router as thumbnails_router
+from app.api.v1.endpoints.events import router as events_router
+from app.api.v1.endpoints.collab import router as collab_router
+from app.api.v1.endpoints.diagnostics import router as diagnostics_router
+from app.api.v1.endpoints.duplicates import router as duplicates_router
 
 api_router = APIRouter()
 
@@ -28,4 +33,34 @@ api_router.include_router(
     s3_router,
     prefix="/s3",
     tags=["S3 Operations"]
-) 
\ No newline at end of file
+)
+
+api_router.include_router(
+    thumbnails_router,
+    prefix="/thumbnails",
+    tags=["Thumbnails"]
+)
+
+api_router.include_router(
+    events_router,
+    prefix="/events",
+    tags=["Events"]
+)
+
+api_router.include_router(
+    collab_router,
+    prefix="/collab",
+    tags=["Collaboration"]
+)
+
+api_router.include_router(
+    diagnostics_router,
+    prefix="/diagnostics",
+    tags=["Diagnostics"]
+)
+
+api_router.include_router(
+    duplicates_router,
+    prefix="/duplicates",
+    tags=["Duplicates"]
+)
@@ -1,8 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+import csv
+import logging
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, UploadFile, File, Security
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.deps import get_db
+from sqlalchemy import select
+from typing import List, Optional
+from app.core.config import settings
+from app.core.deps import SessionLocal, get_db, get_read_db
+from app.core.s3 import shared_s3_client
+from app.db.lookups import get_by_id
+from app.core.security import get_api_key
+from app.core.cache import response_cache
+from app.core.serialization import rows_as_dicts, row_as_dict, json_response, json_dumps
 from app.models.article_queue import ArticleQueue
+from app.services.article_import import iter_records, import_articles
+from app.services.collab import collab_rooms
+from app.services.minhash import index_articles, pdf_fingerprinting_available
+from app.services.status_transitions import TransitionError, article_transitions
+from app.schemas.status_transition import BulkStatusTransition, BulkStatusTransitionResult
 from app.schemas.article_queue import (
     ArticleBase,
     ArticleCreate,
@@ -10,28 +24,105 @@ from app.schemas.article_queue import (
     ArticleResponse
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Columns matching ArticleResponse, selected as plain rows for the fast path
+ARTICLE_COLUMNS = (
+    ArticleQueue.id, ArticleQueue.doi, ArticleQueue.title, ArticleQueue.authors,
+    ArticleQueue.journal, ArticleQueue.publication_date, ArticleQueue.description,
+    ArticleQueue.status, ArticleQueue.pdf_s3_key, ArticleQueue.pdf_optimized_s3_key,
+    ArticleQueue.storage_tier, ArticleQueue.created_at, ArticleQueue.updated_at, ArticleQueue.annotation_data
+)
+
 @router.get("/", response_model=List[ArticleResponse])
 async def get_articles(
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all articles"""
-    articles = db.query(ArticleQueue).offset(skip).limit(limit).all()
-    return articles
+    result = db.execute(select(*ARTICLE_COLUMNS).offset(skip).limit(limit))
+    return json_response(rows_as_dicts(result))
+
+def fingerprint_articles(limit: int):
+    """Sign the PDFs an import added or replaced, after the response is sent"""
+    db = SessionLocal()
+    try:
+        totals = index_articles(db, shared_s3_client(), settings.AWS_ARTICLE_QUEUE_BUCKET, limit=limit)
+        logger.info(f"Fingerprinted imported articles: {totals}")
+    except Exception as e:
+        logger.error(f"Could not fingerprint imported articles: {str(e)}")
+    finally:
+        db.close()
+
+@router.post("/import")
+def import_article_feed(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    batch_size: int = 1000,
+    db: Session = Depends(get_db),
+    api_key: str = Security(get_api_key)
+):
+    """Upsert articles from a CSV or JSONL metadata feed, keyed by DOI"""
+    fmt = format or (file.filename or "").rsplit(".", 1)[-1].lower()
+    if fmt == "json":
+        fmt = "jsonl"
+    if fmt not in ("csv", "jsonl"):
+        raise HTTPException(status_code=400, detail="Feed format must be csv or jsonl")
+    if not 1 <= batch_size <= 10000:
+        raise HTTPException(status_code=400, detail="batch_size must be between 1 and 10000")
+
+    # The upload is spooled to disk, so reading it row by row keeps memory flat
+    try:
+        counts = import_articles(db, iter_records(file.file, fmt), batch_size=batch_size)
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Could not parse feed: {str(e)}")
+    changed = counts["inserted"] + counts["updated"]
+    # Bounded by what this import touched; scripts/find_duplicates.py --articles catches up the rest
+    if changed and settings.AWS_ARTICLE_QUEUE_BUCKET and pdf_fingerprinting_available():
+        background_tasks.add_task(fingerprint_articles, changed)
+    return counts
+
+@router.post("/status/bulk", response_model=BulkStatusTransitionResult)
+def bulk_update_article_status(
+    transition: BulkStatusTransition,
+    db: Session = Depends(get_db),
+    api_key: str = Security(get_api_key)
+):
+    """Move many articles to another status, one UPDATE per batch (e.g. requeue all failed)"""
+    if transition.ids is None and not transition.from_statuses:
+        raise HTTPException(status_code=400, detail="Provide ids and/or from_statuses")
+    try:
+        return article_transitions.run(
+            db, transition.to_status, ids=transition.ids, from_statuses=transition.from_statuses
+        )
+    except TransitionError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{article_id}", response_model=ArticleResponse)
 async def get_article(
     article_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """Get a single article by ID"""
-    article = db.query(ArticleQueue).filter(ArticleQueue.id == article_id).first()
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
-    return article
+    cached = response_cache.get("article", article_id)
+    if cached is None:
+        version = response_cache.version("article", article_id)
+        article = row_as_dict(db.execute(
+            select(*ARTICLE_COLUMNS).where(ArticleQueue.id == article_id)
+        ))
+        if not article:
+            raise HTTPException(status_code=404, detail="Article not found")
+        cached = response_cache.set(
+            "article", article_id, json_dumps(article), version=version
+        )
+    return cached.to_response(request)
 
 @router.post("/test-data")
 async def add_test_data(db: Session = Depends(get_db)):
@@ -64,13 +155,20 @@ def update_annotations(
     db: Session = Depends(get_db)
 ):
     """Update article annotations"""
-    article = db.query(ArticleQueue).filter(ArticleQueue.id == article_id).first()
+    # While a live room is open its state is authoritative; a whole-blob write would be lost
+    if collab_rooms.get(article_id) is not None:
+        raise HTTPException(
+            status_code=409,
+            detail="Article is being edited live; send changes over the collaboration channel"
+        )
+    article = get_by_id(db, ArticleQueue, article_id)
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
     
     try:
         article.annotation_data = annotation_data
         db.commit()
+        response_cache.invalidate("article", article_id)
         return {"message": "Annotations updated successfully"}
     except Exception as e:
         db.rollback()
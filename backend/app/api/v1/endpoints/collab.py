@@ -0,0 +1,43 @@
+import logging
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from app.services.collab import collab_available, collab_rooms
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.websocket("/{article_id}")
+async def annotation_room(websocket: WebSocket, article_id: int):
+    """Live annotation editing for one article.
+
+    Clients send {"op": "upsert"|"delete", "id", "base_seq", "annotation",
+    "client_op_id"}; accepted ops are broadcast to everyone in the room with
+    a server sequence number, conflicting ones come back as "reject".
+    """
+    await websocket.accept()
+    if not collab_available():
+        # 1013 (try again later): editing falls back to saving whole annotation sets
+        await websocket.close(code=1013, reason="Live editing is not available on this deployment")
+        return
+    room = await collab_rooms.join(article_id, websocket)
+    if room is None:
+        await websocket.close(code=4404, reason="Article not found")
+        return
+
+    try:
+        await websocket.send_json(room.snapshot())
+        while True:
+            message = await websocket.receive_json()
+            if message.get("type") == "resync":
+                await websocket.send_json(room.snapshot())
+                continue
+            result = room.apply(message, websocket)
+            if result["type"] == "op":
+                await room.broadcast(result)
+            else:
+                await websocket.send_json(result)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Annotation room {article_id} connection error: {str(e)}")
+    finally:
+        await collab_rooms.leave(room, websocket)
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, Security
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.pool_stats import pool_metrics
+from app.core.s3 import S3Client, get_s3_client
+from app.core.security import get_api_key
+from app.db.session import get_read_db, pool_sizing
+from app.models.article_queue import ArticleQueue
+from app.services.storage_tiering import bytes_per_tier
+
+router = APIRouter()
+
+@router.get("/pool")
+async def pool_diagnostics(api_key: str = Security(get_api_key)):
+    """Connection pool state and a sizing recommendation for this worker"""
+    pool_size, max_overflow = pool_sizing()
+    return {
+        "workers": settings.WEB_CONCURRENCY,
+        "config": {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+            "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+            "pre_ping": settings.DATABASE_POOL_PRE_PING,
+            "connection_budget": settings.DATABASE_CONNECTION_BUDGET or None
+        },
+        "pools": pool_metrics.snapshot()
+    }
+
+@router.get("/storage")
+def storage_diagnostics(
+    api_key: str = Security(get_api_key),
+    db: Session = Depends(get_read_db),
+    s3_client: S3Client = Depends(get_s3_client)
+):
+    """Articles and PDF bytes per storage tier (lists the bucket; admin use only)"""
+    articles = db.execute(
+        select(ArticleQueue.storage_tier, func.count()).group_by(ArticleQueue.storage_tier)
+    ).all()
+    return {
+        "articles": {tier: count for tier, count in articles},
+        "objects": bytes_per_tier(s3_client, settings.AWS_ARTICLE_QUEUE_BUCKET),
+        "cold_storage_class": settings.PDF_COLD_STORAGE_CLASS
+    }
@@ -1,15 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends, Security
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, HTTPException, Depends, Security, Request
+from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy import desc, select
+from sqlalchemy.dialects.postgresql import insert
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.db.lookups import get_by_id, document_status_counts
 from app.models.document import Document
 from app.models.section import Section
 from app.models.text_chunk import TextChunk
 from app.core.security import get_api_key
-from app.core.s3 import S3Client
+from app.core.s3 import S3Client, get_s3_client, pdf_location
+from app.core.cache import response_cache
+from app.core.serialization import rows_as_dicts, row_as_dict, json_response, json_dumps
+from app.schemas.status_transition import BulkStatusTransition, BulkStatusTransitionResult
+from app.services.status_transitions import TransitionError, document_transitions
 from app.schemas.document import (
     DocumentCreate,
     DocumentUpdate,
@@ -19,7 +25,51 @@ from app.schemas.document import (
 )
 
 router = APIRouter()
-s3_client = S3Client()
+
+# Columns that can be requested through the detail endpoint's `fields` param
+DOCUMENT_FIELDS = (
+    "id", "title", "authors", "publication_date", "doi", "pdf_s3_url",
+    "document_type_id", "status_id", "created_at", "updated_at"
+)
+SECTION_FIELDS = (
+    "id", "section_type_id", "text", "page_num", "coordinates", "rect",
+    "source", "confidence", "created_at", "updated_at"
+)
+CHUNK_FIELDS = (
+    "id", "section_id", "chunk_text", "embedding", "chunk_metadata",
+    "created_at", "updated_at"
+)
+
+# Defaults mirror the single-resource endpoints; `embedding` is opt-in only
+DEFAULT_SECTION_FIELDS = (
+    "id", "section_type_id", "text", "page_num", "coordinates", "rect", "source", "confidence"
+)
+DEFAULT_CHUNK_FIELDS = ("id", "section_id", "chunk_text", "chunk_metadata", "created_at")
+
+DETAIL_INCLUDES = {"sections", "chunks"}
+
+# Column sets for the list/detail fast paths (selected as plain rows)
+DOCUMENT_LIST_COLUMNS = (
+    Document.id, Document.title, Document.authors, Document.doi,
+    Document.status_id, Document.created_at
+)
+DOCUMENT_COLUMNS = (
+    Document.id, Document.title, Document.authors, Document.doi,
+    Document.pdf_s3_url, Document.status_id, Document.created_at,
+    Document.updated_at
+)
+SEARCH_COLUMNS = (
+    Document.id, Document.title, Document.authors, Document.doi,
+    Document.status_id
+)
+SECTION_LIST_COLUMNS = (
+    Section.id, Section.section_type_id, Section.text, Section.page_num,
+    Section.coordinates, Section.rect, Section.source, Section.confidence
+)
+CHUNK_LIST_COLUMNS = (
+    TextChunk.id, TextChunk.chunk_text, TextChunk.chunk_metadata,
+    TextChunk.created_at
+)
 
 # Pydantic model for document creation
 class DocumentCreate(BaseModel):
@@ -34,99 +84,210 @@ async def get_documents(
     skip: int = 0,
     limit: int = 10,
     status_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     api_key: str = Security(get_api_key)
 ):
     """Get a list of documents with pagination"""
-    query = db.query(Document)
+    query = select(*DOCUMENT_LIST_COLUMNS)
     
     if status_id:
-        query = query.filter(Document.status_id == status_id)
+        query = query.where(Document.status_id == status_id)
     
     if limit > 100:
         limit = 100
     
-    documents = query.order_by(desc(Document.created_at)).offset(skip).limit(limit).all()
-    
-    return [{
-        "id": doc.id,
-        "title": doc.title,
-        "authors": doc.authors,
-        "doi": doc.doi,
-        "status_id": doc.status_id,
-        "created_at": doc.created_at.isoformat() if doc.created_at else None
-    } for doc in documents]
+    result = db.execute(
+        query.order_by(desc(Document.created_at)).offset(skip).limit(limit)
+    )
+    return json_response(rows_as_dicts(result))
 
 @router.get("/{document_id}")
-async def get_document(document_id: int, db: Session = Depends(get_db)):
+async def get_document(
+    document_id: int,
+    request: Request,
+    # Cached endpoints read the primary: a replica could refill the cache with stale rows
+    db: Session = Depends(get_db)
+):
     """Get a specific document by ID"""
-    document = db.query(Document).filter(Document.id == document_id).first()
-    if not document:
-        raise HTTPException(status_code=404, detail="Document not found")
+    cached = response_cache.get("document", document_id)
+    if cached is None:
+        version = response_cache.version("document", document_id)
+        document = row_as_dict(db.execute(
+            select(*DOCUMENT_COLUMNS).where(Document.id == document_id)
+        ))
+        if not document:
+            raise HTTPException(status_code=404, detail="Document not found")
+        cached = response_cache.set(
+            "document", document_id, json_dumps(document), version=version
+        )
     
-    return {
-        "id": document.id,
-        "title": document.title,
-        "authors": document.authors,
-        "doi": document.doi,
-        "pdf_s3_url": document.pdf_s3_url,
-        "status_id": document.status_id,
-        "created_at": document.created_at.isoformat() if document.created_at else None,
-        "updated_at": document.updated_at.isoformat() if document.updated_at else None
+    return cached.to_response(request)
+
+def _parse_detail_fields(fields: Optional[str]) -> dict:
+    """Split `fields` into per-resource column lists (`title`, `sections.text`, `chunks.id`)"""
+    selected = {"document": [], "sections": [], "chunks": []}
+    allowed = {
+        "document": DOCUMENT_FIELDS,
+        "sections": SECTION_FIELDS,
+        "chunks": CHUNK_FIELDS
     }
+    unknown = []
+
+    for item in (fields or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        scope, _, name = item.rpartition(".")
+        scope = scope or "document"
+        if scope not in allowed or name not in allowed[scope]:
+            unknown.append(item)
+        elif name not in selected[scope]:
+            selected[scope].append(name)
+
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+
+    # The primary key is always returned so clients can correlate rows
+    for scope, defaults in (
+        ("document", DOCUMENT_FIELDS),
+        ("sections", DEFAULT_SECTION_FIELDS),
+        ("chunks", DEFAULT_CHUNK_FIELDS)
+    ):
+        if not selected[scope]:
+            selected[scope] = list(defaults)
+        elif "id" not in selected[scope]:
+            selected[scope].insert(0, "id")
+
+    return selected
+
+def _serialize_columns(obj, fields) -> dict:
+    """Build a response dict from already-loaded columns only"""
+    return {field: getattr(obj, field) for field in fields}
+
+@router.get("/{document_id}/detail")
+async def get_document_detail(
+    document_id: int,
+    request: Request,
+    include: Optional[str] = "sections,chunks",
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get a document with its sections and text chunks in a single request.
+
+    `include` selects the related collections (`sections`, `chunks`) and
+    `fields` narrows the columns loaded for each of them, e.g.
+    `fields=title,sections.page_num,sections.rect,chunks.chunk_text`.
+    Heavy columns that are not requested are never read from the database.
+    """
+    includes = {item.strip() for item in (include or "").split(",") if item.strip()}
+    unknown = includes - DETAIL_INCLUDES
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}"
+        )
+
+    selected = _parse_detail_fields(fields)
+
+    # Cached alongside the document so one invalidation covers every variant
+    variant = "detail:" + ",".join(sorted(includes)) + ":" + ";".join(
+        f"{scope}={','.join(names)}" for scope, names in selected.items()
+    )
+    cached = response_cache.get("document", document_id, variant)
+    if cached is not None:
+        return cached.to_response(request)
+    version = response_cache.version("document", document_id)
+
+    options = [load_only(*[getattr(Document, f) for f in selected["document"]])]
+    if "sections" in includes:
+        options.append(
+            selectinload(Document.sections).load_only(
+                *[getattr(Section, f) for f in selected["sections"]]
+            )
+        )
+    if "chunks" in includes:
+        options.append(
+            selectinload(Document.text_chunks).load_only(
+                *[getattr(TextChunk, f) for f in selected["chunks"]]
+            )
+        )
+
+    # One query for the document plus one IN-query per included collection
+    document = get_by_id(db, Document, document_id, options=options)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    result = _serialize_columns(document, selected["document"])
+    if "sections" in includes:
+        result["sections"] = [
+            _serialize_columns(section, selected["sections"])
+            for section in document.sections
+        ]
+    if "chunks" in includes:
+        result["text_chunks"] = [
+            _serialize_columns(chunk, selected["chunks"])
+            for chunk in document.text_chunks
+        ]
+
+    cached = response_cache.set(
+        "document", document_id, json_dumps(result), variant, version=version
+    )
+    return cached.to_response(request)
 
 @router.get("/documents/search/")
 async def search_documents(
     query: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = 10
 ):
     """Search documents by title or DOI"""
-    documents = db.query(Document).filter(
-        (Document.title.ilike(f"%{query}%")) |
-        (Document.doi.ilike(f"%{query}%"))
-    ).limit(limit).all()
+    result = db.execute(
+        select(*SEARCH_COLUMNS).where(
+            (Document.title.ilike(f"%{query}%")) |
+            (Document.doi.ilike(f"%{query}%"))
+        ).limit(limit)
+    )
     
-    return [{
-        "id": doc.id,
-        "title": doc.title,
-        "authors": doc.authors,
-        "doi": doc.doi,
-        "status_id": doc.status_id
-    } for doc in documents]
+    return json_response(rows_as_dicts(result))
 
 @router.get("/{document_id}/sections")
-async def get_document_sections(document_id: int, db: Session = Depends(get_db)):
+async def get_document_sections(
+    document_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
     """Get all sections for a specific document"""
-    sections = db.query(Section).filter(Section.document_id == document_id).all()
+    cached = response_cache.get("document", document_id, "sections")
+    if cached is None:
+        version = response_cache.version("document", document_id)
+        result = db.execute(
+            select(*SECTION_LIST_COLUMNS).where(Section.document_id == document_id)
+        )
+        cached = response_cache.set(
+            "document", document_id, json_dumps(rows_as_dicts(result)),
+            "sections", version=version
+        )
     
-    return [{
-        "id": section.id,
-        "section_type_id": section.section_type_id,
-        "text": section.text,
-        "page_num": section.page_num,
-        "coordinates": section.coordinates,
-        "rect": section.rect
-    } for section in sections]
+    return cached.to_response(request)
 
 @router.get("/{document_id}/text_chunks")
 async def get_document_text_chunks(
     document_id: int,
     limit: int = 10,
     skip: int = 0,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get text chunks for a specific document"""
-    chunks = db.query(TextChunk).filter(
-        TextChunk.document_id == document_id
-    ).offset(skip).limit(limit).all()
+    result = db.execute(
+        select(*CHUNK_LIST_COLUMNS).where(
+            TextChunk.document_id == document_id
+        ).offset(skip).limit(limit)
+    )
     
-    return [{
-        "id": chunk.id,
-        "chunk_text": chunk.chunk_text,
-        "chunk_metadata": chunk.chunk_metadata,
-        "created_at": chunk.created_at.isoformat() if chunk.created_at else None
-    } for chunk in chunks]
+    return json_response(rows_as_dicts(result))
 
 # Add document endpoint
 @router.post("/", response_model=dict)
@@ -137,31 +298,30 @@ async def create_document(
 ):
     """Create a new document"""
     try:
-        # Check if document with same DOI exists
-        if document.doi:
-            existing_doc = db.query(Document).filter(
-                Document.doi == document.doi
-            ).first()
-            
-            if existing_doc:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Document with this DOI already exists"
-                )
-        
-        # Create new document
-        db_document = Document(
-            title=document.title,
-            authors=document.authors,
-            doi=document.doi,
-            pdf_s3_url=document.pdf_s3_url,
-            status_id=document.status_id,
-            created_at=datetime.utcnow()
+        # A single INSERT ... ON CONFLICT avoids the check-then-insert race on DOI
+        result = db.execute(
+            insert(Document).values(
+                title=document.title,
+                authors=document.authors,
+                doi=document.doi,
+                pdf_s3_url=document.pdf_s3_url,
+                status_id=document.status_id,
+                created_at=datetime.utcnow()
+            ).on_conflict_do_nothing(
+                index_elements=[Document.doi]
+            ).returning(
+                Document.id, Document.title, Document.authors,
+                Document.doi, Document.status_id, Document.created_at
+            )
         )
-        
-        db.add(db_document)
+        db_document = result.first()
+        if db_document is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail="Document with this DOI already exists"
+            )
         db.commit()
-        db.refresh(db_document)
         
         return {
             "id": db_document.id,
@@ -186,14 +346,13 @@ async def create_document(
 async def delete_document(
     document_id: int,
     db: Session = Depends(get_db),
-    api_key: str = Security(get_api_key)
+    api_key: str = Security(get_api_key),
+    s3_client: S3Client = Depends(get_s3_client)
 ):
     """Delete a document and its associated files"""
     try:
         # Find the document
-        document = db.query(Document).filter(
-            Document.id == document_id
-        ).first()
+        document = get_by_id(db, Document, document_id)
         
         if not document:
             raise HTTPException(
@@ -204,9 +363,10 @@ async def delete_document(
         # Delete associated PDF from S3 if it exists
         if document.pdf_s3_url:
             try:
-                # Extract S3 key from URL
-                s3_key = document.pdf_s3_url.split('/')[-1]
-                await s3_client.delete_pdf(s3_key)
+                bucket, s3_key = pdf_location(document.pdf_s3_url)
+                # PDFs in other buckets (e.g. the article queue's) are not the document's own
+                if bucket == s3_client.bucket_name:
+                    await s3_client.delete_pdf(s3_key)
             except Exception as e:
                 logger.warning(f"Error deleting PDF from S3: {str(e)}")
         
@@ -220,6 +380,7 @@ async def delete_document(
         # Delete the document
         db.delete(document)
         db.commit()
+        response_cache.invalidate("document", document_id)
         
         return {
             "message": f"Document {document_id} and all associated data successfully deleted"
@@ -241,7 +402,7 @@ async def update_document(
     db: Session = Depends(get_db)
 ):
     """Update document metadata"""
-    db_document = db.query(Document).filter(Document.id == document_id).first()
+    db_document = get_by_id(db, Document, document_id)
     if not db_document:
         raise HTTPException(status_code=404, detail="Document not found")
     
@@ -249,6 +410,7 @@ async def update_document(
         setattr(db_document, field, value)
     
     db.commit()
+    response_cache.invalidate("document", document_id)
     db.refresh(db_document)
     return db_document
 
@@ -259,21 +421,37 @@ async def update_document_status(
     db: Session = Depends(get_db)
 ):
     """Update document status"""
-    db_document = db.query(Document).filter(Document.id == document_id).first()
+    db_document = get_by_id(db, Document, document_id)
     if not db_document:
         raise HTTPException(status_code=404, detail="Document not found")
     
     db_document.status_id = status.status_id
     db.commit()
+    response_cache.invalidate("document", document_id)
     db.refresh(db_document)
     return db_document
 
+@router.post("/status/bulk", response_model=BulkStatusTransitionResult)
+def bulk_update_document_status(
+    transition: BulkStatusTransition,
+    db: Session = Depends(get_db),
+    api_key: str = Security(get_api_key)
+):
+    """Move many documents to another status, one UPDATE per batch (e.g. requeue all failed)"""
+    if transition.ids is None and not transition.from_statuses:
+        raise HTTPException(status_code=400, detail="Provide ids and/or from_statuses")
+    try:
+        return document_transitions.run(
+            db, transition.to_status, ids=transition.ids, from_statuses=transition.from_statuses
+        )
+    except TransitionError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/stats", response_model=DocumentStats)
-async def get_document_stats(db: Session = Depends(get_db)):
+async def get_document_stats(db: Session = Depends(get_read_db)):
     """Get processing statistics"""
-    total = db.query(Document).count()
-    processed = db.query(Document).filter(Document.status_id == 2).count()
-    failed = db.query(Document).filter(Document.status_id == 3).count()
+    total, processed, failed = document_status_counts(db)
     
     return {
         "total_documents": total,
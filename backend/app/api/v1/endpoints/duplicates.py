@@ -0,0 +1,96 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.deps import get_read_db
+from app.db.lookups import get_by_id
+from app.models.article_queue import ArticleQueue
+from app.models.document import Document
+from app.services.minhash import article_candidates, candidate_pairs, document_candidates, numpy_available
+
+router = APIRouter()
+
+def _describe(db: Session, pairs: List[dict]) -> List[dict]:
+    """Attach titles, DOIs and the matching article_queue rows to each pair"""
+    ids = {i for pair in pairs for i in (pair["document_id"], pair["duplicate_id"])}
+    if not ids:
+        return pairs
+    documents = {
+        row.id: row for row in db.execute(
+            select(Document.id, Document.title, Document.doi).where(Document.id.in_(ids))
+        )
+    }
+    dois = [row.doi for row in documents.values() if row.doi]
+    articles = dict(db.execute(
+        select(ArticleQueue.doi, ArticleQueue.id).where(ArticleQueue.doi.in_(dois))
+    ).all()) if dois else {}
+    for pair in pairs:
+        for side in ("document", "duplicate"):
+            row = documents.get(pair[f"{side}_id"])
+            pair[side] = {
+                "title": row.title if row else None,
+                "doi": row.doi if row else None,
+                "article_id": articles.get(row.doi) if row else None
+            }
+    return pairs
+
+@router.get("/candidates")
+def get_candidate_pairs(
+    min_similarity: Optional[float] = Query(None, ge=0, le=1),
+    limit: int = Query(500, ge=1, le=5000, description="Indexed documents per page"),
+    after: int = Query(0, ge=0, description="Cursor from the previous page"),
+    db: Session = Depends(get_read_db)
+):
+    """Near-duplicate document pairs from the LSH index, verified by signature similarity"""
+    pairs, next_cursor = candidate_pairs(
+        db, min_similarity if min_similarity is not None else settings.MINHASH_THRESHOLD, limit, after
+    )
+    return {
+        "pairs": _describe(db, pairs),
+        # Pages cover a range of documents, so a page can be empty while more remain
+        "next": next_cursor
+    }
+
+@router.get("/documents/{document_id}")
+def get_document_duplicates(
+    document_id: int,
+    min_similarity: Optional[float] = Query(None, ge=0, le=1),
+    db: Session = Depends(get_read_db)
+):
+    """Near-duplicates of one document"""
+    if get_by_id(db, Document, document_id) is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    pairs = document_candidates(
+        db, document_id, min_similarity if min_similarity is not None else settings.MINHASH_THRESHOLD
+    )
+    pairs.sort(key=lambda pair: pair["similarity"], reverse=True)
+    return _describe(db, pairs)
+
+@router.get("/articles/{article_id}")
+def get_article_duplicates(
+    article_id: int,
+    min_similarity: Optional[float] = Query(None, ge=0, le=1),
+    db: Session = Depends(get_read_db)
+):
+    """Documents whose text matches an article's PDF, e.g. to spot a re-imported paper"""
+    if get_by_id(db, ArticleQueue, article_id) is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    if not numpy_available():
+        raise HTTPException(status_code=503, detail="Duplicate detection is not available")
+    matches = article_candidates(
+        db, article_id, min_similarity if min_similarity is not None else settings.MINHASH_THRESHOLD
+    )
+    if matches is None:
+        raise HTTPException(status_code=409, detail="The article's PDF has not been fingerprinted yet")
+    matches.sort(key=lambda match: match["similarity"], reverse=True)
+    documents = {
+        row.id: row for row in db.execute(
+            select(Document.id, Document.title, Document.doi)
+            .where(Document.id.in_([match["document_id"] for match in matches]))
+        )
+    } if matches else {}
+    for match in matches:
+        row = documents.get(match["document_id"])
+        match["document"] = {"title": row.title if row else None, "doi": row.doi if row else None}
+    return matches
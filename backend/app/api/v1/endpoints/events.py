@@ -0,0 +1,69 @@
+import asyncio
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.events import RESYNC, TABLES, event_broker
+from app.core.serialization import json_dumps
+
+router = APIRouter()
+
+EVENT_TABLES = {table for table, _ in TABLES.values()}
+RESYNC_MESSAGE = b"event: resync\ndata: {}\n\n"
+
+def _format(event: dict) -> bytes:
+    return (
+        f"id: {event['version']}\nevent: {event['table']}\n".encode()
+        + b"data: " + json_dumps(event) + b"\n\n"
+    )
+
+@router.get("/")
+async def stream_events(
+    request: Request,
+    table: Optional[List[str]] = Query(None, description="article and/or document"),
+    id: Optional[List[int]] = Query(None),
+    status: Optional[List[str]] = Query(None)
+):
+    """Server-sent events for article and document changes (id, op, status, version)"""
+    if not settings.EVENTS_ENABLED:
+        raise HTTPException(status_code=404, detail="Event stream is disabled")
+    if table and not set(table) <= EVENT_TABLES:
+        raise HTTPException(status_code=400, detail=f"table must be one of {sorted(EVENT_TABLES)}")
+
+    subscription = event_broker.subscribe(
+        set(table) if table else None,
+        set(id) if id else None,
+        set(status) if status else None
+    )
+
+    async def stream():
+        try:
+            yield b"retry: 3000\n: connected\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.EVENTS_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    # Keeps proxies from closing an idle stream
+                    yield b": ping\n\n"
+                    continue
+                if event is RESYNC:
+                    # The listener reconnected; refetch and keep streaming
+                    yield RESYNC_MESSAGE
+                    continue
+                yield _format(event)
+                if subscription.overflowed and subscription.queue.empty():
+                    # Missed events; the client should refetch, then reconnect
+                    yield RESYNC_MESSAGE
+                    break
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
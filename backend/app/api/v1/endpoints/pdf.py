@@ -1,37 +1,86 @@
 from fastapi import APIRouter, UploadFile, HTTPException, Depends
 from sqlalchemy.orm import Session
-from app.core.s3 import S3Client
+from sqlalchemy.exc import IntegrityError
+from typing import Optional
+import asyncio
+import hashlib
+import logging
+from app.core.s3 import S3Client, get_s3_client
 from app.db.session import get_db
+from app.db.lookups import article_id_by_content_hash, document_id_by_pdf_key, pdf_by_content_hash
 from app.models import PDF
 from app.core.config import settings
+from app.services.pdf_optimize import optimize_and_store
 
 router = APIRouter()
-s3_client = S3Client()
+logger = logging.getLogger(__name__)
+
+UPLOAD_READ_SIZE = 1024 * 1024
+
+def _duplicate_response(pdf: PDF, db: Session, bucket: str) -> dict:
+    """Describe an already stored PDF together with results derived from it"""
+    document_id = document_id_by_pdf_key(db, pdf.s3_key, bucket)
+    article_id = article_id_by_content_hash(db, pdf.content_hash)
+    return {
+        "id": pdf.id,
+        "filename": pdf.filename,
+        "s3_key": pdf.s3_key,
+        "status": pdf.status,
+        "content_hash": pdf.content_hash,
+        "original_size": pdf.original_size,
+        "optimized_size": pdf.optimized_size,
+        "optimized_s3_key": pdf.optimized_s3_key,
+        "duplicate": True,
+        "document_id": document_id,
+        "article_id": article_id
+    }
 
 @router.post("/upload/")
 async def upload_pdf(
     file: UploadFile,
-    db: Session = Depends(get_db)
+    optimize: Optional[bool] = None,
+    db: Session = Depends(get_db),
+    s3_client: S3Client = Depends(get_s3_client)
 ) -> dict:
-    # Add file size check
+    if file.content_type != 'application/pdf':
+        raise HTTPException(status_code=400, detail="Invalid file type")
+    
+    # Hash while reading so the size limit is enforced before the whole body is buffered
+    hasher = hashlib.sha256()
+    parts = []
     file_size = 0
-    file_content = await file.read()
-    if len(file_content) > settings.MAX_FILE_SIZE:  # Add to Settings
-        raise HTTPException(status_code=413, detail="File too large")
+    while chunk := await file.read(UPLOAD_READ_SIZE):
+        file_size += len(chunk)
+        if file_size > settings.MAX_FILE_SIZE:
+            raise HTTPException(status_code=413, detail="File too large")
+        hasher.update(chunk)
+        parts.append(chunk)
+    file_content = b"".join(parts)
+    content_hash = hasher.hexdigest()
+    
+    # Re-uploads reuse the stored object and any processing already done
+    existing = pdf_by_content_hash(db, content_hash)
+    if existing:
+        return _duplicate_response(existing, db, s3_client.bucket_name)
     
     try:
-        # Upload to S3 with content type verification
-        content_type = file.content_type
-        if content_type != 'application/pdf':
-            raise HTTPException(status_code=400, detail="Invalid file type")
-            
-        s3_key = await s3_client.upload_pdf(file_content)
+        s3_key = await s3_client.upload_pdf(file_content, content_hash=content_hash)
+        
+        # The original stays as uploaded; viewers get the optimized copy if there is one
+        optimized = None
+        if settings.PDF_OPTIMIZE_ON_UPLOAD if optimize is None else optimize:
+            optimized = await asyncio.to_thread(
+                optimize_and_store, s3_client, s3_client.bucket_name, content_hash, file_content
+            )
         
         # Store metadata in database
         pdf = PDF(
             filename=file.filename,
             s3_key=s3_key,
-            status="uploaded"
+            status="uploaded",
+            content_hash=content_hash,
+            original_size=file_size,
+            **(optimized or {})
         )
         db.add(pdf)
         db.commit()
@@ -41,8 +90,21 @@ async def upload_pdf(
             "id": pdf.id,
             "filename": pdf.filename,
             "s3_key": pdf.s3_key,
-            "status": pdf.status
+            "status": pdf.status,
+            "content_hash": pdf.content_hash,
+            "original_size": pdf.original_size,
+            "optimized_size": pdf.optimized_size,
+            "optimized_s3_key": pdf.optimized_s3_key,
+            "duplicate": False
         }
+    except IntegrityError as e:
+        db.rollback()
+        # A concurrent upload of the same file won the insert
+        existing = pdf_by_content_hash(db, content_hash)
+        if existing is not None:
+            return _duplicate_response(existing, db, s3_client.bucket_name)
+        logger.error(f"Could not store PDF metadata: {str(e)}")
+        raise HTTPException(status_code=409, detail="PDF metadata conflicts with an existing record")
     except Exception as e:
         db.rollback()
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,23 +1,76 @@
-from fastapi import APIRouter, HTTPException, Depends, Security
-from app.core.s3 import S3Client
+from botocore.exceptions import ClientError
+from fastapi import APIRouter, HTTPException, Depends, Header, Security
+from app.core.s3 import S3Client, get_s3_client
 from app.core.security import get_api_key
 import logging
 from typing import List, Optional
 from app.core.config import settings
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-import boto3
-from app.models.article_queue import ArticleQueue
+from app.db.session import get_read_db
+from app.db.lookups import article_pdf_keys
+from app.services.storage_tiering import COLD, RestoreInProgress, get_object_any_tier, locate_cold
 from fastapi.responses import StreamingResponse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
-s3_client = S3Client()
+
+def _cold_key_or_error(s3_client: S3Client, s3_key: str) -> str:
+    """Readable cold-tier key for `s3_key`; 503 while an archived copy is restored"""
+    try:
+        cold_key = locate_cold(s3_client, settings.AWS_ARTICLE_QUEUE_BUCKET, s3_key)
+    except RestoreInProgress as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    if cold_key is None:
+        raise HTTPException(status_code=404, detail="PDF not found in S3")
+    return cold_key
+
+def _get_pdf_object(s3_client: S3Client, s3_key: str, tier: Optional[str] = None,
+                    byte_range: Optional[str] = None) -> dict:
+    """get_object for a PDF in either tier; hot is tried first unless the row says cold"""
+    # S3 answers a malformed Range with the whole object, a valid one with 206
+    params = {"Range": byte_range} if byte_range else {}
+    try:
+        return get_object_any_tier(s3_client, settings.AWS_ARTICLE_QUEUE_BUCKET, s3_key, tier, **params)
+    except RestoreInProgress as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="PDF not found in S3")
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "InvalidRange":
+            raise HTTPException(status_code=416, detail="Requested range not satisfiable")
+        raise
+
+def _pdf_response(response: dict, headers: dict) -> StreamingResponse:
+    """Stream a get_object result; a ranged read becomes 206 Partial Content"""
+    headers = {
+        **headers,
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(response["ContentLength"])
+    }
+    status_code = 200
+    if response.get("ContentRange"):
+        headers["Content-Range"] = response["ContentRange"]
+        status_code = 206
+    return StreamingResponse(
+        response['Body'].iter_chunks(),
+        status_code=status_code,
+        media_type="application/pdf",
+        headers=headers
+    )
 
 @router.get("/", response_model=List[dict])
 async def list_s3_files(
     prefix: Optional[str] = "",
-    api_key: str = Security(get_api_key)
+    api_key: str = Security(get_api_key),
+    s3_client: S3Client = Depends(get_s3_client)
 ):
     """List files in S3 bucket"""
     try:
@@ -33,7 +86,8 @@ async def list_s3_files(
 @router.delete("/{s3_key:path}")
 async def delete_s3_file(
     s3_key: str,
-    api_key: str = Security(get_api_key)
+    api_key: str = Security(get_api_key),
+    s3_client: S3Client = Depends(get_s3_client)
 ):
     """Delete a file from S3 bucket"""
     try:
@@ -52,6 +106,7 @@ async def delete_s3_file(
 @router.get("/list-files/", response_model=List[dict])
 async def list_files(
     prefix: Optional[str] = None,
+    s3_client: S3Client = Depends(get_s3_client)
 ):
     """List all files in the S3 bucket with optional prefix filter"""
     try:
@@ -84,7 +139,7 @@ async def list_files(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/test-s3")
-async def test_s3_connection():
+async def test_s3_connection(s3_client: S3Client = Depends(get_s3_client)):
     """Test S3 connection using configured bucket"""
     try:
         # Test with your configured bucket
@@ -109,7 +164,7 @@ async def test_s3_connection():
         }
 
 @router.get("/test-buckets")
-async def test_bucket_access():
+async def test_bucket_access(s3_client: S3Client = Depends(get_s3_client)):
     """Test access to configured S3 buckets"""
     try:
         results = {}
@@ -148,125 +203,118 @@ async def test_bucket_access():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/get-presigned-url/{article_id}")
-async def get_presigned_url(article_id: int, db: Session = Depends(get_db)):
+async def get_presigned_url(
+    article_id: int,
+    db: Session = Depends(get_read_db),
+    s3_client: S3Client = Depends(get_s3_client)
+):
     """Get a presigned URL for viewing a PDF"""
     try:
         # Get article from database
-        article = db.query(ArticleQueue).filter(ArticleQueue.id == article_id).first()
+        article = article_pdf_keys(db, article_id)
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
             
         if not article.pdf_s3_key:
             raise HTTPException(status_code=404, detail="No PDF key found for this article")
 
-        # Create S3 client
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY,
-            aws_secret_access_key=settings.AWS_SECRET_KEY,
-            region_name=settings.AWS_REGION
-        )
         
-        logger.info(f"Generating presigned URL for bucket: {settings.AWS_ARTICLE_QUEUE_BUCKET}, key: {article.pdf_s3_key}")
+        # Prefer the linearized copy so the viewer can render before the download finishes
+        pdf_key = article.pdf_optimized_s3_key or article.pdf_s3_key
+        if article.storage_tier == COLD:
+            pdf_key = _cold_key_or_error(s3_client, pdf_key)
+        logger.info(f"Generating presigned URL for bucket: {settings.AWS_ARTICLE_QUEUE_BUCKET}, key: {pdf_key}")
 
         # Generate URL
-        url = s3_client.generate_presigned_url(
+        url = s3_client.s3.generate_presigned_url(
             'get_object',
             Params={
                 'Bucket': settings.AWS_ARTICLE_QUEUE_BUCKET,
-                'Key': article.pdf_s3_key
+                'Key': pdf_key
             },
             ExpiresIn=3600  # URL valid for 1 hour
         )
         
         return {
             "url": url,
-            "key": article.pdf_s3_key,
+            "key": pdf_key,
             "bucket": settings.AWS_ARTICLE_QUEUE_BUCKET
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating presigned URL: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/get-pdf/{article_id}")
-async def get_pdf_content(article_id: int, db: Session = Depends(get_db)):
+async def get_pdf_content(
+    article_id: int,
+    byte_range: Optional[str] = Header(None, alias="Range"),
+    db: Session = Depends(get_read_db),
+    s3_client: S3Client = Depends(get_s3_client)
+):
     """Get PDF content directly from S3"""
     try:
         # Get article from database
-        article = db.query(ArticleQueue).filter(ArticleQueue.id == article_id).first()
+        article = article_pdf_keys(db, article_id)
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
             
         if not article.pdf_s3_key:
             raise HTTPException(status_code=404, detail="No PDF key found for this article")
 
-        # Create S3 client
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY,
-            aws_secret_access_key=settings.AWS_SECRET_KEY,
-            region_name=settings.AWS_REGION
-        )
 
         try:
             # Get the object from S3
-            response = s3_client.get_object(
-                Bucket=settings.AWS_ARTICLE_QUEUE_BUCKET,
-                Key=article.pdf_s3_key
+            response = _get_pdf_object(
+                s3_client,
+                article.pdf_optimized_s3_key or article.pdf_s3_key,
+                article.storage_tier,
+                byte_range
             )
             
             # Return streaming response with PDF content
-            return StreamingResponse(
-                response['Body'].iter_chunks(),
-                media_type="application/pdf",
-                headers={
-                    "Content-Disposition": f'inline; filename="{article.pdf_s3_key}"'
-                }
-            )
+            return _pdf_response(response, {
+                "Content-Disposition": f'inline; filename="{article.pdf_s3_key}"'
+            })
 
-        except s3_client.exceptions.NoSuchKey:
+        except s3_client.s3.exceptions.NoSuchKey:
             raise HTTPException(status_code=404, detail="PDF not found in S3")
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting PDF: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/get-pdf-by-key/{s3_key:path}")
-async def get_pdf_by_key(s3_key: str):
+async def get_pdf_by_key(
+    s3_key: str,
+    byte_range: Optional[str] = Header(None, alias="Range"),
+    s3_client: S3Client = Depends(get_s3_client)
+):
     """Get PDF content directly from S3 using the key"""
     try:
         logger.info(f"Attempting to get PDF with key: {s3_key}")
-        # Create S3 client
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY,
-            aws_secret_access_key=settings.AWS_SECRET_KEY,
-            region_name=settings.AWS_REGION
-        )
 
         try:
-            # Get the object from S3
-            response = s3_client.get_object(
-                Bucket=settings.AWS_ARTICLE_QUEUE_BUCKET,
-                Key=s3_key
-            )
+            # Get the object from S3, following it to the cold tier if it was moved
+            response = _get_pdf_object(s3_client, s3_key, byte_range=byte_range)
             
             logger.info(f"Successfully retrieved PDF from S3: {s3_key}")
             
             # Return streaming response with PDF content
-            return StreamingResponse(
-                response['Body'].iter_chunks(),
-                media_type="application/pdf",
-                headers={
-                    "Content-Disposition": f'inline; filename="{s3_key.split("/")[-1]}"',
-                    "Access-Control-Allow-Origin": "*"
-                }
-            )
+            return _pdf_response(response, {
+                "Content-Disposition": f'inline; filename="{s3_key.split("/")[-1]}"',
+                "Access-Control-Allow-Origin": "*"
+            })
 
-        except s3_client.exceptions.NoSuchKey:
+        except s3_client.s3.exceptions.NoSuchKey:
             logger.error(f"PDF not found in S3: {s3_key}")
             raise HTTPException(status_code=404, detail="PDF not found in S3")
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting PDF: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
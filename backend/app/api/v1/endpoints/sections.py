@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.deps import get_db
+from app.db.lookups import get_by_id
+from app.core.cache import response_cache
 from app.schemas.section import SectionCreate, SectionUpdate, SectionResponse
 from app.models.section import Section
 
@@ -14,14 +16,18 @@ async def update_section(
     db: Session = Depends(get_db)
 ):
     """Update section content"""
-    db_section = db.query(Section).filter(Section.id == section_id).first()
+    db_section = get_by_id(db, Section, section_id)
     if not db_section:
         raise HTTPException(status_code=404, detail="Section not found")
     
+    # A moved section leaves the old document's cached detail stale too
+    previous_document_id = db_section.document_id
     for field, value in section.dict(exclude_unset=True).items():
         setattr(db_section, field, value)
     
     db.commit()
+    for document_id in {previous_document_id, db_section.document_id}:
+        response_cache.invalidate("document", document_id)
     db.refresh(db_section)
     return db_section
 
@@ -39,6 +45,8 @@ async def create_sections_batch(
     
     try:
         db.commit()
+        for document_id in {section.document_id for section in sections}:
+            response_cache.invalidate("document", document_id)
         for section in db_sections:
             db.refresh(section)
         return db_sections
@@ -52,12 +60,14 @@ async def delete_section(
     db: Session = Depends(get_db)
 ):
     """Delete specific section"""
-    db_section = db.query(Section).filter(Section.id == section_id).first()
+    db_section = get_by_id(db, Section, section_id)
     if not db_section:
         raise HTTPException(status_code=404, detail="Section not found")
     
+    document_id = db_section.document_id
     db.delete(db_section)
     db.commit()
+    response_cache.invalidate("document", document_id)
     return {"message": "Section deleted successfully"}
 
 @router.get("/types")
@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.deps import get_db
+from app.db.lookups import get_by_id
+from app.core.cache import response_cache
 from app.schemas.text_chunk import TextChunkCreate, TextChunkUpdate, TextChunkResponse
 from app.models.text_chunk import TextChunk
 
@@ -14,7 +16,7 @@ async def update_chunk(
     db: Session = Depends(get_db)
 ):
     """Update chunk content"""
-    db_chunk = db.query(TextChunk).filter(TextChunk.id == chunk_id).first()
+    db_chunk = get_by_id(db, TextChunk, chunk_id)
     if not db_chunk:
         raise HTTPException(status_code=404, detail="Text chunk not found")
     
@@ -22,6 +24,7 @@ async def update_chunk(
         setattr(db_chunk, field, value)
     
     db.commit()
+    response_cache.invalidate("document", db_chunk.document_id)
     db.refresh(db_chunk)
     return db_chunk
 
@@ -40,10 +43,12 @@ async def delete_chunk(
     db: Session = Depends(get_db)
 ):
     """Delete specific chunk"""
-    db_chunk = db.query(TextChunk).filter(TextChunk.id == chunk_id).first()
+    db_chunk = get_by_id(db, TextChunk, chunk_id)
     if not db_chunk:
         raise HTTPException(status_code=404, detail="Text chunk not found")
     
+    document_id = db_chunk.document_id
     db.delete(db_chunk)
     db.commit()
+    response_cache.invalidate("document", document_id)
     return {"message": "Text chunk deleted successfully"} 
\ No newline at end of file
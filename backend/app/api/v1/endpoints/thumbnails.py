@@ -0,0 +1,103 @@
+import asyncio
+import hashlib
+import logging
+from typing import Dict, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.deps import get_read_db
+from app.core.s3 import S3Client, get_s3_client
+from app.db.lookups import article_pdf_keys
+from app.services.storage_tiering import RestoreInProgress
+from app.services.thumbnails import (
+    CONTENT_TYPES,
+    fetch_stored,
+    render_article,
+    renderer_available,
+    stored_page_count,
+    thumbnail_key
+)
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# URLs naming the PDF (?pdf=<pdf_s3_key>) never change meaning, so browsers and
+# CDNs may keep them for a year; bare URLs must revalidate, since the import
+# can replace the article's PDF
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# One render per article PDF at a time; concurrent requests wait on the same task
+_renders: Dict[Tuple[int, str], asyncio.Task] = {}
+
+async def _render_once(s3_client: S3Client, article_id: int, pdf_s3_key: str,
+                       tier: Optional[str]) -> Dict[int, Tuple[bytes, str]]:
+    render_key = (article_id, pdf_s3_key)
+    task = _renders.get(render_key)
+    if task is None:
+        task = asyncio.create_task(render_article(s3_client, article_id, pdf_s3_key, tier))
+        _renders[render_key] = task
+        task.add_done_callback(lambda _: _renders.pop(render_key, None))
+    return await asyncio.shield(task)
+
+def _image_response(request: Request, data: bytes, fmt: str, immutable: bool) -> Response:
+    etag = f'"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+    headers = {"Cache-Control": CACHE_CONTROL if immutable else REVALIDATE, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=data, media_type=CONTENT_TYPES[fmt], headers=headers)
+
+@router.get("/{article_id}/{page}")
+async def get_thumbnail(
+    article_id: int,
+    page: int,
+    request: Request,
+    pdf: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    s3_client: S3Client = Depends(get_s3_client)
+):
+    """Serve a page thumbnail, rendering the article's first pages on a miss.
+
+    Pass the article's pdf_s3_key as `pdf` to get a response that may be
+    cached for good.
+    """
+    if not 1 <= page <= settings.THUMBNAIL_PAGES:
+        raise HTTPException(status_code=404, detail="Thumbnail not available for this page")
+
+    # Stored thumbnails are named after the current PDF, so look it up first
+    article = article_pdf_keys(db, article_id)
+    if not article or not article.pdf_s3_key:
+        raise HTTPException(status_code=404, detail="Article or PDF not found")
+    pdf_s3_key = article.pdf_s3_key
+    immutable = pdf == pdf_s3_key
+
+    width = settings.THUMBNAIL_WIDTH
+    # Without Pillow thumbnails are stored as PNG, so look for both
+    formats = list(dict.fromkeys([settings.THUMBNAIL_FORMAT, "png"]))
+    for fmt in formats:
+        data = await fetch_stored(s3_client, thumbnail_key(article_id, pdf_s3_key, page, width, fmt))
+        if data is not None:
+            return _image_response(request, data, fmt, immutable)
+
+    # Shorter PDFs have no thumbnail for this page; don't render them again to find out
+    page_count = await stored_page_count(s3_client, article_id, pdf_s3_key)
+    if page_count is not None and page > page_count:
+        raise HTTPException(status_code=404, detail="Page not found in PDF")
+
+    if not renderer_available():
+        raise HTTPException(status_code=503, detail="Thumbnail rendering is not installed")
+
+    try:
+        rendered = await _render_once(s3_client, article_id, pdf_s3_key, article.storage_tier)
+    except RestoreInProgress as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="PDF not found in S3")
+    except Exception as e:
+        logger.error(f"Error rendering thumbnails for article {article_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error rendering thumbnails: {str(e)}")
+
+    if page not in rendered:
+        raise HTTPException(status_code=404, detail="Page not found in PDF")
+    data, fmt = rendered[page]
+    return _image_response(request, data, fmt, immutable)
@@ -0,0 +1,133 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from fastapi import Request, Response
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class CachedResponse:
+    """A serialized JSON body together with its strong ETag"""
+    __slots__ = ("body", "etag", "expires_at")
+
+    def __init__(self, body: bytes, expires_at: float = 0.0):
+        self.body = body
+        self.etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self.expires_at = expires_at
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Check an If-None-Match header (weak comparison, as RFC 9110 requires)"""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == self.etag:
+                return True
+        return False
+
+    def to_response(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        return Response(
+            content=self.body,
+            media_type="application/json",
+            headers=headers
+        )
+
+class ResponseCache:
+    """In-process cache of serialized GET responses keyed by resource and version.
+
+    Entries are grouped per (resource, id) so that one invalidation drops
+    every cached variant of a resource (e.g. a document and its sections).
+    Each invalidation bumps the resource version; a reader that started
+    before the bump is not allowed to store what it read. Writes that never
+    reach `invalidate` (other workers' section/chunk edits, batch scripts)
+    are bounded by `ttl` seconds instead.
+    """
+
+    def __init__(self, max_entries: int = 2048, enabled: bool = True, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.ttl = ttl
+        self._entries = OrderedDict()   # (resource, id) -> {variant: CachedResponse}
+        self._versions = OrderedDict()  # (resource, id) -> version of last invalidation
+        self._counter = 0
+        self._floor = 0                 # highest version evicted from _versions
+        self._lock = threading.Lock()
+
+    def version(self, resource: str, resource_id) -> int:
+        """Version to pass back to `set` after reading from the database"""
+        with self._lock:
+            return self._versions.get((resource, resource_id), self._floor)
+
+    def get(self, resource: str, resource_id, variant: str = "") -> Optional[CachedResponse]:
+        if not self.enabled:
+            return None
+        key = (resource, resource_id)
+        with self._lock:
+            variants = self._entries.get(key)
+            if variants is None:
+                return None
+            entry = variants.get(variant)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del variants[variant]
+                if not variants:
+                    del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(
+        self,
+        resource: str,
+        resource_id,
+        body: bytes,
+        variant: str = "",
+        version: Optional[int] = None
+    ) -> CachedResponse:
+        """Store a serialized body unless the resource changed since `version`"""
+        entry = CachedResponse(body, time.monotonic() + self.ttl)
+        if not self.enabled:
+            return entry
+
+        key = (resource, resource_id)
+        with self._lock:
+            current = self._versions.get(key, self._floor)
+            if version is not None and version != current:
+                return entry
+            self._entries.setdefault(key, {})[variant] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, resource: str, resource_id):
+        """Drop every cached variant of a resource after a write"""
+        key = (resource, resource_id)
+        with self._lock:
+            self._counter += 1
+            self._versions[key] = self._counter
+            self._versions.move_to_end(key)
+            self._entries.pop(key, None)
+            # Version history only needs to outlive in-flight reads
+            while len(self._versions) > self.max_entries * 4:
+                _, evicted = self._versions.popitem(last=False)
+                self._floor = max(self._floor, evicted)
+
+    def clear(self):
+        """Drop every entry; reads that started before the clear won't be stored"""
+        with self._lock:
+            self._counter += 1
+            self._floor = self._counter
+            self._versions.clear()
+            self._entries.clear()
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+)
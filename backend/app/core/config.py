@@ -1,3 +1,4 @@
+import importlib.util
 from pydantic_settings import BaseSettings
 from typing import Optional
 from pydantic import Field
@@ -13,12 +14,28 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     DATABASE_POOL_SIZE: int = 5
     DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: int = 30
+    # Connections older than this are replaced at checkout
+    DATABASE_POOL_RECYCLE: int = 1800
+    # Recycling doesn't catch connections dropped by a failover or proxy; keep pinging
+    DATABASE_POOL_PRE_PING: bool = True
+    # When set, pool sizes are derived from this many connections shared by all workers
+    DATABASE_CONNECTION_BUDGET: int = 0
+    WEB_CONCURRENCY: int = 1
+    DATABASE_SSLMODE: str = "require"
+    # Comma-separated read replica URLs; empty sends all reads to the primary
+    DATABASE_REPLICA_URLS: str = ""
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DATABASE_REPLICA_LAG_CHECK_SECONDS: float = 2.0
+    # How long a client's reads stay on the primary after its own write
+    DATABASE_READ_YOUR_WRITES_SECONDS: int = 10
     
-    # AWS Settings
-    AWS_ACCESS_KEY: str
-    AWS_SECRET_KEY: str
-    AWS_REGION: str
-    AWS_ARTICLE_QUEUE_BUCKET: str
+    # AWS Settings (optional so the app imports without them; S3 calls need them)
+    AWS_ACCESS_KEY: Optional[str] = None
+    AWS_SECRET_KEY: Optional[str] = None
+    AWS_REGION: Optional[str] = None
+    AWS_BUCKET_NAME: Optional[str] = None
+    AWS_ARTICLE_QUEUE_BUCKET: Optional[str] = None
     
     # OpenAI Settings
     OPENAI_API_KEY: str
@@ -26,8 +43,22 @@ class Settings(BaseSettings):
     # Security settings
     ALLOWED_ORIGINS: list = ["http://localhost:3000"]
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
+    # Linearize uploads and store a web-optimized copy (requires `pikepdf`)
+    PDF_OPTIMIZE_ON_UPLOAD: bool = False
     API_KEY_NAME: str = "X-API-Key"
     RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMIT_BURST: int = 0  # bucket size; 0 means RATE_LIMIT_PER_MINUTE
+    # Separate budget for thumbnails and single-article reads (one per list row / change event)
+    RATE_LIMIT_LIGHT_PER_MINUTE: int = 1200
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" or "redis"
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    
+    # Concurrency caps per expensive endpoint class (requests beyond get a 503)
+    CONCURRENCY_LIMIT_PDF_STREAM: int = 16
+    CONCURRENCY_LIMIT_S3_LIST: int = 4
+    CONCURRENCY_LIMIT_SEARCH: int = 8
+    CONCURRENCY_RETRY_AFTER: int = 2
     
     # Improve AWS settings
     AWS_ENDPOINT_URL: Optional[str] = None
@@ -37,6 +68,61 @@ class Settings(BaseSettings):
     PDF_ALLOWED_MIME_TYPES: list = ["application/pdf"]
     MAX_CHUNK_SIZE: int = 1000
     
+    # In-process response cache for hot GET endpoints
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    # Upper bound on staleness for writes the cache is not told about
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+    
+    # Prometheus metrics exposed on /metrics
+    METRICS_ENABLED: bool = True
+    
+    # SQL instrumentation (per-request query counts, slow query log, N+1)
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SQL_SLOW_QUERY_MS: int = 200
+    SQL_REPEATED_QUERY_THRESHOLD: int = 5
+    
+    # Section/chunk text storage: "none" or "zstd" (requires `zstandard`)
+    TEXT_COMPRESSION: str = "none"
+    TEXT_COMPRESSION_MIN_BYTES: int = 1024
+    TEXT_COMPRESSION_LEVEL: int = 3
+    
+    # Server-sent row change events (Postgres LISTEN/NOTIFY)
+    EVENTS_ENABLED: bool = True
+    EVENTS_HEARTBEAT_SECONDS: int = 15
+    EVENTS_QUEUE_SIZE: int = 1000
+    
+    # Rows per UPDATE in bulk status transitions; each batch sends one notify
+    # (its id list must fit the 8000-byte NOTIFY payload)
+    STATUS_TRANSITION_BATCH_SIZE: int = 500
+    
+    # Live annotation rooms: how long edits are batched before one DB write.
+    # Rooms are held in process memory and are refused when WEB_CONCURRENCY > 1
+    COLLAB_ENABLED: bool = True
+    COLLAB_FLUSH_MS: int = 300
+    
+    # Page thumbnails (requires the `pymupdf` package; WebP also needs `pillow`)
+    THUMBNAIL_PAGES: int = 3
+    THUMBNAIL_WIDTH: int = 240
+    THUMBNAIL_FORMAT: str = "webp"  # "webp" or "png"
+    THUMBNAIL_CACHE_DIR: str = "/tmp/pdf-annotator-thumbnails"
+    THUMBNAIL_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    THUMBNAIL_WORKERS: int = 2
+    
+    # Near-duplicate detection (requires `numpy`); bands x rows must equal MINHASH_NUM_PERM.
+    # 16 bands of 8 rows make pairs above ~0.7 Jaccard likely to share a bucket
+    MINHASH_NUM_PERM: int = 128
+    MINHASH_BANDS: int = 16
+    MINHASH_SHINGLE_WORDS: int = 5
+    MINHASH_THRESHOLD: float = 0.8
+    
+    # Cold tier for PDFs of promoted articles (see app/services/storage_tiering.py)
+    PDF_COLD_PREFIX: str = "cold/"
+    PDF_COLD_STORAGE_CLASS: str = "GLACIER_IR"  # GLACIER/DEEP_ARCHIVE need a restore before reads
+    PDF_COLD_AFTER_DAYS: int = 30
+    PDF_COLD_RESTORE_DAYS: int = 7
+    PDF_COLD_RESTORE_TIER: str = "Standard"  # "Expedited", "Standard" or "Bulk"
+    
     ENVIRONMENT: str = "development"
     
     API_KEY: str = Field(default="your_default_api_key")
@@ -46,6 +132,10 @@ class Settings(BaseSettings):
         case_sensitive = True
         extra = "allow"
 
+    @property
+    def database_replica_urls(self):
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
     # Helper method for AWS credentials
     @property
     def aws_credentials(self):
@@ -59,6 +149,11 @@ class Settings(BaseSettings):
         super().model_post_init(*args, **kwargs)
         if self.API_KEY == "your_default_api_key":
             self.API_KEY = self.SECRET_KEY
+        # Fail at startup rather than on the first section or chunk write
+        if self.TEXT_COMPRESSION not in ("none", "zstd"):
+            raise ValueError(f"TEXT_COMPRESSION must be 'none' or 'zstd', not '{self.TEXT_COMPRESSION}'")
+        if self.TEXT_COMPRESSION == "zstd" and importlib.util.find_spec("zstandard") is None:
+            raise ValueError("TEXT_COMPRESSION=zstd requires the zstandard package (requirements-optional.txt)")
 
 settings = Settings()
 
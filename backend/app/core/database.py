@@ -1,28 +1,5 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import QueuePool
+# Kept for older imports; engines and sessions live in app.db.session
+from sqlalchemy.orm import declarative_base
+from app.db.session import engine, SessionLocal, get_db, get_read_db
 
-from app.core.config import settings
-
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    poolclass=QueuePool,
-    pool_size=settings.DATABASE_POOL_SIZE,
-    max_overflow=settings.DATABASE_MAX_OVERFLOW,
-    pool_pre_ping=True,  # Enable connection health checks
-)
-
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Create Base class for declarative models
 Base = declarative_base()
-
-# Dependency for database sessions
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
@@ -1,11 +1,4 @@
 from typing import Generator
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal
-
-def get_db() -> Generator:
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close() 
\ No newline at end of file
+from app.db.session import SessionLocal, get_db, get_read_db
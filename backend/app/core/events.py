@@ -0,0 +1,197 @@
+import asyncio
+import json
+import logging
+from typing import List, Optional, Set
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "row_changes"
+# Queued instead of an event when notifications may have been missed
+RESYNC = {"table": "resync"}
+# Trigger table name -> (event name, response cache resource)
+TABLES = {
+    "article_queue": ("article", "article"),
+    "documents": ("document", "document"),
+}
+# Event name -> response cache resource
+RESOURCES = {event: resource for event, resource in TABLES.values()}
+
+class Subscription:
+    """One SSE client: its filters and a bounded queue of pending events"""
+
+    def __init__(self, tables: Optional[Set[str]], ids: Optional[Set[int]], statuses: Optional[Set[str]]):
+        self.tables = tables
+        self.ids = ids
+        self.statuses = statuses
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+    def wants(self, event: dict) -> bool:
+        if self.tables and event["table"] not in self.tables:
+            return False
+        if self.ids and self.ids.isdisjoint(event.get("ids") or (event["id"],)):
+            return False
+        if self.statuses and event["status"] not in self.statuses:
+            return False
+        return True
+
+class EventBroker:
+    """Fans Postgres row-change notifications out to SSE subscribers.
+
+    Each worker holds one dedicated LISTEN connection, watched with
+    loop.add_reader, so no thread or pooled connection is tied up.
+    """
+
+    def __init__(self):
+        self.subscriptions: Set[Subscription] = set()
+        self.published = 0
+        self.dropped = 0
+        self._connection = None
+        self._task: Optional[asyncio.Task] = None
+        self._listened = False
+
+    def subscribe(self, tables=None, ids=None, statuses=None) -> Subscription:
+        subscription = Subscription(tables, ids, statuses)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscriptions.discard(subscription)
+
+    def publish(self, event: dict):
+        self.published += 1
+        resource = RESOURCES[event["table"]]
+        # Another worker (or a batch job) changed the row; cached bodies are stale
+        for row_id in event.get("ids") or (event["id"],):
+            response_cache.invalidate(resource, row_id)
+        for subscription in list(self.subscriptions):
+            if subscription.overflowed or not subscription.wants(event):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A client this far behind is told to resync instead of blocking everyone
+                subscription.overflowed = True
+                self.dropped += 1
+
+    def resync(self):
+        """Notifications were missed: drop every cached body and tell clients to refetch"""
+        response_cache.clear()
+        for subscription in list(self.subscriptions):
+            try:
+                subscription.queue.put_nowait(RESYNC)
+            except asyncio.QueueFull:
+                # Cut off anyway, which ends with a resync of its own
+                subscription.overflowed = True
+
+    def _parse(self, payload: str) -> Optional[dict]:
+        try:
+            data = json.loads(payload)
+            table, _ = TABLES[data["table"]]
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring malformed change notification {payload!r}: {str(e)}")
+            return None
+        event = {
+            "table": table,
+            "op": data["op"],
+            "id": data.get("id"),
+            "status": data["status"],
+            "version": data["version"]
+        }
+        if "ids" in data:
+            # One event for a whole bulk transition batch
+            event["ids"] = data["ids"]
+        return event
+
+    def _on_readable(self):
+        connection = self._connection
+        try:
+            connection.poll()
+        except Exception as e:
+            logger.error(f"Change listener connection failed: {str(e)}")
+            self._close_connection()
+            return
+        while connection.notifies:
+            event = self._parse(connection.notifies.pop(0).payload)
+            if event is not None:
+                self.publish(event)
+
+    def _connect(self):
+        from app.db.session import engine
+
+        # Detached from the pool: this connection lives as long as the listener
+        pooled = engine.raw_connection()
+        pooled.detach()
+        connection = pooled.dbapi_connection
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return connection
+
+    def _close_connection(self):
+        if self._connection is None:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            loop.remove_reader(self._connection.fileno())
+        except Exception:
+            pass
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        backoff = 1
+        while True:
+            if self._connection is None:
+                try:
+                    self._connection = await asyncio.to_thread(self._connect)
+                    loop.add_reader(self._connection.fileno(), self._on_readable)
+                    logger.info(f"Listening for {CHANNEL} notifications")
+                    backoff = 1
+                    if self._listened:
+                        # Changes made while the listener was down were never seen
+                        self.resync()
+                    self._listened = True
+                except Exception as e:
+                    logger.error(f"Could not start change listener: {str(e)}")
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 30)
+                    continue
+            await asyncio.sleep(settings.EVENTS_HEARTBEAT_SECONDS)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._close_connection()
+
+    def render(self) -> List[str]:
+        return [
+            "# HELP events_subscribers Open SSE event streams.",
+            "# TYPE events_subscribers gauge",
+            f"events_subscribers {len(self.subscriptions)}",
+            "# HELP events_published_total Row change notifications received.",
+            "# TYPE events_published_total counter",
+            f"events_published_total {self.published}",
+            "# HELP events_dropped_total Subscribers cut off for falling behind.",
+            "# TYPE events_dropped_total counter",
+            f"events_dropped_total {self.dropped}",
+        ]
+
+event_broker = EventBroker()
+metrics.register_collector(event_broker.render)
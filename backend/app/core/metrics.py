@@ -0,0 +1,152 @@
+import threading
+from bisect import bisect_left
+from typing import Callable, List
+
+# Upper bounds in seconds / bytes; the last bucket is +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608)
+QUANTILES = (0.5, 0.95, 0.99)
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Histogram:
+    """Fixed-bucket histogram; observe() only increments preallocated counters"""
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                if i == len(self.bounds):
+                    return lower
+                upper = self.bounds[i]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.bounds[-1]
+
+    def render(self, name: str, labels: str, lines: List[str]):
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+
+    def render_quantiles(self, name: str, labels: str, lines: List[str]):
+        for q in QUANTILES:
+            lines.append(f'{name}{{{labels},quantile="{q}"}} {self.quantile(q)}')
+
+class RouteStats:
+    """Counters for one (method, route template) pair, created once and reused"""
+    __slots__ = ("labels", "requests", "errors", "statuses", "latency", "size")
+
+    def __init__(self, method: str, route: str):
+        self.labels = f'method="{escape_label(method)}",route="{escape_label(route)}"'
+        self.requests = 0
+        self.errors = 0
+        self.statuses = [0] * 6  # indexed by status // 100
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+
+    def record(self, status_code: int, duration: float, response_bytes: int):
+        self.requests += 1
+        self.statuses[min(status_code // 100, 5)] += 1
+        if status_code >= 500:
+            self.errors += 1
+        self.latency.observe(duration)
+        self.size.observe(response_bytes)
+
+class MetricsRegistry:
+    """Per-route request metrics rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._routes = {}
+        # Not per route: the route is only known once the request has been routed
+        self.in_flight = 0
+        self._collectors: List[Callable[[], List[str]]] = []
+        self._lock = threading.Lock()
+
+    def route(self, method: str, route: str) -> RouteStats:
+        key = (method, route)
+        stats = self._routes.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._routes.setdefault(key, RouteStats(method, route))
+        return stats
+
+    def register_collector(self, collector: Callable[[], List[str]]):
+        """Add a callable returning extra exposition lines (with HELP/TYPE)"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        routes = list(self._routes.values())
+        lines = [
+            "# HELP http_requests_total Total HTTP requests by route and status class.",
+            "# TYPE http_requests_total counter"
+        ]
+        for stats in routes:
+            for status_class, count in enumerate(stats.statuses):
+                if count:
+                    lines.append(
+                        f'http_requests_total{{{stats.labels},status="{status_class}xx"}} {count}'
+                    )
+
+        lines += [
+            "# HELP http_request_errors_total HTTP requests that ended in a 5xx or an unhandled error.",
+            "# TYPE http_request_errors_total counter"
+        ]
+        lines += [f"http_request_errors_total{{{s.labels}}} {s.errors}" for s in routes]
+
+        lines += [
+            "# HELP http_requests_in_flight HTTP requests currently being served.",
+            "# TYPE http_requests_in_flight gauge"
+        ]
+        lines.append(f"http_requests_in_flight {self.in_flight}")
+
+        lines += [
+            "# HELP http_request_duration_seconds HTTP request latency.",
+            "# TYPE http_request_duration_seconds histogram"
+        ]
+        for stats in routes:
+            stats.latency.render("http_request_duration_seconds", stats.labels, lines)
+
+        lines += [
+            "# HELP http_request_duration_quantile_seconds Latency quantiles estimated from the histogram.",
+            "# TYPE http_request_duration_quantile_seconds gauge"
+        ]
+        for stats in routes:
+            stats.latency.render_quantiles(
+                "http_request_duration_quantile_seconds", stats.labels, lines
+            )
+
+        lines += [
+            "# HELP http_response_size_bytes HTTP response body size.",
+            "# TYPE http_response_size_bytes histogram"
+        ]
+        for stats in routes:
+            stats.size.render("http_response_size_bytes", stats.labels, lines)
+
+        for collector in self._collectors:
+            lines += collector()
+
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
@@ -1,7 +1,11 @@
 from fastapi import Request
+from starlette.datastructures import MutableHeaders
 import time
 import logging
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core import query_stats
+from app.db.session import PRIMARY_COOKIE, PRIMARY_HEADER
 
 logger = logging.getLogger(__name__)
 
@@ -15,4 +19,126 @@ async def logging_middleware(request: Request, call_next):
         f"Status: {response.status_code} Duration: {process_time:.2f}s"
     )
     
-    return response 
\ No newline at end of file
+    return response
+
+def route_label(scope) -> str:
+    """Route template for a request, e.g. /api/v1/documents/{document_id}.
+
+    Only valid once the router has run: it stores the matched route in the
+    scope. Templates keep label cardinality bounded; paths that match no
+    route are grouped under a single label so scans for random URLs can't
+    blow it up.
+    """
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+class ResponseRecorder:
+    """`send` wrapper noting the status code and body size of one response"""
+    __slots__ = ("send", "status", "size")
+
+    def __init__(self, send):
+        self.send = send
+        self.status = 500
+        self.size = 0
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message["type"] == "http.response.body":
+            self.size += len(message.get("body", b""))
+        await self.send(message)
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route counts, latency and sizes"""
+
+    def __init__(self, app, registry=metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recorder = ResponseRecorder(send)
+        self.registry.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, recorder)
+        finally:
+            self.registry.in_flight -= 1
+            # The router has stored the matched route in the scope by now
+            self.registry.route(scope["method"], route_label(scope)).record(
+                recorder.status, time.perf_counter() - start, recorder.size
+            )
+
+class QueryStatsMiddleware:
+    """Attribute SQL statements to the request that issued them.
+
+    In DEBUG mode the totals are returned as X-DB-* response headers; in all
+    modes they feed the db_* metrics and the repeated-statement (N+1) log.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = query_stats.start_request()
+        stats = query_stats.current_stats()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Query-Time-Ms"] = f"{stats.total_time * 1000:.2f}"
+                headers["X-DB-Repeated-Queries"] = str(
+                    len(stats.repeated(settings.SQL_REPEATED_QUERY_THRESHOLD))
+                )
+            await send(message)
+
+        try:
+            # Headers are only added in DEBUG; otherwise responses pass straight through
+            await self.app(scope, receive, send_wrapper if settings.DEBUG else send)
+        finally:
+            query_stats.end_request(token)
+            if stats.count:
+                query_stats.db_metrics.record_request(
+                    scope["method"], route_label(scope), stats
+                )
+
+class ReadYourWritesMiddleware:
+    """Pin a client's reads to the primary for a while after it writes.
+
+    Successful non-GET requests set a short-lived cookie that get_read_db
+    honours, so a client never reads an older state from a lagging replica
+    than the one it just wrote. The same expiry goes out as the
+    X-Read-Primary-Until header for cross-origin clients to echo back.
+    """
+
+    WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in self.WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                seconds = settings.DATABASE_READ_YOUR_WRITES_SECONDS
+                until = f"{time.time() + seconds:.0f}"
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{PRIMARY_COOKIE}={until}; Max-Age={seconds}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                headers[PRIMARY_HEADER] = until
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,185 @@
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from app.core.config import settings
+from app.core.metrics import Histogram, escape_label, metrics
+
+# Checkout waits are usually sub-millisecond; the tail is what matters
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+
+class PoolStats:
+    """Checkout counters for one engine's pool (survives pool recreation)"""
+
+    def __init__(self, role: str, max_overflow: int):
+        self.role = role
+        self.labels = f'pool="{escape_label(role)}"'
+        self.pool: Optional[QueuePool] = None
+        # QueuePool has no public accessor for it; known from pool_sizing()
+        self.max_overflow = max_overflow
+        self.wait = Histogram(POOL_WAIT_BUCKETS)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.peak_checked_out = 0
+        # Checkouts happen on every worker thread; += on shared counters isn't atomic
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait: float, checked_out: int):
+        with self._lock:
+            self.wait.observe(wait)
+            self.checkouts += 1
+            if checked_out > self.peak_checked_out:
+                self.peak_checked_out = checked_out
+
+    def record_timeout(self, wait: float):
+        with self._lock:
+            self.wait.observe(wait)
+            self.timeouts += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self):
+        with self._lock:
+            self.invalidations += 1
+
+    def capacity(self) -> int:
+        return self.pool.size() + self.max_overflow
+
+    def recommendation(self) -> dict:
+        """Suggest a per-worker pool size from observed contention"""
+        size = self.pool.size()
+        capacity = self.capacity()
+        p95_wait = self.wait.quantile(0.95)
+        if self.timeouts or (self.peak_checked_out >= capacity and p95_wait > 0.01):
+            suggested = math.ceil(capacity * 1.5)
+            action = "increase"
+            reason = f"{self.timeouts} checkout timeouts, p95 wait {p95_wait * 1000:.1f}ms at full capacity"
+        elif self.checkouts >= 1000 and self.peak_checked_out < size / 2:
+            suggested = max(2, self.peak_checked_out + 1)
+            action = "decrease"
+            reason = f"peak {self.peak_checked_out} checked out of {size} pooled connections"
+        else:
+            suggested = size
+            action = "keep"
+            reason = "no contention observed" if self.checkouts else "no checkouts yet"
+        return {
+            "action": action,
+            "reason": reason,
+            "pool_size_per_worker": suggested,
+            "connections_all_workers": suggested * settings.WEB_CONCURRENCY
+        }
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        with self._lock:
+            return {
+                "pool": self.role,
+                "size": pool.size(),
+                "max_overflow": self.max_overflow,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "peak_checked_out": self.peak_checked_out,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "wait_ms": {
+                    f"p{int(q * 100)}": round(self.wait.quantile(q) * 1000, 3) for q in (0.5, 0.95, 0.99)
+                },
+                "recommendation": self.recommendation()
+            }
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times every checkout, including waits for a free connection.
+
+    Wraps the public Pool.connect(), so the time also covers pre-ping and
+    checkout event handlers.
+    """
+
+    stats: Optional[PoolStats] = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            if self.stats is not None:
+                self.stats.record_timeout(time.perf_counter() - start)
+            raise
+        if self.stats is not None:
+            self.stats.record_checkout(time.perf_counter() - start, self.checkedout())
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.stats = self.stats
+        if self.stats is not None:
+            self.stats.pool = pool
+        return pool
+
+class PoolMetrics:
+    def __init__(self):
+        self.pools: Dict[str, PoolStats] = {}
+        self._lock = threading.Lock()
+
+    def instrument(self, engine, role: str, max_overflow: int):
+        pool = engine.pool
+        if not isinstance(pool, InstrumentedQueuePool):
+            return
+        stats = PoolStats(role, max_overflow)
+        stats.pool = pool
+        pool.stats = stats
+
+        def on_connect(dbapi_connection, connection_record):
+            stats.record_connect()
+
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            stats.record_invalidation()
+
+        event.listen(engine, "connect", on_connect)
+        event.listen(engine, "invalidate", on_invalidate)
+        with self._lock:
+            self.pools[role] = stats
+
+    def snapshot(self) -> List[dict]:
+        return [stats.snapshot() for stats in list(self.pools.values())]
+
+    def render(self) -> List[str]:
+        pools = list(self.pools.values())
+        lines = []
+        gauges = (
+            ("db_pool_size", "Configured pool size.", lambda s: s.pool.size()),
+            ("db_pool_checked_out", "Connections currently checked out.", lambda s: s.pool.checkedout()),
+            ("db_pool_overflow", "Overflow connections currently open.", lambda s: max(0, s.pool.overflow())),
+        )
+        for name, help_text, value in gauges:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            lines += [f"{name}{{{s.labels}}} {value(s)}" for s in pools]
+        counters = (
+            ("db_pool_checkouts_total", "Connections checked out.", "checkouts"),
+            ("db_pool_timeouts_total", "Checkouts that hit pool_timeout.", "timeouts"),
+            ("db_pool_connects_total", "New DBAPI connections opened.", "connects"),
+            ("db_pool_invalidations_total", "Connections invalidated after errors.", "invalidations"),
+        )
+        for name, help_text, attr in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f"{name}{{{s.labels}}} {getattr(s, attr)}" for s in pools]
+        lines += [
+            "# HELP db_pool_wait_seconds Time spent waiting to check out a connection.",
+            "# TYPE db_pool_wait_seconds histogram"
+        ]
+        for s in pools:
+            s.wait.render("db_pool_wait_seconds", s.labels, lines)
+        return lines
+
+pool_metrics = PoolMetrics()
+metrics.register_collector(pool_metrics.render)
@@ -0,0 +1,149 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+from sqlalchemy import event
+from app.core.config import settings
+from app.core.metrics import Histogram, LATENCY_BUCKETS, escape_label, metrics
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+class RequestQueryStats:
+    """Queries issued while serving one request"""
+    __slots__ = ("count", "total_time", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.statements = Counter()
+
+    def repeated(self, threshold: int) -> List[tuple]:
+        """Statements executed at least `threshold` times (likely N+1)"""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+_current_stats: contextvars.ContextVar[Optional[RequestQueryStats]] = contextvars.ContextVar(
+    "request_query_stats", default=None
+)
+
+def start_request() -> contextvars.Token:
+    """Begin attributing queries in the current context to a new request"""
+    return _current_stats.set(RequestQueryStats())
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+def end_request(token: contextvars.Token):
+    _current_stats.reset(token)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    db_metrics.queries += 1
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_time += elapsed
+        stats.statements[statement] += 1
+
+    if elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        db_metrics.slow_queries += 1
+        logger.warning(f"Slow query ({elapsed * 1000:.1f}ms): {statement[:500]}")
+
+def _handle_error(exception_context):
+    # after_cursor_execute never fires for failed statements
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+def instrument_engine(engine):
+    """Attach query counting/timing hooks to an engine (idempotent)"""
+    if not settings.SQL_INSTRUMENTATION_ENABLED:
+        return engine
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
+
+class RouteQueryStats:
+    __slots__ = ("labels", "queries", "query_time", "repeated")
+
+    def __init__(self, method: str, route: str):
+        self.labels = f'method="{escape_label(method)}",route="{escape_label(route)}"'
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.query_time = Histogram(LATENCY_BUCKETS)
+        self.repeated = 0
+
+class DatabaseMetrics:
+    """Per-route query counts/time and process-wide query counters"""
+
+    def __init__(self):
+        self.queries = 0
+        self.slow_queries = 0
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def route(self, method: str, route: str) -> RouteQueryStats:
+        key = (method, route)
+        stats = self._routes.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._routes.setdefault(key, RouteQueryStats(method, route))
+        return stats
+
+    def record_request(self, method: str, route: str, stats: RequestQueryStats):
+        route_stats = self.route(method, route)
+        route_stats.queries.observe(stats.count)
+        route_stats.query_time.observe(stats.total_time)
+
+        repeated = stats.repeated(settings.SQL_REPEATED_QUERY_THRESHOLD)
+        if repeated:
+            route_stats.repeated += 1
+            statement, count = repeated[0]
+            logger.warning(
+                f"Possible N+1 on {method} {route}: {count}x {statement[:200]} "
+                f"({stats.count} queries in {stats.total_time * 1000:.1f}ms)"
+            )
+
+    def render(self) -> List[str]:
+        routes = list(self._routes.values())
+        lines = [
+            "# HELP db_queries_total SQL statements executed.",
+            "# TYPE db_queries_total counter",
+            f"db_queries_total {self.queries}",
+            "# HELP db_slow_queries_total SQL statements slower than SQL_SLOW_QUERY_MS.",
+            "# TYPE db_slow_queries_total counter",
+            f"db_slow_queries_total {self.slow_queries}",
+            "# HELP db_queries_per_request SQL statements issued per request.",
+            "# TYPE db_queries_per_request histogram"
+        ]
+        for stats in routes:
+            stats.queries.render("db_queries_per_request", stats.labels, lines)
+
+        lines += [
+            "# HELP db_query_seconds_per_request Time spent in SQL per request.",
+            "# TYPE db_query_seconds_per_request histogram"
+        ]
+        for stats in routes:
+            stats.query_time.render("db_query_seconds_per_request", stats.labels, lines)
+
+        lines += [
+            "# HELP db_repeated_query_requests_total Requests that repeated one statement (possible N+1).",
+            "# TYPE db_repeated_query_requests_total counter"
+        ]
+        lines += [f"db_repeated_query_requests_total{{{s.labels}}} {s.repeated}" for s in routes]
+        return lines
+
+db_metrics = DatabaseMetrics()
+metrics.register_collector(db_metrics.render)
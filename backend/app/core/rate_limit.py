@@ -0,0 +1,255 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import math
+import re
+import time
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class RateLimitBackend:
+    """Storage for token buckets and concurrency slots.
+
+    The in-memory backend is enough for a single process; use the Redis
+    backend to share limits across uvicorn workers.
+    """
+
+    async def take_token(self, key: str, rate: float, capacity: int) -> Tuple[bool, float]:
+        """Take one token from `key`'s bucket; returns (allowed, retry_after_seconds)"""
+        raise NotImplementedError
+
+    async def acquire_slot(self, name: str, limit: int) -> bool:
+        """Reserve one of `limit` concurrent slots for endpoint class `name`"""
+        raise NotImplementedError
+
+    async def release_slot(self, name: str):
+        raise NotImplementedError
+
+class InMemoryBackend(RateLimitBackend):
+    """Single-process backend; all calls run on the event loop thread"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: Dict[str, list] = {}  # key -> [tokens, last_refill]
+        self._slots: Dict[str, int] = {}
+
+    async def take_token(self, key: str, rate: float, capacity: int) -> Tuple[bool, float]:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._evict_full(now, rate, capacity)
+            bucket = self._buckets[key] = [float(capacity), now]
+        else:
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return True, 0.0
+        return False, (1 - bucket[0]) / rate
+
+    def _evict_full(self, now: float, rate: float, capacity: int):
+        # Buckets that have refilled completely carry no state worth keeping
+        full = [
+            key for key, (tokens, last) in self._buckets.items()
+            if tokens + (now - last) * rate >= capacity
+        ]
+        for key in full or list(self._buckets)[: self.max_keys // 10]:
+            del self._buckets[key]
+
+    async def acquire_slot(self, name: str, limit: int) -> bool:
+        in_use = self._slots.get(name, 0)
+        if in_use >= limit:
+            return False
+        self._slots[name] = in_use + 1
+        return True
+
+    async def release_slot(self, name: str):
+        self._slots[name] = max(0, self._slots.get(name, 0) - 1)
+
+class RedisBackend(RateLimitBackend):
+    """Backend shared across workers through Redis (requires the `redis` package)"""
+
+    # Refill and take atomically; state expires once the bucket would be full
+    TOKEN_BUCKET_SCRIPT = """
+    local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens') or ARGV[2])
+    local last = tonumber(redis.call('HGET', KEYS[1], 'last') or ARGV[3])
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'last', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    # The TTL is only set when the counter is created, so steady traffic can't
+    # keep extending it; a release that finds the counter reset deletes it
+    ACQUIRE_SLOT_SCRIPT = """
+    local in_use = redis.call('INCR', KEYS[1])
+    if in_use == 1 then
+        redis.call('EXPIRE', KEYS[1], ARGV[1])
+    end
+    if in_use > tonumber(ARGV[2]) then
+        redis.call('DECR', KEYS[1])
+        return 0
+    end
+    return 1
+    """
+    RELEASE_SLOT_SCRIPT = """
+    if redis.call('DECR', KEYS[1]) <= 0 then
+        redis.call('DEL', KEYS[1])
+    end
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:", slot_ttl: int = 300):
+        import redis.asyncio as redis
+
+        self.redis = redis.from_url(url)
+        self.prefix = prefix
+        # Slots leaked by a crashed worker are forgotten at most slot_ttl
+        # seconds after the counter was created
+        self.slot_ttl = slot_ttl
+        self._take = self.redis.register_script(self.TOKEN_BUCKET_SCRIPT)
+        self._acquire = self.redis.register_script(self.ACQUIRE_SLOT_SCRIPT)
+        self._release = self.redis.register_script(self.RELEASE_SLOT_SCRIPT)
+
+    async def take_token(self, key: str, rate: float, capacity: int) -> Tuple[bool, float]:
+        allowed, tokens = await self._take(
+            keys=[f"{self.prefix}bucket:{key}"],
+            args=[rate, capacity, time.time()]
+        )
+        if allowed:
+            return True, 0.0
+        return False, (1 - float(tokens)) / rate
+
+    async def acquire_slot(self, name: str, limit: int) -> bool:
+        return bool(await self._acquire(
+            keys=[f"{self.prefix}slots:{name}"], args=[self.slot_ttl, limit]
+        ))
+
+    async def release_slot(self, name: str):
+        await self._release(keys=[f"{self.prefix}slots:{name}"])
+
+def create_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisBackend(settings.RATE_LIMIT_REDIS_URL)
+    if settings.RATE_LIMIT_BACKEND != "memory":
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {settings.RATE_LIMIT_BACKEND}")
+    return InMemoryBackend()
+
+# Expensive endpoint classes: (class name, path prefixes, concurrency setting)
+ENDPOINT_CLASSES = (
+    ("pdf_stream", ("/api/v1/s3/get-pdf/", "/api/v1/s3/get-pdf-by-key/"), "CONCURRENCY_LIMIT_PDF_STREAM"),
+    ("s3_list", ("/api/v1/s3/list-files", "/api/v1/s3/test-"), "CONCURRENCY_LIMIT_S3_LIST"),
+    ("search", ("/api/v1/documents/documents/search", "/api/v1/text-chunks/search"), "CONCURRENCY_LIMIT_SEARCH"),
+)
+
+# Classes whose requests skip the token bucket: pdf.js reads one PDF as many
+# Range requests, so one viewer would exhaust a client's budget; the
+# concurrency cap bounds what they cost instead
+UNMETERED_CLASSES = {"pdf_stream"}
+
+def endpoint_class(path: str) -> Optional[Tuple[str, int]]:
+    for name, prefixes, setting in ENDPOINT_CLASSES:
+        if path.startswith(prefixes):
+            return name, getattr(settings, setting)
+    return None
+
+# Cheap reads the SPA issues per list row or per change event (the article
+# list reloads on /events); they get their own, larger bucket so browsing
+# doesn't starve the other endpoints
+LIGHT_ROUTES = (
+    re.compile(r"^/api/v1/thumbnails/\d+/\d+$"),
+    re.compile(r"^/api/v1/article-queue/\d+$"),
+    re.compile(r"^/api/v1/article-queue/?$"),
+)
+
+def is_light(scope) -> bool:
+    return scope["method"] == "GET" and any(route.match(scope["path"]) for route in LIGHT_ROUTES)
+
+def client_key(scope) -> str:
+    """Identify the caller by API key when it is valid, otherwise by client address.
+
+    Unchecked header values would let a client mint a fresh bucket per request.
+    """
+    header = settings.API_KEY_NAME.lower().encode("latin-1")
+    expected = settings.API_KEY.encode("latin-1")
+    for name, value in scope.get("headers", ()):
+        if name == header and value and hmac.compare_digest(value, expected):
+            # Bucket names end up in Redis; don't store the key itself
+            return "key:" + hashlib.blake2b(value, digest_size=8).hexdigest()
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else "ip:unknown"
+
+async def _reject(send, status_code: int, retry_after: float, detail: str):
+    body = ('{"detail":"%s"}' % detail).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode())
+        ]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+class AdmissionControlMiddleware:
+    """Per-client token buckets (429) and per-endpoint-class concurrency caps (503).
+
+    Slots are held until the response body is fully sent, so long PDF
+    streams count against their class for their whole duration.
+    """
+
+    def __init__(self, app, backend: RateLimitBackend = None):
+        self.app = app
+        self.backend = backend or create_backend()
+        self.rate = settings.RATE_LIMIT_PER_MINUTE / 60.0
+        self.capacity = max(1, settings.RATE_LIMIT_BURST or settings.RATE_LIMIT_PER_MINUTE)
+        self.light_rate = settings.RATE_LIMIT_LIGHT_PER_MINUTE / 60.0
+        self.light_capacity = max(1, settings.RATE_LIMIT_LIGHT_PER_MINUTE)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or not scope["path"].startswith(settings.API_V1_STR)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        limited = endpoint_class(scope["path"])
+        if is_light(scope):
+            key, rate, capacity = client_key(scope) + ":light", self.light_rate, self.light_capacity
+        else:
+            key, rate, capacity = client_key(scope), self.rate, self.capacity
+        if rate > 0 and (limited is None or limited[0] not in UNMETERED_CLASSES):
+            allowed, retry_after = await self.backend.take_token(key, rate, capacity)
+            if not allowed:
+                await _reject(send, 429, retry_after, "Rate limit exceeded")
+                return
+
+        if limited is None:
+            await self.app(scope, receive, send)
+            return
+
+        name, limit = limited
+        if not await self.backend.acquire_slot(name, limit):
+            logger.warning(f"Shedding request to {scope['path']}: {name} at {limit} concurrent")
+            await _reject(send, 503, settings.CONCURRENCY_RETRY_AFTER, "Server busy, retry later")
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # Shielded so a client disconnect can't leak the slot
+            await asyncio.shield(self.backend.release_slot(name))
@@ -1,32 +1,102 @@
-import boto3
 from botocore.exceptions import ClientError
 from app.core.config import settings
+import hashlib
 import logging
-from typing import List
+import re
+import threading
+from typing import List, Optional, Tuple
+from urllib.parse import unquote, urlparse
 
 logger = logging.getLogger(__name__)
 
+# upload_pdf names objects after their SHA-256
+CONTENT_ADDRESSED_KEY = re.compile(r"(?:^|/)([0-9a-f]{64})\.pdf$")
+
+def content_hash_from_key(s3_key: Optional[str]) -> Optional[str]:
+    """SHA-256 encoded in a content-addressed key (e.g. pdfs/<sha256>.pdf), if any"""
+    match = CONTENT_ADDRESSED_KEY.search(s3_key or "")
+    return match.group(1) if match else None
+
+def pdf_location(pdf_s3_url: str, default_bucket: Optional[str] = None) -> Tuple[Optional[str], str]:
+    """(bucket, key) for a Document.pdf_s3_url.
+
+    Accepts s3://bucket/key URIs, http(s) object URLs and bare keys; the
+    latter two live in `default_bucket` (AWS_BUCKET_NAME unless given).
+    """
+    bucket = default_bucket or settings.AWS_BUCKET_NAME
+    parsed = urlparse(pdf_s3_url)
+    if parsed.scheme == "s3":
+        return parsed.netloc, unquote(parsed.path.lstrip("/"))
+    if not parsed.scheme:
+        return bucket, pdf_s3_url
+    key = unquote(parsed.path.lstrip("/"))
+    # Path-style URLs start with the bucket name
+    if bucket and key.startswith(f"{bucket}/"):
+        key = key[len(bucket) + 1:]
+    return bucket, key
+
 class S3Client:
-    def __init__(self):
-        self.s3 = boto3.client(    
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY,
-            aws_secret_access_key=settings.AWS_SECRET_KEY,
-            region_name=settings.AWS_REGION
-        )
-        self.bucket_name = settings.AWS_BUCKET_NAME
-
-    async def upload_pdf(self, file_content: bytes, prefix: str = "pdfs/") -> str:
-        """Upload a PDF file to S3 and return the S3 key"""
+    def __init__(self, bucket_name: Optional[str] = None):
+        self.bucket_name = bucket_name or settings.AWS_BUCKET_NAME
+        self._s3 = None
+        self._lock = threading.Lock()
+
+    @property
+    def s3(self):
+        """The boto3 client, built on first use (boto3 is slow to import)"""
+        if self._s3 is None:
+            with self._lock:
+                if self._s3 is None:
+                    import boto3
+
+                    self._s3 = boto3.client(
+                        's3',
+                        aws_access_key_id=settings.AWS_ACCESS_KEY,
+                        aws_secret_access_key=settings.AWS_SECRET_KEY,
+                        region_name=settings.AWS_REGION,
+                        endpoint_url=settings.AWS_ENDPOINT_URL
+                    )
+        return self._s3
+
+    def close(self):
+        if self._s3 is not None:
+            self._s3.close()
+            self._s3 = None
+
+    def object_exists(self, s3_key: str) -> bool:
         try:
-            import uuid
-            file_name = f"{prefix}{uuid.uuid4()}.pdf"
+            self.s3.head_object(Bucket=self.bucket_name, Key=s3_key)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    async def upload_pdf(
+        self,
+        file_content: bytes,
+        prefix: str = "pdfs/",
+        content_hash: Optional[str] = None
+    ) -> str:
+        """Upload a PDF file to S3 and return the S3 key.
+
+        Keys are derived from the SHA-256 of the content, so uploading the
+        same file twice reuses the stored object instead of copying it.
+        """
+        try:
+            content_hash = content_hash or hashlib.sha256(file_content).hexdigest()
+            file_name = f"{prefix}{content_hash}.pdf"
+            
+            if self.object_exists(file_name):
+                logger.info(f"PDF already stored as {file_name}, skipping upload")
+                return file_name
             
             self.s3.put_object(
                 Bucket=self.bucket_name,
                 Key=file_name,
                 Body=file_content,
-                ContentType='application/pdf'
+                ContentType='application/pdf',
+                Metadata={"sha256": content_hash}
             )
             
             return file_name
@@ -103,4 +173,27 @@ class S3Client:
             return files
         except ClientError as e:
             logger.error(f"Error listing S3 files: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+_shared_client: Optional[S3Client] = None
+
+def shared_s3_client() -> S3Client:
+    """The process-wide S3 client.
+
+    boto3 clients are thread-safe, so one client (and its connection pool)
+    serves every request in a worker.
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = S3Client()
+    return _shared_client
+
+async def get_s3_client() -> S3Client:
+    """FastAPI dependency for the shared client (async, so no threadpool hop)"""
+    return shared_s3_client()
+
+def close_s3_client():
+    global _shared_client
+    if _shared_client is not None:
+        _shared_client.close()
+        _shared_client = None
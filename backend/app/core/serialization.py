@@ -0,0 +1,26 @@
+from typing import Any, List, Optional
+import orjson
+from fastapi.responses import ORJSONResponse
+
+def rows_as_dicts(result) -> List[dict]:
+    """Turn a column-select Result into plain dicts without building ORM objects"""
+    keys = tuple(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+def row_as_dict(result) -> Optional[dict]:
+    """Return the first row of a column-select Result as a dict, or None"""
+    keys = tuple(result.keys())
+    row = result.first()
+    return dict(zip(keys, row)) if row is not None else None
+
+def json_response(content: Any, status_code: int = 200, headers: dict = None) -> ORJSONResponse:
+    """Serialize plain Python data with orjson, bypassing response_model validation.
+
+    orjson encodes datetime/date natively, so rows straight from the database
+    can be passed through without a per-object Pydantic model.
+    """
+    return ORJSONResponse(content=content, status_code=status_code, headers=headers)
+
+def json_dumps(content: Any) -> bytes:
+    """Serialize to bytes with the same options ORJSONResponse uses"""
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
@@ -0,0 +1,66 @@
+"""Hot-path lookups shared by the endpoints.
+
+Lookups are lambda statements: the lambda's code location (plus the
+model, for get_by_id) is the cache key, so the statement is built and
+compiled once per process and later calls only bind new parameter
+values. With a fresh session per request this costs less CPU than
+Session.get(), whose identity map never hits; loads that need loader
+options still go through Session.get().
+"""
+from typing import Optional, Type, TypeVar
+from sqlalchemy import func, lambda_stmt, or_, select
+from sqlalchemy.orm import Session
+from app.models.article_queue import ArticleQueue
+from app.models.document import Document
+from app.models.pdf import PDF
+
+T = TypeVar("T")
+
+def get_by_id(db: Session, model: Type[T], object_id: int, options=None) -> Optional[T]:
+    if options:
+        return db.get(model, object_id, options=options)
+    return db.execute(lambda_stmt(
+        lambda: select(model).where(model.id == object_id)
+    )).scalars().first()
+
+def article_pdf_keys(db: Session, article_id: int):
+    """(pdf_s3_key, pdf_optimized_s3_key, storage_tier) row for an article, without loading annotations"""
+    return db.execute(lambda_stmt(
+        lambda: select(ArticleQueue.pdf_s3_key, ArticleQueue.pdf_optimized_s3_key, ArticleQueue.storage_tier)
+        .where(ArticleQueue.id == article_id)
+    )).first()
+
+def pdf_by_content_hash(db: Session, content_hash: str) -> Optional[PDF]:
+    return db.execute(lambda_stmt(
+        lambda: select(PDF).where(PDF.content_hash == content_hash)
+    )).scalars().first()
+
+def document_id_by_pdf_key(db: Session, s3_key: str, bucket: str) -> Optional[int]:
+    """Document whose pdf_s3_url points at `s3_key`, stored as a bare key, s3:// URI or URL"""
+    s3_uri = f"s3://{bucket}/{s3_key}"
+    escaped = s3_key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    url_pattern = f"%/{escaped}"
+    return db.execute(lambda_stmt(
+        lambda: select(Document.id).where(or_(
+            Document.pdf_s3_url == s3_key,
+            Document.pdf_s3_url == s3_uri,
+            Document.pdf_s3_url.like(url_pattern, escape="\\")
+        )).order_by(Document.id).limit(1)
+    )).scalar()
+
+def article_id_by_content_hash(db: Session, content_hash: str) -> Optional[int]:
+    """Oldest article whose PDF has this SHA-256 (feeds may list one PDF under several DOIs)"""
+    return db.execute(lambda_stmt(
+        lambda: select(ArticleQueue.id).where(ArticleQueue.content_hash == content_hash)
+        .order_by(ArticleQueue.id).limit(1)
+    )).scalar()
+
+def document_status_counts(db: Session):
+    """Total, processed and failed document counts in one scan"""
+    return db.execute(lambda_stmt(
+        lambda: select(
+            func.count(),
+            func.count().filter(Document.status_id == 2),
+            func.count().filter(Document.status_id == 3)
+        ).select_from(Document)
+    )).one()
@@ -1,26 +1,165 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
+from fastapi import Request
 from app.core.config import settings
+from app.core.metrics import escape_label, metrics
+from app.core.pool_stats import InstrumentedQueuePool, pool_metrics
+from app.core.query_stats import instrument_engine
+import itertools
 import logging
+import threading
+import time
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
-# Create engine with SSL required
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=settings.DATABASE_POOL_SIZE,
-    max_overflow=settings.DATABASE_MAX_OVERFLOW,
-    connect_args={
-        "sslmode": "require"
-    }
-)
+# Set after a client's own write; reads stay on the primary until it expires.
+# Cross-origin clients don't keep the cookie, so the time is also sent as a
+# response header for them to echo back
+PRIMARY_COOKIE = "db_read_primary_until"
+PRIMARY_HEADER = "X-Read-Primary-Until"
+
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+def pool_sizing() -> tuple:
+    """(pool_size, max_overflow) for one engine in one worker process"""
+    if settings.DATABASE_CONNECTION_BUDGET <= 0:
+        return settings.DATABASE_POOL_SIZE, settings.DATABASE_MAX_OVERFLOW
+    per_worker = max(2, settings.DATABASE_CONNECTION_BUDGET // max(1, settings.WEB_CONCURRENCY))
+    # Two thirds held open, the rest only opened under bursts
+    pool_size = max(1, per_worker * 2 // 3)
+    return pool_size, per_worker - pool_size
+
+def create_db_engine(url: str, role: str = "primary"):
+    """The one place engines are built: pool sizing, SSL and instrumentation"""
+    pool_size, max_overflow = pool_sizing()
+    engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        connect_args={
+            "sslmode": settings.DATABASE_SSLMODE,
+            "application_name": f"pdf-annotator-{role}"
+        }
+    )
+    instrument_engine(engine)
+    pool_metrics.instrument(
+        engine, role if role == "primary" else f"{role}:{engine.url.host}:{engine.url.port or 5432}",
+        max_overflow
+    )
+    return engine
+
+engine = create_db_engine(settings.DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+class Replica:
+    def __init__(self, url: str):
+        self.engine = create_db_engine(url, role="replica")
+        self.sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.lag: Optional[float] = None
+        self.checked_at = 0.0
+        self._refresh_lock = threading.Lock()
+
+    def refresh_lag(self):
+        try:
+            with self.engine.connect() as connection:
+                self.lag = float(connection.execute(REPLICA_LAG_SQL).scalar() or 0)
+        except Exception as e:
+            logger.warning(f"Replica lag check failed for {self.engine.url.host}: {str(e)}")
+            self.lag = None
+        self.checked_at = time.monotonic()
+
+    def _lag_is_old(self) -> bool:
+        return time.monotonic() - self.checked_at > settings.DATABASE_REPLICA_LAG_CHECK_SECONDS
+
+    def usable(self) -> bool:
+        # Lag is sampled at most once per interval, not per request; one caller
+        # refreshes it while the others keep using the last sample
+        if self._lag_is_old() and self._refresh_lock.acquire(blocking=False):
+            try:
+                if self._lag_is_old():
+                    self.refresh_lag()
+            finally:
+                self._refresh_lock.release()
+        return self.lag is not None and self.lag <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+
+class ReplicaRouter:
+    """Round-robin over replicas that are reachable and not lagging too far"""
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self._lock = threading.Lock()
+        self.primary_fallbacks = 0
+
+    def session(self):
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                replica = next(self._cycle)
+            if replica.usable():
+                return replica.sessionmaker()
+        if self.replicas:
+            self.primary_fallbacks += 1
+        return SessionLocal()
+
+    def dispose(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
+
+    def render(self) -> List[str]:
+        lines = [
+            "# HELP db_replica_lag_seconds Last sampled replication lag (-1 if unreachable).",
+            "# TYPE db_replica_lag_seconds gauge"
+        ]
+        for replica in self.replicas:
+            lag = -1 if replica.lag is None else replica.lag
+            lines.append(f'db_replica_lag_seconds{{host="{escape_label(str(replica.engine.url.host))}"}} {lag}')
+        lines += [
+            "# HELP db_replica_primary_fallbacks_total Reads sent to the primary because no replica was usable.",
+            "# TYPE db_replica_primary_fallbacks_total counter",
+            f"db_replica_primary_fallbacks_total {self.primary_fallbacks}"
+        ]
+        return lines
+
+read_router = ReplicaRouter(settings.database_replica_urls)
+if read_router.replicas:
+    metrics.register_collector(read_router.render)
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    until = request.headers.get(PRIMARY_HEADER) or request.cookies.get(PRIMARY_COOKIE) or 0
+    try:
+        return float(until) > time.time()
+    except ValueError:
+        return False
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints: a healthy replica, else the primary"""
+    if not read_router.replicas or reads_pinned_to_primary(request):
+        db = SessionLocal()
+    else:
+        db = read_router.session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def dispose_engines():
+    engine.dispose()
+    read_router.dispose()
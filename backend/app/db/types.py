@@ -0,0 +1,66 @@
+from sqlalchemy import JSON, LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
+
+# JSONB on Postgres (binary, TOAST-compressed with lz4); plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+# First byte of a stored CompressedText value
+RAW = b"\x00"
+ZSTD = b"\x01"
+
+_compressor = None
+_decompressor = None
+_compression = None
+
+def _compression_settings():
+    # Read lazily so importing the models doesn't require a configured environment
+    global _compression
+    if _compression is None:
+        from app.core.config import settings
+
+        _compression = (
+            settings.TEXT_COMPRESSION, settings.TEXT_COMPRESSION_MIN_BYTES, settings.TEXT_COMPRESSION_LEVEL
+        )
+    return _compression
+
+def _zstd():
+    global _compressor, _decompressor
+    if _compressor is None:
+        import zstandard
+
+        _compressor = zstandard.ZstdCompressor(level=_compression_settings()[2])
+        _decompressor = zstandard.ZstdDecompressor()
+    return _compressor, _decompressor
+
+class CompressedText(TypeDecorator):
+    """Text stored as bytea, zstd-compressed when TEXT_COMPRESSION=zstd.
+
+    Values carry a one-byte header, so raw and compressed rows can coexist
+    and switching the setting never requires a rewrite. Reads always
+    decode both forms and return str.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        data = value.encode("utf-8")
+        mode, min_bytes, _ = _compression_settings()
+        if mode == "zstd" and len(data) >= min_bytes:
+            compressor, _ = _zstd()
+            compressed = compressor.compress(data)
+            if len(compressed) < len(data):
+                return ZSTD + compressed
+        return RAW + data
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        value = bytes(value)
+        if value[:1] == ZSTD:
+            _, decompressor = _zstd()
+            return decompressor.decompress(value[1:]).decode("utf-8")
+        return value[1:].decode("utf-8")
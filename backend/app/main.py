@@ -1,14 +1,60 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response, Security
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.security import get_api_key
+from app.core.middleware import (
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    ReadYourWritesMiddleware,
+    logging_middleware
+)
+from app.core.rate_limit import AdmissionControlMiddleware
+from app.core.events import event_broker
+from app.core.s3 import close_s3_client
+from app.services.collab import collab_rooms
+from app.services.thumbnails import shutdown_executor
+from app.db.session import PRIMARY_HEADER, dispose_engines
 from app.api.v1.api import api_router
 
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Clients are created lazily on first use; only the change listener starts here
+    if settings.EVENTS_ENABLED:
+        event_broker.start()
+    if settings.COLLAB_ENABLED and settings.WEB_CONCURRENCY > 1:
+        logger.warning(
+            "Live annotation rooms are disabled: they need a single worker (WEB_CONCURRENCY=1)"
+        )
+    yield
+    # Persist any edits still inside the batching window
+    await collab_rooms.close_all()
+    await event_broker.stop()
+    close_s3_client()
+    shutdown_executor()
+    dispose_engines()
+
 app = FastAPI(
     title="PDF Segmenter API",
     description="API for PDF processing and management",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+# Added before CORS so 429/503 responses still carry CORS headers
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
+# Cross-origin PDF viewers need the range headers to make ranged reads, and
+# the SPA echoes the read-your-writes header back (the cookie doesn't cross origins)
+EXPOSED_HEADERS = ["Accept-Ranges", "Content-Range", "Content-Length", PRIMARY_HEADER]
+
 # Development CORS settings
 if settings.DEBUG:
     app.add_middleware(
@@ -17,6 +63,7 @@ if settings.DEBUG:
         allow_credentials=True,
         allow_methods=["*"],  # Allows all methods
         allow_headers=["*"],  # Allows all headers
+        expose_headers=EXPOSED_HEADERS,
     )
 else:
     # Production CORS settings (more restrictive)
@@ -30,11 +77,35 @@ else:
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
         allow_headers=["*"],
+        expose_headers=EXPOSED_HEADERS,
     )
 
+# Per-request log lines are only useful while developing
+if settings.DEBUG:
+    app.middleware("http")(logging_middleware)
+
+# Only needed when reads can be served by replicas
+if settings.database_replica_urls:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+
+# Added last so it wraps every other middleware and sees the full latency
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
 @app.get("/")
 async def root():
     return {"message": "PDF Segmenter API"}
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(api_key: str = Security(get_api_key)):
+    """Prometheus scrape endpoint (scrapers send the API key header)"""
+    return Response(
+        content=metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -3,6 +3,10 @@ from app.models.pdf import PDF
 from app.models.document import Document
 from app.models.article_queue import ArticleQueue
 from app.models.text_chunk import TextChunk
+from app.models.status_transition import StatusTransition
+from app.models.document_signature import DocumentSignature, DocumentLshBand
+from app.models.article_signature import ArticleSignature
 
 # This helps avoid circular imports
-__all__ = ['Base', 'PDF', 'Document', 'ArticleQueue', 'TextChunk']
+__all__ = ['Base', 'PDF', 'Document', 'ArticleQueue', 'TextChunk', 'StatusTransition',
+           'DocumentSignature', 'DocumentLshBand', 'ArticleSignature']
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Text, JSON
+from sqlalchemy import BigInteger, Column, Integer, String, Date, DateTime, Index, Text
 from sqlalchemy.sql import func
 from app.db.base_class import Base
+from app.db.types import JSONType
 
 class ArticleQueue(Base):
     __tablename__ = "article_queue"
+    __table_args__ = (
+        Index("ix_article_queue_created_at_brin", "created_at", postgresql_using="brin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     doi = Column(String, unique=True, index=True)
@@ -14,7 +18,23 @@ class ArticleQueue(Base):
     description = Column(Text, nullable=True)
     status = Column(String, default="pending")
     pdf_s3_key = Column(String, nullable=True)
+    pdf_optimized_s3_key = Column(String, nullable=True)
+    pdf_original_size = Column(BigInteger, nullable=True)
+    pdf_optimized_size = Column(BigInteger, nullable=True)
+    # Failed optimization runs; scripts/optimize_pdfs.py skips rows past --max-attempts
+    pdf_optimize_attempts = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    annotation_data = Column(JSON, nullable=True)
+    annotation_data = Column(JSONType, nullable=True)
+    # Last time annotation_data was materialized into documents/sections
+    promoted_at = Column(DateTime(timezone=True), nullable=True)
+    # Bumped by a trigger whenever promoted fields change; promotion records the
+    # version it read, so a write during promotion is never mistaken for promoted
+    change_version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    promoted_version = Column(BigInteger, nullable=True)
+    # SHA-256 of the PDF; not unique, a feed may list one PDF under several DOIs
+    content_hash = Column(String(64), index=True, nullable=True)
+    # "hot" or "cold"; cold PDFs live under PDF_COLD_PREFIX in a colder storage class
+    storage_tier = Column(String(10), nullable=False, default="hot", server_default="hot")
+    tiered_at = Column(DateTime(timezone=True), nullable=True)
  
\ No newline at end of file
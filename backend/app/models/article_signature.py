@@ -0,0 +1,15 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class ArticleSignature(Base):
+    """MinHash signature of an article's PDF text, comparable with document signatures"""
+    __tablename__ = "article_signatures"
+
+    article_id = Column(Integer, ForeignKey("article_queue.id", ondelete="CASCADE"), primary_key=True)
+    # The PDF the text came from; stale once the article points at another one
+    pdf_s3_key = Column(String, nullable=False)
+    signature = Column(LargeBinary, nullable=False)
+    num_perm = Column(Integer, nullable=False)
+    shingle_count = Column(Integer, nullable=False)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
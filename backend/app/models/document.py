@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey, DateTime
+from sqlalchemy import BigInteger, Column, Integer, String, Text, Date, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 from app.models.document_type import DocumentType
@@ -8,6 +8,9 @@ from pydantic import BaseModel
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_created_at_brin", "created_at", postgresql_using="brin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(Text, nullable=False)
@@ -19,6 +22,9 @@ class Document(Base):
     status_id = Column(Integer, ForeignKey("document_statuses.id"), nullable=False)
     created_at = Column(DateTime)
     updated_at = Column(DateTime)
+    # Bumped by a text_chunks trigger on every chunk insert, delete or text change;
+    # MinHash signatures record the version they were computed from
+    chunks_version = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     document_type = relationship("DocumentType", back_populates="documents")
     status = relationship("DocumentStatus")
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, LargeBinary, SmallInteger
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+class DocumentSignature(Base):
+    """MinHash signature of a document's chunk text (uint32 little-endian values)"""
+    __tablename__ = "document_signatures"
+
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+    num_perm = Column(Integer, nullable=False)
+    shingle_count = Column(Integer, nullable=False)
+    # documents.chunks_version the text was read at; stale once the document's is higher
+    chunks_version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class DocumentLshBand(Base):
+    """One LSH bucket per band; documents sharing a (band, bucket) are candidates"""
+    __tablename__ = "document_lsh_bands"
+
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    document_id = Column(
+        Integer, ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
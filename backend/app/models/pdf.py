@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Text
 from datetime import datetime
 from app.models.base import Base
 
@@ -11,4 +11,9 @@ class PDF(Base):
     status = Column(String(50), default="uploaded")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    error_message = Column(Text, nullable=True)
\ No newline at end of file
+    error_message = Column(Text, nullable=True)
+    content_hash = Column(String(64), unique=True, index=True, nullable=True)
+    original_size = Column(BigInteger, nullable=True)
+    optimized_size = Column(BigInteger, nullable=True)
+    optimized_s3_key = Column(String(255), nullable=True)
+    optimize_attempts = Column(Integer, nullable=False, default=0, server_default="0")
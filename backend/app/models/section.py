@@ -1,18 +1,26 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base
+from app.db.types import CompressedText, JSONType
 from datetime import datetime
 
 class Section(Base):
     __tablename__ = "sections"
+    __table_args__ = (
+        Index("ix_sections_created_at_brin", "created_at", postgresql_using="brin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"))
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), index=True)
     section_type_id = Column(Integer, ForeignKey("section_types.id", ondelete="SET NULL"))
-    text = Column(Text, nullable=False)
+    text = Column(CompressedText, nullable=False)
     page_num = Column(Integer)
-    coordinates = Column(JSON)
-    rect = Column(JSON)
+    coordinates = Column(JSONType)
+    rect = Column(JSONType)
+    # "manual" for drawn boxes, "auto" for segmentation proposals awaiting review,
+    # "annotation" for boxes promoted from article annotations
+    source = Column(String(20), nullable=False, default="manual", server_default="manual")
+    confidence = Column(Float, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+from app.models.base import Base
+from app.db.types import JSONType
+
+class StatusTransition(Base):
+    """Audit record of one batch of a bulk status transition"""
+    __tablename__ = "status_transitions"
+
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String(50), nullable=False)
+    to_status = Column(String(50), nullable=False)
+    row_ids = Column(JSONType, nullable=False)
+    row_count = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
@@ -1,19 +1,41 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, JSON
+from sqlalchemy import DDL, Column, Integer, Sequence, Text, ForeignKey, DateTime, Index, event
 from sqlalchemy.orm import relationship
 from app.models.base import Base
+from app.db.types import CompressedText, JSONType
 from datetime import datetime
 
+# Hash partitions of text_chunks on Postgres (see migration d5f1a8e3c729)
+PARTITIONS = 16
+
 class TextChunk(Base):
     __tablename__ = "text_chunks"
-
-    id = Column(Integer, primary_key=True, index=True)
-    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"))
-    section_id = Column(Integer, ForeignKey("sections.id", ondelete="CASCADE"))
-    chunk_text = Column(Text, nullable=False)
+    __table_args__ = (
+        Index("ix_text_chunks_created_at_brin", "created_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "HASH (document_id)"},
+    )
+    # An explicit sequence rather than SERIAL: SQLite can't autoincrement one
+    # column of a composite key, and create_all there must still work
+    id = Column(Integer, Sequence("text_chunks_id_seq"), primary_key=True)
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True, index=True)
+    section_id = Column(Integer, ForeignKey("sections.id", ondelete="CASCADE"), index=True)
+    chunk_text = Column(CompressedText, nullable=False)
     embedding = Column('embedding', Text)
-    chunk_metadata = Column(JSON)
+    chunk_metadata = Column(JSONType)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     document = relationship("Document", back_populates="text_chunks")
-    section = relationship("Section", back_populates="text_chunks") 
\ No newline at end of file
+    section = relationship("Section", back_populates="text_chunks")
+
+    # The table key includes the partition column; rows are still identified by id
+    __mapper_args__ = {"primary_key": [id]}
+
+for _remainder in range(PARTITIONS):
+    event.listen(
+        TextChunk.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE text_chunks_p{_remainder} PARTITION OF text_chunks "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {_remainder})"
+        ).execute_if(dialect="postgresql"),
+    )
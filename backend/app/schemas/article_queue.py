@@ -27,6 +27,8 @@ class ArticleUpdate(BaseModel):
 
 class ArticleResponse(ArticleBase):
     id: int
+    pdf_optimized_s3_key: Optional[str] = None
+    storage_tier: str = "hot"
     created_at: datetime
     updated_at: Optional[datetime] = None
     annotation_data: Optional[dict] = None
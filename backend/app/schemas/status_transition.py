@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class BulkStatusTransition(BaseModel):
+    """Rows to move: explicit ids, rows in `from_statuses`, or ids narrowed by status"""
+    to_status: str
+    ids: Optional[List[int]] = None
+    from_statuses: Optional[List[str]] = None
+
+class BulkStatusTransitionResult(BaseModel):
+    to_status: str
+    from_statuses: List[str]
+    updated: int
+    batches: int
+    skipped_ids: Optional[List[int]] = None
@@ -0,0 +1,147 @@
+import codecs
+import csv
+import json
+import logging
+import re
+from datetime import date
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, Optional
+from sqlalchemy import case, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.cache import response_cache
+from app.core.s3 import content_hash_from_key
+from app.models.article_queue import ArticleQueue
+
+logger = logging.getLogger(__name__)
+
+# Feed columns; anything else in a record is ignored
+IMPORT_FIELDS = (
+    "doi", "title", "authors", "journal", "publication_date",
+    "description", "pdf_s3_key"
+)
+# Refreshed from the feed on conflict; status and annotations stay untouched
+UPDATE_FIELDS = tuple(f for f in IMPORT_FIELDS if f != "doi")
+SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+def iter_records(stream: BinaryIO, fmt: str) -> Iterator[Optional[dict]]:
+    """Yield one dict per CSV row / JSONL line; None for unparseable lines"""
+    text = codecs.getreader("utf-8-sig")(stream)
+    if fmt == "csv":
+        yield from csv.DictReader(text)
+        return
+    for line in text:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield None
+            continue
+        yield record if isinstance(record, dict) else None
+
+def normalize(record: Optional[dict]) -> Optional[dict]:
+    """Clean a feed record; None when it can't be imported (no DOI or title)"""
+    if not record:
+        return None
+    row = {}
+    for field in IMPORT_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str):
+            value = value.strip() or None
+        row[field] = value
+    if not row["doi"] or not row["title"]:
+        return None
+    # Feeds may carry the PDF's SHA-256; content-addressed keys encode it
+    content_hash = str(record.get("content_hash") or "").strip().lower()
+    row["content_hash"] = content_hash if SHA256.match(content_hash) else content_hash_from_key(row["pdf_s3_key"])
+    if row["publication_date"] is not None:
+        try:
+            row["publication_date"] = date.fromisoformat(str(row["publication_date"])[:10])
+        except ValueError:
+            row["publication_date"] = None
+    return row
+
+def _upsert_batch(db: Session, rows: list) -> tuple:
+    stmt = insert(ArticleQueue).values(rows)
+    excluded = stmt.excluded
+    # Missing feed values keep what is already stored
+    new_values = {
+        field: func.coalesce(excluded[field], getattr(ArticleQueue, field))
+        for field in UPDATE_FIELDS
+    }
+    pdf_changed = ArticleQueue.pdf_s3_key.is_distinct_from(new_values["pdf_s3_key"])
+    # The stored hash belongs to the stored PDF; a replaced PDF only has the feed's
+    new_values["content_hash"] = case(
+        (pdf_changed, excluded.content_hash),
+        else_=func.coalesce(excluded.content_hash, ArticleQueue.content_hash)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ArticleQueue.doi],
+        set_={
+            **new_values,
+            # An optimized copy only stays valid while the source PDF is the same
+            "pdf_optimized_s3_key": case(
+                (pdf_changed, None),
+                else_=ArticleQueue.pdf_optimized_s3_key
+            ),
+            "pdf_original_size": case((pdf_changed, None), else_=ArticleQueue.pdf_original_size),
+            "pdf_optimized_size": case((pdf_changed, None), else_=ArticleQueue.pdf_optimized_size),
+            "pdf_optimize_attempts": case((pdf_changed, 0), else_=ArticleQueue.pdf_optimize_attempts),
+            # A replaced PDF is uploaded to the hot tier
+            "storage_tier": case(
+                (pdf_changed, "hot"),
+                else_=ArticleQueue.storage_tier
+            ),
+            "updated_at": func.now()
+        },
+        # Unchanged rows are skipped, so re-imported feeds cost no writes
+        where=or_(*[
+            getattr(ArticleQueue, field).is_distinct_from(value)
+            for field, value in new_values.items()
+        ])
+    ).returning(ArticleQueue.id, literal_column("xmax = 0").label("inserted"))
+
+    result = db.execute(stmt).all()
+    db.commit()
+    updated_ids = [row.id for row in result if not row.inserted]
+    for article_id in updated_ids:
+        response_cache.invalidate("article", article_id)
+    inserted = len(result) - len(updated_ids)
+    return inserted, len(updated_ids)
+
+def import_articles(db: Session, records: Iterable[Optional[dict]], batch_size: int = 1000) -> dict:
+    """Upsert feed records into article_queue in batches.
+
+    Memory stays bounded by `batch_size` no matter how long the feed is.
+    Returns inserted/updated/skipped counts; skipped covers invalid records,
+    duplicates within a batch and records identical to the stored row.
+    """
+    counts = {"inserted": 0, "updated": 0, "skipped": 0, "batches": 0}
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+
+        # ON CONFLICT can't touch one row twice in a statement; last record wins
+        rows = {}
+        for record in batch:
+            row = normalize(record)
+            if row is None:
+                counts["skipped"] += 1
+                continue
+            if row["doi"] in rows:
+                counts["skipped"] += 1
+            rows[row["doi"]] = row
+
+        if rows:
+            inserted, updated = _upsert_batch(db, list(rows.values()))
+            counts["inserted"] += inserted
+            counts["updated"] += updated
+            counts["skipped"] += len(rows) - inserted - updated
+        counts["batches"] += 1
+        logger.info(f"Article import batch {counts['batches']}: {counts}")
+
+    return counts
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import uuid
+from typing import Dict, Optional, Set
+from fastapi import WebSocket
+from sqlalchemy import select, update
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.article_queue import ArticleQueue
+from app.services.promotion import annotations_of
+
+logger = logging.getLogger(__name__)
+
+ANNOTATION_KEYS = ("coordinates", "page_num", "section_type", "text")
+
+class Room:
+    """Live editing state for one article in this worker.
+
+    Every accepted operation gets the next sequence number. A rectangle
+    remembers the sequence and the client that last changed it, and an
+    operation based on an older view of that rectangle is rejected unless
+    it comes from that same client, whose ops arrive in order even before
+    it has seen their echoes (first writer wins per rectangle, so edits to
+    different rectangles never conflict).
+    """
+
+    def __init__(self, article_id: int, annotations: list):
+        self.article_id = article_id
+        self.seq = 0
+        self.annotations: Dict[str, dict] = {}
+        self.rect_seq: Dict[str, int] = {}
+        self.rect_writer: Dict[str, object] = {}
+        for annotation in annotations:
+            rect_id = str(annotation.get("id") or uuid.uuid4())
+            self.annotations[rect_id] = {**annotation, "id": rect_id}
+            self.rect_seq[rect_id] = 0
+        self.clients: Set[WebSocket] = set()
+        self.dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        # Writes go out one at a time, so an older snapshot never lands last
+        self._flush_lock = asyncio.Lock()
+
+    def snapshot(self) -> dict:
+        return {
+            "type": "snapshot",
+            "seq": self.seq,
+            "annotations": list(self.annotations.values()),
+            "rect_seq": self.rect_seq
+        }
+
+    def apply(self, message: dict, client: object = None) -> dict:
+        """Apply one op from `client`; returns the broadcast op or a reject for the sender"""
+        rect_id = str(message.get("id") or "")
+        op = message.get("op")
+        base_seq = message.get("base_seq", 0)
+        incoming = message.get("annotation") or {}
+        if not rect_id or op not in ("upsert", "delete") or not isinstance(incoming, dict):
+            return {"type": "error", "client_op_id": message.get("client_op_id"), "detail": "Invalid operation"}
+
+        own_write = client is not None and self.rect_writer.get(rect_id) is client
+        if self.rect_seq.get(rect_id, 0) > base_seq and not own_write:
+            return {
+                "type": "reject",
+                "client_op_id": message.get("client_op_id"),
+                "id": rect_id,
+                "seq": self.rect_seq[rect_id],
+                "current": self.annotations.get(rect_id)
+            }
+
+        self.seq += 1
+        self.rect_seq[rect_id] = self.seq
+        self.rect_writer[rect_id] = client
+        if op == "delete":
+            self.annotations.pop(rect_id, None)
+            annotation = None
+        else:
+            annotation = {key: None for key in ANNOTATION_KEYS}
+            # Fields this client doesn't send (e.g. written by other tools) are kept
+            annotation.update(self.annotations.get(rect_id, {}))
+            annotation.update(incoming)
+            annotation["id"] = rect_id
+            self.annotations[rect_id] = annotation
+        self.schedule_flush()
+        return {
+            "type": "op",
+            "seq": self.seq,
+            "op": op,
+            "id": rect_id,
+            "annotation": annotation,
+            "client_op_id": message.get("client_op_id")
+        }
+
+    async def broadcast(self, message: dict):
+        for client in list(self.clients):
+            try:
+                await client.send_json(message)
+            except Exception:
+                self.clients.discard(client)
+
+    def schedule_flush(self):
+        self.dirty = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        # Everything that arrives during the window is written in one UPDATE
+        while self.dirty:
+            await asyncio.sleep(settings.COLLAB_FLUSH_MS / 1000)
+            await self.flush()
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self.dirty:
+                return
+            self.dirty = False
+            data = {"annotations": list(self.annotations.values())}
+            try:
+                await asyncio.to_thread(_save_annotations, self.article_id, data)
+            except Exception as e:
+                self.dirty = True
+                logger.error(f"Error saving live annotations for article {self.article_id}: {str(e)}")
+
+def _load_annotations(article_id: int) -> Optional[list]:
+    db = SessionLocal()
+    try:
+        row = db.execute(
+            select(ArticleQueue.annotation_data).where(ArticleQueue.id == article_id)
+        ).first()
+        return None if row is None else annotations_of(row.annotation_data)
+    finally:
+        db.close()
+
+def _save_annotations(article_id: int, data: dict):
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(ArticleQueue).where(ArticleQueue.id == article_id).values(annotation_data=data)
+        )
+        db.commit()
+    finally:
+        db.close()
+    response_cache.invalidate("article", article_id)
+
+def collab_available() -> bool:
+    """Rooms live in one process's memory, so they only work with a single worker"""
+    return settings.COLLAB_ENABLED and settings.WEB_CONCURRENCY == 1
+
+class RoomRegistry:
+    """Rooms open in this worker, keyed by article id"""
+
+    def __init__(self):
+        self.rooms: Dict[int, Room] = {}
+        self._lock = asyncio.Lock()
+        self._releases: Set[asyncio.Task] = set()
+
+    def get(self, article_id: int) -> Optional[Room]:
+        return self.rooms.get(article_id)
+
+    async def join(self, article_id: int, websocket: WebSocket) -> Optional[Room]:
+        async with self._lock:
+            room = self.rooms.get(article_id)
+            if room is None:
+                annotations = await asyncio.to_thread(_load_annotations, article_id)
+                if annotations is None:
+                    return None
+                room = Room(article_id, annotations)
+                self.rooms[article_id] = room
+            room.clients.add(websocket)
+            return room
+
+    async def leave(self, room: Room, websocket: WebSocket):
+        async with self._lock:
+            room.clients.discard(websocket)
+            room.rect_writer = {
+                rect_id: client for rect_id, client in room.rect_writer.items() if client is not websocket
+            }
+            if room.clients:
+                return
+            # Still holding the lock: a join meanwhile would load the state being replaced
+            await room.flush()
+            if room.dirty:
+                # Kept so the edits aren't lost; the retry runs in the background
+                task = asyncio.create_task(self._release_when_flushed(room))
+                self._releases.add(task)
+                task.add_done_callback(self._releases.discard)
+                return
+            self.rooms.pop(room.article_id, None)
+
+    async def _release_when_flushed(self, room: Room):
+        """Retry the final flush of an empty room and drop the room once it succeeds"""
+        while True:
+            await asyncio.sleep(settings.COLLAB_FLUSH_MS / 1000)
+            async with self._lock:
+                if room.clients or self.rooms.get(room.article_id) is not room:
+                    # Rejoined: the next leave takes over
+                    return
+                await room.flush()
+                if not room.dirty:
+                    self.rooms.pop(room.article_id, None)
+                    return
+
+    async def close_all(self):
+        for room in list(self.rooms.values()):
+            await room.flush()
+        self.rooms.clear()
+
+collab_rooms = RoomRegistry()
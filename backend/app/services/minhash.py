@@ -0,0 +1,396 @@
+import hashlib
+import logging
+import re
+import zlib
+from array import array
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple
+from botocore.exceptions import ClientError
+from sqlalchemy import delete, func, insert, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.article_queue import ArticleQueue
+from app.models.article_signature import ArticleSignature
+from app.models.document import Document
+from app.models.document_signature import DocumentLshBand, DocumentSignature
+from app.models.text_chunk import TextChunk
+from app.services.storage_tiering import RestoreInProgress, get_object_any_tier
+
+logger = logging.getLogger(__name__)
+
+WORD = re.compile(r"\w+")
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+# Fixed so signatures computed by different processes and runs are comparable
+PERMUTATION_SEED = 1
+# Shingles hashed against all permutations at once; bounds the (perm x shingle) matrix
+SHINGLE_BLOCK = 8192
+
+_permutations = {}
+
+def numpy_available() -> bool:
+    try:
+        import numpy  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def pdf_fingerprinting_available() -> bool:
+    """Article signatures also need `pymupdf` to extract the PDF text"""
+    try:
+        import fitz  # noqa: F401
+    except ImportError:
+        return False
+    return numpy_available()
+
+def _permutation_params(num_perm: int):
+    import numpy as np
+
+    if num_perm not in _permutations:
+        rng = np.random.default_rng(PERMUTATION_SEED)
+        a = rng.integers(1, MAX_HASH, size=num_perm, dtype=np.uint64)
+        b = rng.integers(0, MAX_HASH, size=num_perm, dtype=np.uint64)
+        _permutations[num_perm] = (a[:, None], b[:, None])
+    return _permutations[num_perm]
+
+def shingle_hashes(text: str, words: int):
+    """Unique 32-bit hashes of the word `words`-grams of `text`"""
+    import numpy as np
+
+    tokens = WORD.findall(text.lower())
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    word_hashes = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64, count=len(tokens))
+    width = min(words, len(tokens))
+    count = len(tokens) - width + 1
+    # FNV-style mix of each window, computed for all windows at once (uint64 wraps)
+    hashes = word_hashes[:count].copy()
+    with np.errstate(over="ignore"):
+        for offset in range(1, width):
+            hashes = (hashes * np.uint64(0x100000001B3)) ^ word_hashes[offset:offset + count]
+    return np.unique((hashes ^ (hashes >> np.uint64(32))) & np.uint64(MAX_HASH))
+
+def signature(shingles, num_perm: int):
+    """MinHash signature: per permutation, the minimum of (a*x + b) mod p over the shingles"""
+    import numpy as np
+
+    a, b = _permutation_params(num_perm)
+    result = np.full(num_perm, MAX_HASH, dtype=np.uint64)
+    # a, x < 2**32, so a*x + b fits in uint64 without overflow
+    for start in range(0, len(shingles), SHINGLE_BLOCK):
+        block = shingles[start:start + SHINGLE_BLOCK][None, :]
+        hashed = ((a * block + b) % np.uint64(MERSENNE_PRIME)) & np.uint64(MAX_HASH)
+        np.minimum(result, hashed.min(axis=1), out=result)
+    return result.astype("<u4")
+
+def band_buckets(sig, bands: int) -> List[Tuple[int, int]]:
+    """(band, bucket) pairs: each band of rows hashed to a signed 64-bit bucket id"""
+    rows = len(sig) // bands
+    buckets = []
+    for band in range(bands):
+        digest = hashlib.blake2b(sig[band * rows:(band + 1) * rows].tobytes(), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, "little", signed=True)))
+    return buckets
+
+def compute(text: str, num_perm: int, words: int) -> Tuple[bytes, int]:
+    """(signature bytes, shingle count) for one document's text; runs in worker processes"""
+    shingles = shingle_hashes(text, words)
+    return signature(shingles, num_perm).tobytes(), len(shingles)
+
+def pdf_text(pdf_bytes: bytes) -> str:
+    """Plain text of every page (requires the `pymupdf` package)"""
+    import fitz
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return " ".join(page.get_text() for page in doc)
+
+def compute_pdf(pdf_bytes: bytes, num_perm: int, words: int) -> Tuple[bytes, int]:
+    """compute() over a PDF's text; runs in worker processes"""
+    return compute(pdf_text(pdf_bytes), num_perm, words)
+
+def _compute_pdf_or_none(pdf_bytes: bytes, num_perm: int, words: int) -> Optional[Tuple[bytes, int]]:
+    # A damaged PDF must not take the rest of its batch down with it
+    try:
+        return compute_pdf(pdf_bytes, num_perm, words)
+    except Exception:
+        return None
+
+def similarity(left: bytes, right: bytes) -> float:
+    """Estimated Jaccard similarity: the fraction of equal signature slots"""
+    a, b = array("I", left), array("I", right)
+    if len(a) != len(b) or not a:
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+def stale_documents_query(after_id: int, limit: int, recompute: bool = False):
+    """(id, chunks_version) of documents without a signature, or whose chunks changed since"""
+    query = select(Document.id, Document.chunks_version).outerjoin(
+        DocumentSignature, DocumentSignature.document_id == Document.id
+    ).where(Document.id > after_id)
+    if not recompute:
+        query = query.where(or_(
+            DocumentSignature.document_id.is_(None),
+            DocumentSignature.chunks_version < Document.chunks_version
+        ))
+    return query.order_by(Document.id).limit(limit)
+
+def document_texts(db: Session, document_ids: List[int]) -> Dict[int, str]:
+    """Chunk text per document, in chunk order"""
+    texts = {document_id: [] for document_id in document_ids}
+    rows = db.execute(
+        select(TextChunk.document_id, TextChunk.chunk_text)
+        .where(TextChunk.document_id.in_(document_ids))
+        .order_by(TextChunk.document_id, TextChunk.id)
+    )
+    for document_id, chunk in rows:
+        texts[document_id].append(chunk)
+    return {document_id: " ".join(chunks) for document_id, chunks in texts.items()}
+
+def store_signatures(db: Session, results: Dict[int, Tuple[bytes, int]], versions: Dict[int, int]):
+    """Upsert signatures and replace the documents' band rows in one transaction.
+
+    `versions` holds each document's chunks_version as read before its text,
+    so a chunk written in between leaves the new signature stale.
+    """
+    import numpy as np
+
+    if not results:
+        return
+    document_ids = list(results)
+    stmt = pg_insert(DocumentSignature).values([
+        {
+            "document_id": document_id,
+            "signature": sig,
+            "num_perm": settings.MINHASH_NUM_PERM,
+            "shingle_count": shingles,
+            "chunks_version": versions[document_id]
+        }
+        for document_id, (sig, shingles) in results.items()
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[DocumentSignature.document_id],
+        set_={
+            "signature": stmt.excluded.signature,
+            "num_perm": stmt.excluded.num_perm,
+            "shingle_count": stmt.excluded.shingle_count,
+            "chunks_version": stmt.excluded.chunks_version,
+            "computed_at": func.now()
+        }
+    ))
+    db.execute(delete(DocumentLshBand).where(DocumentLshBand.document_id.in_(document_ids)))
+    band_rows = [
+        {"band": band, "bucket": bucket, "document_id": document_id}
+        for document_id, (sig, shingles) in results.items()
+        # Empty documents would all share the all-max signature
+        if shingles
+        for band, bucket in band_buckets(np.frombuffer(sig, dtype="<u4"), settings.MINHASH_BANDS)
+    ]
+    if band_rows:
+        db.execute(insert(DocumentLshBand), band_rows)
+    db.commit()
+
+def index_documents(db: Session, batch_size: int = 200, limit: Optional[int] = None,
+                    recompute: bool = False, executor=None) -> dict:
+    """Compute and store signatures for every stale document, batch by batch.
+
+    With an `executor` the per-document hashing runs in worker processes.
+    """
+    if settings.MINHASH_NUM_PERM % settings.MINHASH_BANDS:
+        raise ValueError("MINHASH_NUM_PERM must be a multiple of MINHASH_BANDS")
+    totals = {"documents": 0, "empty": 0}
+    after_id, remaining = 0, limit
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        versions = dict(db.execute(stale_documents_query(after_id, size, recompute)).all())
+        if not versions:
+            break
+        document_ids = list(versions)
+        after_id = document_ids[-1]
+        if remaining is not None:
+            remaining -= len(document_ids)
+        texts = document_texts(db, document_ids)
+        work = partial(compute, num_perm=settings.MINHASH_NUM_PERM, words=settings.MINHASH_SHINGLE_WORDS)
+        ordered = [texts[i] for i in document_ids]
+        computed = list(executor.map(work, ordered) if executor is not None else map(work, ordered))
+        results = dict(zip(document_ids, computed))
+        store_signatures(db, results, versions)
+        totals["documents"] += len(results)
+        totals["empty"] += sum(1 for _, shingles in computed if not shingles)
+    return totals
+
+def stale_articles_query(after_id: int, limit: int, recompute: bool = False):
+    """Articles with a PDF but no signature of it (none yet, or of a replaced PDF)"""
+    query = select(ArticleQueue.id, ArticleQueue.pdf_s3_key, ArticleQueue.storage_tier).outerjoin(
+        ArticleSignature, ArticleSignature.article_id == ArticleQueue.id
+    ).where(ArticleQueue.pdf_s3_key.isnot(None), ArticleQueue.id > after_id)
+    if not recompute:
+        query = query.where(or_(
+            ArticleSignature.article_id.is_(None),
+            ArticleSignature.pdf_s3_key != ArticleQueue.pdf_s3_key
+        ))
+    return query.order_by(ArticleQueue.id).limit(limit)
+
+def store_article_signatures(db: Session, results: Dict[int, Tuple[str, bytes, int]]):
+    """Upsert (pdf_s3_key, signature, shingle count) per article"""
+    if not results:
+        return
+    stmt = pg_insert(ArticleSignature).values([
+        {
+            "article_id": article_id,
+            "pdf_s3_key": key,
+            "signature": sig,
+            "num_perm": settings.MINHASH_NUM_PERM,
+            "shingle_count": shingles
+        }
+        for article_id, (key, sig, shingles) in results.items()
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[ArticleSignature.article_id],
+        set_={
+            "pdf_s3_key": stmt.excluded.pdf_s3_key,
+            "signature": stmt.excluded.signature,
+            "num_perm": stmt.excluded.num_perm,
+            "shingle_count": stmt.excluded.shingle_count,
+            "computed_at": func.now()
+        }
+    ))
+    db.commit()
+
+def index_articles(db: Session, s3_client, bucket: str, batch_size: int = 50,
+                   limit: Optional[int] = None, recompute: bool = False, executor=None) -> dict:
+    """Fingerprint the PDF text of every article without an up-to-date signature.
+
+    PDFs that can't be read right now (missing, being restored) are counted
+    as failed and picked up again by the next run.
+    """
+    totals = {"articles": 0, "empty": 0, "failed": 0}
+    after_id, remaining = 0, limit
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        rows = db.execute(stale_articles_query(after_id, size, recompute)).all()
+        if not rows:
+            break
+        after_id = rows[-1].id
+        if remaining is not None:
+            remaining -= len(rows)
+        fetched = []
+        for row in rows:
+            try:
+                response = get_object_any_tier(s3_client, bucket, row.pdf_s3_key, tier=row.storage_tier)
+                fetched.append((row, response["Body"].read()))
+            except (FileNotFoundError, RestoreInProgress, ClientError) as e:
+                logger.warning(f"Could not read the PDF of article {row.id}: {str(e)}")
+                totals["failed"] += 1
+        work = partial(_compute_pdf_or_none, num_perm=settings.MINHASH_NUM_PERM, words=settings.MINHASH_SHINGLE_WORDS)
+        pdfs = [pdf_bytes for _, pdf_bytes in fetched]
+        computed = executor.map(work, pdfs) if executor is not None else map(work, pdfs)
+        results = {}
+        for (row, _), outcome in zip(fetched, computed):
+            if outcome is None:
+                logger.warning(f"Could not extract the text of article {row.id}")
+                totals["failed"] += 1
+                continue
+            results[row.id] = (row.pdf_s3_key, *outcome)
+            totals["empty"] += 0 if outcome[1] else 1
+        store_article_signatures(db, results)
+        totals["articles"] += len(results)
+    return totals
+
+def _signatures(db: Session, document_ids: Iterable[int]) -> Dict[int, bytes]:
+    return dict(db.execute(
+        select(DocumentSignature.document_id, DocumentSignature.signature)
+        .where(DocumentSignature.document_id.in_(list(document_ids)))
+    ).all())
+
+def _with_similarity(db: Session, pairs: List[Tuple[int, int, int]], min_similarity: float) -> List[dict]:
+    signatures = _signatures(db, {i for pair in pairs for i in pair[:2]})
+    results = []
+    for left, right, shared_bands in pairs:
+        score = similarity(signatures.get(left, b""), signatures.get(right, b""))
+        if score >= min_similarity:
+            results.append({
+                "document_id": left,
+                "duplicate_id": right,
+                "similarity": round(score, 4),
+                "shared_bands": shared_bands
+            })
+    return results
+
+# Only the band rows of one page's documents drive the join (a range scan of
+# ix_document_lsh_bands_document_id), instead of the whole self-join per page
+CANDIDATE_PAIRS = text("""
+    SELECT a.document_id, b.document_id, count(*) AS shared_bands
+    FROM document_lsh_bands a
+    JOIN document_lsh_bands b
+      ON b.band = a.band AND b.bucket = a.bucket AND b.document_id > a.document_id
+    WHERE a.document_id > :after AND a.document_id <= :until
+    GROUP BY a.document_id, b.document_id
+    ORDER BY a.document_id, b.document_id
+""")
+
+def page_bounds(db: Session, after: int, limit: int) -> Tuple[Optional[int], int]:
+    """(last document id, document count) of the next `limit` indexed documents after `after`"""
+    bands = DocumentLshBand.__table__
+    page = select(bands.c.document_id).where(
+        bands.c.document_id > after
+    ).distinct().order_by(bands.c.document_id).limit(limit).subquery()
+    return tuple(db.execute(select(func.max(page.c.document_id), func.count())).one())
+
+def candidate_pairs(db: Session, min_similarity: float, limit: int,
+                    after: int = 0) -> Tuple[List[dict], Optional[int]]:
+    """Pairs sharing at least one LSH bucket, verified against their signatures.
+
+    Pages through the indexed documents `limit` at a time, returning every
+    pair whose lower id is on the page, in (document_id, duplicate_id)
+    order, and the cursor for the next page (None when done).
+    """
+    until, count = page_bounds(db, after, limit)
+    if until is None:
+        return [], None
+    pairs = db.execute(CANDIDATE_PAIRS, {"after": after, "until": until}).all()
+    return _with_similarity(db, pairs, min_similarity), until if count == limit else None
+
+def document_candidates(db: Session, document_id: int, min_similarity: float) -> List[dict]:
+    """Near-duplicates of one document: one index probe per band, then verification"""
+    other = DocumentLshBand.__table__.alias("other")
+    own = DocumentLshBand.__table__.alias("own")
+    rows = db.execute(
+        select(other.c.document_id, func.count())
+        .join(own, (own.c.band == other.c.band) & (own.c.bucket == other.c.bucket))
+        .where(own.c.document_id == document_id, other.c.document_id != document_id)
+        .group_by(other.c.document_id)
+    ).all()
+    return _with_similarity(db, [(document_id, other_id, shared) for other_id, shared in rows], min_similarity)
+
+def article_candidates(db: Session, article_id: int, min_similarity: float) -> Optional[List[dict]]:
+    """Documents whose text matches an article's PDF; None if the article has no signature yet"""
+    import numpy as np
+
+    row = db.execute(
+        select(ArticleSignature.signature, ArticleSignature.shingle_count)
+        .where(ArticleSignature.article_id == article_id)
+    ).first()
+    if row is None:
+        return None
+    if not row.shingle_count:
+        return []
+    buckets = band_buckets(np.frombuffer(row.signature, dtype="<u4"), settings.MINHASH_BANDS)
+    bands = DocumentLshBand.__table__
+    rows = db.execute(
+        select(bands.c.document_id, func.count())
+        .where(tuple_(bands.c.band, bands.c.bucket).in_(buckets))
+        .group_by(bands.c.document_id)
+    ).all()
+    signatures = _signatures(db, [document_id for document_id, _ in rows])
+    results = []
+    for document_id, shared_bands in rows:
+        score = similarity(row.signature, signatures.get(document_id, b""))
+        if score >= min_similarity:
+            results.append({
+                "article_id": article_id,
+                "document_id": document_id,
+                "similarity": round(score, 4),
+                "shared_bands": shared_bands
+            })
+    return results
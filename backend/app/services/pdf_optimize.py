@@ -0,0 +1,112 @@
+import hashlib
+import io
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+FONT_FILE_KEYS = ("/FontFile", "/FontFile2", "/FontFile3")
+
+def optimizer_available() -> bool:
+    try:
+        import pikepdf  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def optimized_key(content_hash: str) -> str:
+    """Where the web-optimized copy of a PDF is stored, next to the original"""
+    return f"pdfs/optimized/{content_hash}.pdf"
+
+def _font_descriptors(font):
+    descriptor = font.get("/FontDescriptor")
+    if descriptor is not None:
+        yield descriptor
+    for descendant in font.get("/DescendantFonts", []):
+        yield from _font_descriptors(descendant)
+
+def _dedupe_fonts(pdf) -> int:
+    """Point descriptors with byte-identical embedded font programs at one stream"""
+    seen = {}
+    replaced = 0
+    for page in pdf.pages:
+        fonts = page.obj.get("/Resources", {}).get("/Font", {})
+        for _, font in fonts.items():
+            for descriptor in _font_descriptors(font):
+                for key in FONT_FILE_KEYS:
+                    stream = descriptor.get(key)
+                    if stream is None:
+                        continue
+                    digest = (key, hashlib.sha256(stream.read_raw_bytes()).digest())
+                    original = seen.setdefault(digest, stream)
+                    if original.objgen != stream.objgen:
+                        descriptor[key] = original
+                        replaced += 1
+    return replaced
+
+def optimize_pdf(pdf_bytes: bytes) -> Optional[bytes]:
+    """Linearize a PDF and drop embedded thumbnails and duplicate fonts.
+
+    Requires the `pikepdf` package. Returns None when the file is already
+    linearized and optimizing it would not make it smaller.
+    """
+    import pikepdf
+
+    with pikepdf.open(io.BytesIO(pdf_bytes)) as pdf:
+        already_linearized = pdf.is_linearized
+        for page in pdf.pages:
+            if "/Thumb" in page.obj:
+                del page.obj["/Thumb"]
+        replaced_fonts = _dedupe_fonts(pdf)
+        pdf.remove_unreferenced_resources()
+
+        output = io.BytesIO()
+        # Unreachable objects (old thumbnails and font copies) are not written
+        pdf.save(
+            output,
+            linearize=True,
+            compress_streams=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate
+        )
+
+    optimized = output.getvalue()
+    if already_linearized and len(optimized) >= len(pdf_bytes):
+        return None
+    logger.info(
+        f"Optimized PDF {len(pdf_bytes)} -> {len(optimized)} bytes "
+        f"({replaced_fonts} duplicate fonts removed)"
+    )
+    return optimized
+
+def store_optimized(s3_client, bucket: str, content_hash: str, optimized: bytes) -> str:
+    """Upload the optimized copy; the original object is left untouched"""
+    key = optimized_key(content_hash)
+    s3_client.s3.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=optimized,
+        ContentType="application/pdf",
+        Metadata={"source-sha256": content_hash, "linearized": "true"}
+    )
+    return key
+
+def optimize_and_store(s3_client, bucket: str, content_hash: str, pdf_bytes: bytes) -> Optional[dict]:
+    """Optimize `pdf_bytes` and upload the result when it is worth keeping.
+
+    Returns the fields to record ({optimized_s3_key, optimized_size}) or None.
+    Failures are logged and never block ingest.
+    """
+    if not optimizer_available():
+        logger.warning("PDF optimization requested but pikepdf is not installed")
+        return None
+    try:
+        optimized = optimize_pdf(pdf_bytes)
+    except Exception as e:
+        logger.warning(f"Could not optimize PDF {content_hash}: {str(e)}")
+        return None
+    if optimized is None:
+        return None
+    return {
+        "optimized_s3_key": store_optimized(s3_client, bucket, content_hash, optimized),
+        "optimized_size": len(optimized)
+    }
@@ -0,0 +1,214 @@
+import logging
+from typing import Dict, List, Optional
+from sqlalchemy import bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.article_queue import ArticleQueue
+from app.models.document import Document
+from app.models.document_status import DocumentStatus
+from app.models.section import Section
+from app.models.text_chunk import TextChunk
+from app.services.section_types import section_types
+
+logger = logging.getLogger(__name__)
+
+PROCESSED_STATUS = "processed"
+CHUNK_WORDS = 120
+# Sections written by this job; re-promoting an article replaces exactly these
+SOURCE = "annotation"
+
+def chunk_text(text: str) -> List[str]:
+    words = text.split()
+    return [" ".join(words[i:i + CHUNK_WORDS]) for i in range(0, len(words), CHUNK_WORDS)]
+
+def annotations_of(annotation_data) -> List[dict]:
+    """The annotation list, whichever wrapper the client saved it in"""
+    if not isinstance(annotation_data, dict):
+        return []
+    if "annotations" in annotation_data:
+        annotations = annotation_data["annotations"]
+    else:
+        annotations = (annotation_data.get("annotation_data") or {}).get("annotations")
+    return [a for a in annotations or [] if isinstance(a, dict)]
+
+def pending_articles_query(after_id: int, limit: int):
+    """Completed articles never promoted, or changed since their last promotion"""
+    return select(
+        ArticleQueue.id, ArticleQueue.doi, ArticleQueue.title, ArticleQueue.authors,
+        ArticleQueue.publication_date, ArticleQueue.pdf_s3_key, ArticleQueue.annotation_data,
+        ArticleQueue.change_version
+    ).where(
+        ArticleQueue.status == "completed",
+        ArticleQueue.id > after_id,
+        or_(
+            ArticleQueue.promoted_version.is_(None),
+            ArticleQueue.change_version > ArticleQueue.promoted_version
+        )
+    ).order_by(ArticleQueue.id).limit(limit)
+
+def processed_status_id(db: Session) -> int:
+    """Id of the "processed" DocumentStatus; ids differ between databases"""
+    status_id = db.execute(
+        select(DocumentStatus.id).where(DocumentStatus.name == PROCESSED_STATUS)
+    ).scalar()
+    if status_id is None:
+        raise ValueError(f"Document status '{PROCESSED_STATUS}' does not exist")
+    return status_id
+
+def article_pdf_url(pdf_s3_key: Optional[str]) -> Optional[str]:
+    """Document.pdf_s3_url for an article PDF; carries the bucket, which isn't AWS_BUCKET_NAME"""
+    if not pdf_s3_key:
+        return None
+    if not settings.AWS_ARTICLE_QUEUE_BUCKET:
+        raise ValueError("AWS_ARTICLE_QUEUE_BUCKET must be set to promote articles with PDFs")
+    return f"s3://{settings.AWS_ARTICLE_QUEUE_BUCKET}/{pdf_s3_key}"
+
+def _upsert_documents(db: Session, articles, status_id: int) -> Dict[str, int]:
+    stmt = pg_insert(Document).values([
+        {
+            "title": a.title or a.doi,
+            "authors": a.authors,
+            "publication_date": a.publication_date,
+            "doi": a.doi,
+            "pdf_s3_url": article_pdf_url(a.pdf_s3_key),
+            "status_id": status_id,
+            "created_at": func.now(),
+            "updated_at": func.now()
+        }
+        for a in articles
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Document.doi],
+        set_={
+            "title": stmt.excluded.title,
+            "authors": stmt.excluded.authors,
+            "publication_date": stmt.excluded.publication_date,
+            "pdf_s3_url": func.coalesce(stmt.excluded.pdf_s3_url, Document.pdf_s3_url),
+            "status_id": status_id,
+            "updated_at": func.now()
+        }
+    ).returning(Document.id, Document.doi)
+    return {row.doi: row.id for row in db.execute(stmt)}
+
+def promote_batch(db: Session, articles, status_id: Optional[int] = None) -> dict:
+    """Promote one batch of article rows with a fixed number of statements"""
+    counts = {"articles": 0, "sections": 0, "chunks": 0, "skipped": 0}
+    # Documents are keyed by DOI; a batch can't upsert the same DOI twice
+    by_doi = {}
+    for article in articles:
+        if article.doi:
+            by_doi[article.doi] = article
+    counts["skipped"] = len(articles) - len(by_doi)
+    if not by_doi:
+        return counts
+
+    if status_id is None:
+        status_id = processed_status_id(db)
+    document_ids = _upsert_documents(db, list(by_doi.values()), status_id)
+
+    # Replace what earlier promotions wrote; hand-made and auto sections stay
+    old_sections = select(Section.id).where(
+        Section.document_id.in_(document_ids.values()), Section.source == SOURCE
+    )
+    # The document_id filter prunes text_chunks' hash partitions to this batch's
+    db.execute(
+        delete(TextChunk).where(
+            TextChunk.document_id.in_(document_ids.values()),
+            TextChunk.section_id.in_(old_sections)
+        ),
+        execution_options={"synchronize_session": False}
+    )
+    db.execute(
+        delete(Section).where(
+            Section.document_id.in_(document_ids.values()), Section.source == SOURCE
+        ),
+        execution_options={"synchronize_session": False}
+    )
+
+    names = {a.get("section_type") for article in by_doi.values() for a in annotations_of(article.annotation_data)}
+    type_ids = section_types.ids(db, [n for n in names if isinstance(n, str)])
+
+    section_params = []
+    for doi, article in by_doi.items():
+        for annotation in annotations_of(article.annotation_data):
+            coords = annotation.get("coordinates") or {}
+            section_params.append({
+                "document_id": document_ids[doi],
+                "section_type_id": type_ids.get((annotation.get("section_type") or "").strip()),
+                "text": annotation.get("text") or "",
+                "page_num": annotation.get("page_num"),
+                "coordinates": coords or None,
+                "rect": {
+                    "x": coords.get("left"), "y": coords.get("top"),
+                    "width": (coords.get("right") or 0) - (coords.get("left") or 0),
+                    "height": (coords.get("bottom") or 0) - (coords.get("top") or 0)
+                } if coords else None,
+                "source": SOURCE
+            })
+
+    if section_params:
+        section_ids = db.execute(
+            insert(Section).returning(Section.id, sort_by_parameter_order=True),
+            section_params
+        ).scalars().all()
+
+        chunk_params = [
+            {
+                "document_id": params["document_id"],
+                "section_id": section_id,
+                "chunk_text": chunk,
+                "chunk_metadata": {"position": position, "page_num": params["page_num"]}
+            }
+            for section_id, params in zip(section_ids, section_params)
+            for position, chunk in enumerate(chunk_text(params["text"]))
+        ]
+        if chunk_params:
+            db.execute(insert(TextChunk), chunk_params)
+        counts["sections"] = len(section_params)
+        counts["chunks"] = len(chunk_params)
+
+    # The version read, not the current one: a write since then keeps the row pending
+    table = ArticleQueue.__table__
+    db.execute(
+        update(table)
+        .where(table.c.id == bindparam("article_id"))
+        .values(
+            promoted_at=func.now(),
+            promoted_version=bindparam("version"),
+            updated_at=table.c.updated_at
+        ),
+        [{"article_id": a.id, "version": a.change_version} for a in articles]
+    )
+    counts["articles"] = len(by_doi)
+    return counts
+
+def promote_annotations(db: Session, batch_size: int = 200, limit: Optional[int] = None) -> dict:
+    """Promote completed articles' annotations into documents, sections and chunks.
+
+    Only articles changed since their last promotion are read. Each batch is
+    committed on its own, so an interrupted run resumes where it stopped.
+    """
+    totals = {"articles": 0, "sections": 0, "chunks": 0, "skipped": 0, "batches": 0}
+    status_id = processed_status_id(db)
+    after_id = 0
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        articles = db.execute(pending_articles_query(after_id, size)).all()
+        if not articles:
+            break
+        try:
+            counts = promote_batch(db, articles, status_id)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        after_id = articles[-1].id
+        if remaining is not None:
+            remaining -= len(articles)
+        totals["batches"] += 1
+        for key, value in counts.items():
+            totals[key] += value
+        logger.info(f"Promotion batch {totals['batches']}: {counts}")
+    return totals
@@ -0,0 +1,46 @@
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.models.section_type import SectionType
+
+logger = logging.getLogger(__name__)
+
+class SectionTypeCache:
+    """Case-insensitive SectionType name -> id lookup, loaded once per process"""
+
+    def __init__(self):
+        self._ids: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session):
+        rows = db.execute(select(SectionType.id, SectionType.name)).all()
+        self._ids = {name.strip().lower(): type_id for type_id, name in rows}
+
+    def ids(self, db: Session, names: Iterable[str], create: bool = True) -> Dict[str, int]:
+        """Ids for `names`; unknown names are inserted when `create` is set"""
+        wanted = {name.strip(): name.strip().lower() for name in names if name and name.strip()}
+        with self._lock:
+            if self._ids is None:
+                self._load(db)
+            missing = sorted({key for key in wanted.values() if key not in self._ids})
+            if missing:
+                # Another process may have added them since the cache was loaded
+                self._load(db)
+                missing = [key for key in missing if key not in self._ids]
+            if missing and create:
+                originals = {}
+                for name, key in wanted.items():
+                    originals.setdefault(key, name)
+                db.execute(insert(SectionType), [{"name": originals[key]} for key in missing])
+                db.flush()
+                logger.info(f"Created section types: {[originals[key] for key in missing]}")
+                self._load(db)
+            return {name: self._ids[key] for name, key in wanted.items() if key in self._ids}
+
+    def clear(self):
+        with self._lock:
+            self._ids = None
+
+section_types = SectionTypeCache()
@@ -0,0 +1,178 @@
+import logging
+import re
+from collections import Counter
+from statistics import median
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Normalized heading text -> section type name (as stored in section_types)
+HEADING_KEYWORDS = {
+    "abstract": "Abstract",
+    "summary": "Abstract",
+    "introduction": "Introduction",
+    "background": "Introduction",
+    "methods": "Methods",
+    "method": "Methods",
+    "methodology": "Methods",
+    "materials and methods": "Methods",
+    "methods and materials": "Methods",
+    "experimental": "Methods",
+    "experimental section": "Methods",
+    "results": "Results",
+    "findings": "Results",
+    "results and discussion": "Results",
+    "discussion": "Discussion",
+    "conclusion": "Discussion",
+    "conclusions": "Discussion",
+    "references": "References",
+    "bibliography": "References",
+    "literature cited": "References",
+    "works cited": "References"
+}
+SECTION_TYPE_NAMES = sorted(set(HEADING_KEYWORDS.values()))
+
+# Leading "1.", "2.3", "IV." or "A." numbering on headings
+NUMBERING = re.compile(r"^(?:\d+(?:\.\d+)*|[ivxlc]+|[a-z])[.)]?\s+")
+MAX_HEADING_WORDS = 6
+
+class Line(NamedTuple):
+    page_num: int  # 1-based
+    left: float
+    top: float
+    right: float
+    bottom: float
+    text: str
+    size: float
+    bold: bool
+
+def extract_lines(pdf_bytes: bytes) -> Tuple[int, List[Line]]:
+    """Text lines with geometry and font info (requires the `pymupdf` package)"""
+    import fitz
+
+    lines = []
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        for page_index in range(doc.page_count):
+            page = doc.load_page(page_index)
+            for block in page.get_text("dict", flags=0)["blocks"]:
+                for line in block.get("lines", []):
+                    spans = [s for s in line["spans"] if s["text"].strip()]
+                    if not spans:
+                        continue
+                    x0, y0, x1, y1 = line["bbox"]
+                    lines.append(Line(
+                        page_index + 1, x0, y0, x1, y1,
+                        " ".join(s["text"].strip() for s in spans),
+                        max(s["size"] for s in spans),
+                        all(s["flags"] & 16 for s in spans)
+                    ))
+        page_count = doc.page_count
+    return page_count, lines
+
+def heading_type(text: str) -> Optional[str]:
+    normalized = NUMBERING.sub("", text.strip().lower()).rstrip(":.").strip()
+    return HEADING_KEYWORDS.get(normalized)
+
+def _body_size(lines: List[Line]) -> float:
+    """Most common font size, weighted by characters"""
+    sizes = Counter()
+    for line in lines:
+        sizes[round(line.size * 2) / 2] += len(line.text)
+    return sizes.most_common(1)[0][0]
+
+def _gaps_above(lines: List[Line]) -> List[float]:
+    gaps = []
+    for i, line in enumerate(lines):
+        previous = lines[i - 1] if i else None
+        if previous is None or previous.page_num != line.page_num:
+            gaps.append(0.0)
+        else:
+            gaps.append(max(0.0, line.top - previous.bottom))
+    return gaps
+
+def find_headings(lines: List[Line]) -> List[Tuple[int, str, float]]:
+    """(line index, section type, confidence) for lines that look like headings.
+
+    A line must name a known section; font size, weight and the whitespace
+    above it decide how confident the match is.
+    """
+    if not lines:
+        return []
+    body = _body_size(lines)
+    gaps = _gaps_above(lines)
+    typical_gap = median([g for g in gaps if g > 0] or [0.0])
+
+    headings = []
+    for i, line in enumerate(lines):
+        if len(line.text.split()) > MAX_HEADING_WORDS:
+            continue
+        section_type = heading_type(line.text)
+        if section_type is None:
+            continue
+        larger = line.size >= body * 1.15
+        spaced = gaps[i] == 0.0 or gaps[i] > typical_gap * 1.5
+        # A body-sized, non-bold, tightly spaced "Results" is just a word in a sentence
+        if not (larger or line.bold or spaced):
+            continue
+        confidence = 0.4 + 0.3 * larger + 0.15 * line.bold + 0.15 * spaced
+        headings.append((i, section_type, round(confidence, 2)))
+
+    # A paper has one of each; keep the first heading of a type
+    seen = set()
+    unique = []
+    for heading in headings:
+        if heading[1] not in seen:
+            seen.add(heading[1])
+            unique.append(heading)
+    return unique
+
+def _region(lines: List[Line], section_type: str, confidence: float) -> dict:
+    left = min(l.left for l in lines)
+    top = min(l.top for l in lines)
+    right = max(l.right for l in lines)
+    bottom = max(l.bottom for l in lines)
+    return {
+        "section_type": section_type,
+        "page_num": lines[0].page_num,
+        "text": " ".join(l.text for l in lines),
+        "coordinates": {"left": left, "top": top, "right": right, "bottom": bottom},
+        "rect": {"x": left, "y": top, "width": right - left, "height": bottom - top},
+        "confidence": confidence
+    }
+
+def segment_lines(lines: List[Line]) -> List[dict]:
+    """Candidate sections: each heading up to the next, split at page breaks"""
+    headings = find_headings(lines)
+    candidates = []
+    for n, (start, section_type, confidence) in enumerate(headings):
+        end = headings[n + 1][0] if n + 1 < len(headings) else len(lines)
+        page_lines = []
+        for line in lines[start:end]:
+            if page_lines and line.page_num != page_lines[-1].page_num:
+                candidates.append(_region(page_lines, section_type, confidence))
+                page_lines = []
+            page_lines.append(line)
+        if page_lines:
+            candidates.append(_region(page_lines, section_type, confidence))
+    return candidates
+
+def segment_pdf(pdf_bytes: bytes) -> Tuple[int, List[dict]]:
+    """(page count, candidate sections) for one PDF; safe to run in a worker process"""
+    page_count, lines = extract_lines(pdf_bytes)
+    return page_count, segment_lines(lines)
+
+def section_rows(document_id: int, candidates: List[dict], type_ids: Dict[str, int]) -> List[dict]:
+    """Section insert parameters for the candidates of one document"""
+    return [
+        {
+            "document_id": document_id,
+            "section_type_id": type_ids.get(c["section_type"]),
+            "text": c["text"],
+            "page_num": c["page_num"],
+            "coordinates": c["coordinates"],
+            "rect": c["rect"],
+            "source": "auto",
+            "confidence": c["confidence"]
+        }
+        for c in candidates
+    ]
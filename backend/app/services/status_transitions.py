@@ -0,0 +1,156 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import Integer, bindparam, func, insert, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.models.article_queue import ArticleQueue
+from app.models.document import Document
+from app.models.document_status import DocumentStatus
+from app.models.status_transition import StatusTransition
+
+logger = logging.getLogger(__name__)
+
+# status -> statuses it may move to
+DOCUMENT_TRANSITIONS = {
+    "pending": {"processed", "failed"},
+    "processed": {"pending"},
+    "failed": {"pending"},
+}
+ARTICLE_TRANSITIONS = {
+    "pending": {"processing", "completed", "failed"},
+    "processing": {"pending", "completed", "failed"},
+    "completed": {"pending"},
+    "failed": {"pending"},
+}
+
+BATCH_NOTIFY = text("""
+    SELECT pg_notify('row_changes', json_build_object(
+        'table', CAST(:table AS text),
+        'op', 'bulk_update',
+        'ids', :ids,
+        'status', CAST(:status AS text),
+        'version', txid_current()
+    )::text)
+""").bindparams(bindparam("ids", type_=ARRAY(Integer)))
+
+class TransitionError(ValueError):
+    """The requested transition is not allowed"""
+
+def sources_for(transitions: Dict[str, Set[str]], to_status: str, from_statuses: Optional[Iterable[str]]) -> List[str]:
+    """Statuses rows may be moved out of, validated against the transition map"""
+    if not any(to_status in targets for targets in transitions.values()):
+        raise TransitionError(f"Unknown target status '{to_status}'")
+    allowed = sorted(status for status, targets in transitions.items() if to_status in targets)
+    if not from_statuses:
+        return allowed
+    invalid = sorted(set(from_statuses) - set(allowed))
+    if invalid:
+        raise TransitionError(
+            f"Cannot move {', '.join(invalid)} to '{to_status}'; allowed from: {', '.join(allowed)}"
+        )
+    return sorted(set(from_statuses))
+
+class BulkTransition:
+    """Set-based status change for one table, one UPDATE ... RETURNING id per batch"""
+
+    def __init__(self, model, status_column, table: str, resource: str, transitions: Dict[str, Set[str]]):
+        self.model = model
+        self.status_column = status_column
+        self.table = table
+        self.resource = resource
+        self.transitions = transitions
+
+    def status_values(self, db: Session, names: Iterable[str]) -> Dict[str, object]:
+        """Status name -> value stored in the status column"""
+        return {name: name for name in names}
+
+    def _values(self, target):
+        return {self.status_column.key: target}
+
+    def _apply(self, db: Session, where, target, to_status: str) -> List[int]:
+        """Run one batch in its own transaction: UPDATE, audit row and a single notify"""
+        # Transaction-local: the row trigger stays quiet, the batch event replaces it
+        db.execute(text("SET LOCAL app.suppress_row_notify = 'on'"))
+        ids = db.execute(
+            update(self.model).where(*where).values(**self._values(target)).returning(self.model.id)
+        ).scalars().all()
+        if ids:
+            db.execute(insert(StatusTransition).values(
+                table_name=self.table, to_status=to_status, row_ids=ids, row_count=len(ids)
+            ))
+            # The status name, never the stored value (documents store a DocumentStatus id)
+            db.execute(BATCH_NOTIFY, {"table": self.table, "ids": ids, "status": to_status})
+        db.commit()
+        for row_id in ids:
+            response_cache.invalidate(self.resource, row_id)
+        return ids
+
+    def run(self, db: Session, to_status: str, ids: Optional[List[int]] = None,
+            from_statuses: Optional[List[str]] = None, batch_size: Optional[int] = None) -> dict:
+        """Move rows selected by `ids` and/or `from_statuses` to `to_status`.
+
+        Rows whose current status can't move to `to_status` are left alone
+        (and reported as skipped when ids were given).
+        """
+        sources = sources_for(self.transitions, to_status, from_statuses)
+        values = self.status_values(db, sources + [to_status])
+        if to_status not in values:
+            raise TransitionError(f"Unknown target status '{to_status}'")
+        target = values[to_status]
+        source_values = [values[s] for s in sources if s in values]
+        batch_size = batch_size or settings.STATUS_TRANSITION_BATCH_SIZE
+        status_filter = self.status_column.in_(source_values)
+
+        updated: List[int] = []
+        batches = 0
+        if ids is not None:
+            unique_ids = sorted(set(ids))
+            for start in range(0, len(unique_ids), batch_size):
+                chunk = unique_ids[start:start + batch_size]
+                updated += self._apply(db, [self.model.id.in_(chunk), status_filter], target, to_status)
+                batches += 1
+        else:
+            last_id = 0
+            while True:
+                # Keyset over the filter; FOR UPDATE re-checks rows changed concurrently
+                batch = select(self.model.id).where(
+                    status_filter, self.model.id > last_id
+                ).order_by(self.model.id).limit(batch_size).with_for_update()
+                batch_ids = self._apply(db, [self.model.id.in_(batch), status_filter], target, to_status)
+                if not batch_ids:
+                    break
+                batches += 1
+                updated += batch_ids
+                last_id = max(batch_ids)
+
+        result = {
+            "to_status": to_status,
+            "from_statuses": sources,
+            "updated": len(updated),
+            "batches": batches,
+        }
+        if ids is not None:
+            result["skipped_ids"] = sorted(set(ids) - set(updated))
+        logger.info(f"Bulk transition of {self.table} to {to_status}: {len(updated)} rows in {batches} batches")
+        return result
+
+class DocumentTransition(BulkTransition):
+    """Documents store a DocumentStatus id rather than the name"""
+
+    def status_values(self, db: Session, names: Iterable[str]) -> Dict[str, object]:
+        rows = db.execute(
+            select(DocumentStatus.name, DocumentStatus.id).where(DocumentStatus.name.in_(list(names)))
+        ).all()
+        return {name: status_id for name, status_id in rows}
+
+    def _values(self, target):
+        return {"status_id": target, "updated_at": func.now()}
+
+document_transitions = DocumentTransition(
+    Document, Document.status_id, "documents", "document", DOCUMENT_TRANSITIONS
+)
+article_transitions = BulkTransition(
+    ArticleQueue, ArticleQueue.status, "article_queue", "article", ARTICLE_TRANSITIONS
+)
@@ -0,0 +1,249 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set
+
+from botocore.exceptions import ClientError
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.models.article_queue import ArticleQueue
+
+logger = logging.getLogger(__name__)
+
+HOT = "hot"
+COLD = "cold"
+# Storage classes whose objects must be restored before they can be read
+ARCHIVE_CLASSES = {"GLACIER", "DEEP_ARCHIVE"}
+# Typical S3 restore times per retrieval tier, used for Retry-After
+RESTORE_SECONDS = {"Expedited": 5 * 60, "Standard": 5 * 3600, "Bulk": 12 * 3600}
+NOT_FOUND_CODES = ("404", "NoSuchKey", "NotFound")
+
+class RestoreInProgress(Exception):
+    """The cold copy is archived and a restore has been requested"""
+
+    def __init__(self, key: str, retry_after: int):
+        super().__init__(f"{key} is being restored from cold storage")
+        self.key = key
+        self.retry_after = retry_after
+
+def cold_key(key: str) -> str:
+    return f"{settings.PDF_COLD_PREFIX}{key}"
+
+def article_keys(pdf_s3_key: Optional[str], pdf_optimized_s3_key: Optional[str]) -> List[str]:
+    """Every stored object of an article (the optimized copy can be the original itself)"""
+    return list(dict.fromkeys(k for k in (pdf_s3_key, pdf_optimized_s3_key) if k))
+
+def _head(s3_client, bucket: str, key: str) -> Optional[dict]:
+    try:
+        return s3_client.s3.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response["Error"]["Code"] in NOT_FOUND_CODES:
+            return None
+        raise
+
+def _readable(head: dict) -> bool:
+    if head.get("StorageClass") not in ARCHIVE_CLASSES:
+        return True
+    # Restore header: ongoing-request="false", expiry-date="..." once the copy is available
+    return 'ongoing-request="false"' in head.get("Restore", "")
+
+def _request_restore(s3_client, bucket: str, key: str):
+    try:
+        s3_client.s3.restore_object(
+            Bucket=bucket,
+            Key=key,
+            RestoreRequest={
+                "Days": settings.PDF_COLD_RESTORE_DAYS,
+                "GlacierJobParameters": {"Tier": settings.PDF_COLD_RESTORE_TIER}
+            }
+        )
+        logger.info(f"Requested restore of {key} ({settings.PDF_COLD_RESTORE_TIER})")
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "RestoreAlreadyInProgress":
+            raise
+
+def locate_cold(s3_client, bucket: str, key: str) -> Optional[str]:
+    """Readable cold key for a hot `key`, None if there is no cold copy.
+
+    Archived copies get a restore request and raise RestoreInProgress until
+    S3 has made them readable again.
+    """
+    head = _head(s3_client, bucket, cold_key(key))
+    if head is None:
+        return None
+    if not _readable(head):
+        _request_restore(s3_client, bucket, cold_key(key))
+        raise RestoreInProgress(key, RESTORE_SECONDS.get(settings.PDF_COLD_RESTORE_TIER, 3600))
+    return cold_key(key)
+
+def _get_hot(s3_client, bucket: str, key: str, **params) -> Optional[dict]:
+    try:
+        return s3_client.s3.get_object(Bucket=bucket, Key=key, **params)
+    except ClientError as e:
+        if e.response["Error"]["Code"] in NOT_FOUND_CODES:
+            return None
+        raise
+
+def get_object_any_tier(s3_client, bucket: str, key: str, tier: Optional[str] = None, **params) -> dict:
+    """get_object for a hot `key` wherever it is now; hot is tried first unless `tier` is cold.
+
+    Raises FileNotFoundError when neither tier has the object and
+    RestoreInProgress while an archived copy is being restored.
+    """
+    if tier != COLD:
+        # Missing when moved by the tiering job (possibly after the row was read)
+        response = _get_hot(s3_client, bucket, key, **params)
+        if response is not None:
+            return response
+    cold = locate_cold(s3_client, bucket, key)
+    if cold is not None:
+        return s3_client.s3.get_object(Bucket=bucket, Key=cold, **params)
+    if tier == COLD:
+        # Keys are shared by articles with the same PDF; rehydrating one of
+        # them brings the copy back to the hot key for all of them
+        response = _get_hot(s3_client, bucket, key, **params)
+        if response is not None:
+            return response
+    raise FileNotFoundError(key)
+
+def move_object(s3_client, bucket: str, source: str, target: str, storage_class: str) -> int:
+    """Copy `source` to `target` in `storage_class`; returns the object size"""
+    head = _head(s3_client, bucket, source)
+    if head is None:
+        # Already moved by an earlier, interrupted run
+        target_head = _head(s3_client, bucket, target)
+        if target_head is None:
+            raise FileNotFoundError(source)
+        return target_head["ContentLength"]
+    s3_client.s3.copy_object(
+        Bucket=bucket,
+        Key=target,
+        CopySource={"Bucket": bucket, "Key": source},
+        StorageClass=storage_class,
+        MetadataDirective="COPY"
+    )
+    return head["ContentLength"]
+
+def cold_candidates_query(after_id: int, limit: int, older_than: datetime):
+    """Hot articles whose annotations were promoted before `older_than`"""
+    return select(
+        ArticleQueue.id, ArticleQueue.pdf_s3_key, ArticleQueue.pdf_optimized_s3_key
+    ).where(
+        ArticleQueue.status == "completed",
+        ArticleQueue.storage_tier == HOT,
+        ArticleQueue.pdf_s3_key.isnot(None),
+        ArticleQueue.promoted_at < older_than,
+        ArticleQueue.id > after_id
+    ).order_by(ArticleQueue.id).limit(limit)
+
+def _set_tier(db: Session, article_ids: List[int], tier: str):
+    db.execute(
+        update(ArticleQueue).where(ArticleQueue.id.in_(article_ids))
+        .values(storage_tier=tier, tiered_at=datetime.now(timezone.utc))
+    )
+    db.commit()
+    for article_id in article_ids:
+        response_cache.invalidate("article", article_id)
+
+def _still_needed(db: Session, keys: Iterable[str], moved_ids: List[int], target: str) -> Set[str]:
+    """Keys of `keys` that articles staying on the other tier still point at"""
+    keys = set(keys)
+    if not keys:
+        return set()
+    rows = db.execute(
+        select(ArticleQueue.pdf_s3_key, ArticleQueue.pdf_optimized_s3_key).where(
+            or_(ArticleQueue.pdf_s3_key.in_(keys), ArticleQueue.pdf_optimized_s3_key.in_(keys)),
+            ArticleQueue.storage_tier != target,
+            ArticleQueue.id.notin_(moved_ids)
+        )
+    ).all()
+    return {key for row in rows for key in row if key in keys}
+
+def tier_batch(db: Session, s3_client, bucket: str, rows, target: str = COLD) -> dict:
+    """Move the PDFs of `rows` to `target` and record the new tier.
+
+    Objects are copied first, the tier is committed, and only then are the
+    sources deleted, so a crash never leaves a row pointing at nothing;
+    reads fall back to the other tier in between. Sources that articles
+    left on the old tier share (same content-addressed key) are kept.
+    """
+    counts = {"articles": 0, "objects": 0, "bytes": 0, "failed": 0}
+    moved_ids, sources = [], []
+    for row in rows:
+        # Sources of a partly moved article stay put; its copies are rewritten next run
+        # (hot key, object to delete once the tier is recorded)
+        row_sources, row_bytes = [], 0
+        try:
+            for key in article_keys(row.pdf_s3_key, row.pdf_optimized_s3_key):
+                if target == COLD:
+                    row_bytes += move_object(s3_client, bucket, key, cold_key(key), settings.PDF_COLD_STORAGE_CLASS)
+                    row_sources.append((key, key))
+                elif locate_cold(s3_client, bucket, key) is not None:
+                    row_bytes += move_object(s3_client, bucket, cold_key(key), key, "STANDARD")
+                    row_sources.append((key, cold_key(key)))
+        except RestoreInProgress as e:
+            logger.info(f"Article {row.id}: {e}")
+            counts["failed"] += 1
+            continue
+        except Exception as e:
+            logger.error(f"Could not move PDFs of article {row.id} to {target}: {str(e)}")
+            counts["failed"] += 1
+            continue
+        moved_ids.append(row.id)
+        sources.extend(row_sources)
+        counts["objects"] += len(row_sources)
+        counts["bytes"] += row_bytes
+
+    if moved_ids:
+        _set_tier(db, moved_ids, target)
+        counts["articles"] = len(moved_ids)
+    shared = _still_needed(db, [key for key, _ in sources], moved_ids, target)
+    for key, source in dict.fromkeys(sources):
+        if key not in shared:
+            s3_client.s3.delete_object(Bucket=bucket, Key=source)
+    return counts
+
+def tier_completed_articles(db: Session, s3_client, bucket: str, batch_size: int = 100,
+                            limit: Optional[int] = None) -> dict:
+    """Move PDFs of articles promoted more than PDF_COLD_AFTER_DAYS ago to the cold tier"""
+    older_than = datetime.now(timezone.utc) - timedelta(days=settings.PDF_COLD_AFTER_DAYS)
+    totals = {"articles": 0, "objects": 0, "bytes": 0, "failed": 0}
+    after_id, remaining = 0, limit
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        rows = db.execute(cold_candidates_query(after_id, size, older_than)).all()
+        if not rows:
+            break
+        after_id = rows[-1].id
+        if remaining is not None:
+            remaining -= len(rows)
+        for name, value in tier_batch(db, s3_client, bucket, rows).items():
+            totals[name] += value
+    return totals
+
+def rehydrate_articles(db: Session, s3_client, bucket: str, article_ids: Iterable[int]) -> dict:
+    """Move cold articles back to the hot tier (archived copies are restored first)"""
+    rows = db.execute(
+        select(ArticleQueue.id, ArticleQueue.pdf_s3_key, ArticleQueue.pdf_optimized_s3_key)
+        .where(ArticleQueue.id.in_(list(article_ids)), ArticleQueue.storage_tier == COLD)
+    ).all()
+    return tier_batch(db, s3_client, bucket, rows, target=HOT)
+
+def bytes_per_tier(s3_client, bucket: str) -> Dict[str, Dict[str, dict]]:
+    """Object count and bytes per tier and storage class, from a bucket listing.
+
+    Everything outside PDF_COLD_PREFIX is hot, since feeds may store PDFs
+    under any key.
+    """
+    report = {tier: defaultdict(lambda: {"objects": 0, "bytes": 0}) for tier in (HOT, COLD)}
+    paginator = s3_client.s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket):
+        for obj in page.get("Contents", []):
+            tier = COLD if obj["Key"].startswith(settings.PDF_COLD_PREFIX) else HOT
+            stats = report[tier][obj.get("StorageClass", "STANDARD")]
+            stats["objects"] += 1
+            stats["bytes"] += obj["Size"]
+    return {tier: dict(classes) for tier, classes in report.items()}
@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from botocore.exceptions import ClientError
+from app.core.config import settings
+from app.services.storage_tiering import get_object_any_tier
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {"webp": "image/webp", "png": "image/png"}
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_disk_cache_lock = threading.Lock()
+_disk_cache_written = 0  # bytes written since the cache size was last checked
+
+def thumbnail_key(article_id: int, pdf_s3_key: str, page: int, width: int, fmt: str) -> str:
+    """S3 / disk cache key for one rendered page of one version of an article's PDF.
+
+    The PDF key is part of the name, so replacing an article's PDF yields new
+    keys and immutable copies of the old pages are simply never asked for again.
+    """
+    return f"{_version_prefix(article_id, pdf_s3_key)}/p{page}-w{width}.{fmt}"
+
+def page_count_key(article_id: int, pdf_s3_key: str) -> str:
+    """Key of the stored page count of one version of an article's PDF"""
+    return f"{_version_prefix(article_id, pdf_s3_key)}/pages"
+
+def _version_prefix(article_id: int, pdf_s3_key: str) -> str:
+    version = hashlib.blake2b(pdf_s3_key.encode("utf-8"), digest_size=8).hexdigest()
+    return f"thumbnails/{article_id}/{version}"
+
+def renderer_available() -> bool:
+    try:
+        import fitz  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _encode(pixmap, fmt: str) -> Tuple[bytes, str]:
+    if fmt == "webp":
+        try:
+            from PIL import Image
+        except ImportError:
+            fmt = "png"
+        else:
+            image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+            buffer = io.BytesIO()
+            image.save(buffer, "WEBP", quality=75, method=4)
+            return buffer.getvalue(), "webp"
+    return pixmap.tobytes("png"), fmt
+
+def render_pages(pdf_bytes: bytes, pages: int, width: int, fmt: str) -> Tuple[int, List[Tuple[int, bytes, str]]]:
+    """Rasterize the first `pages` pages to `width` px wide images.
+
+    Runs inside worker processes, so it only takes and returns plain bytes.
+    Returns the PDF's page count and (1-based page number, image bytes,
+    actual format) tuples.
+    """
+    import fitz
+
+    rendered = []
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        for index in range(min(pages, doc.page_count)):
+            page = doc.load_page(index)
+            zoom = width / page.rect.width
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            data, actual_fmt = _encode(pixmap, fmt)
+            rendered.append((index + 1, data, actual_fmt))
+        page_count = doc.page_count
+    return page_count, rendered
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(max_workers=settings.THUMBNAIL_WORKERS)
+    return _executor
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+async def fetch_stored(s3_client, key: str) -> Optional[bytes]:
+    """A thumbnail from the disk cache, else from S3 (cached to disk); None if absent"""
+    data = await asyncio.to_thread(read_disk_cache, key)
+    if data is not None:
+        return data
+    try:
+        response = await asyncio.to_thread(
+            s3_client.s3.get_object, Bucket=settings.AWS_ARTICLE_QUEUE_BUCKET, Key=key
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            return None
+        raise
+    data = await asyncio.to_thread(response["Body"].read)
+    await asyncio.to_thread(write_disk_cache, key, data)
+    return data
+
+def _cache_path(key: str) -> str:
+    return os.path.join(settings.THUMBNAIL_CACHE_DIR, key)
+
+def read_disk_cache(key: str) -> Optional[bytes]:
+    path = _cache_path(key)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    try:
+        # mtime doubles as last use for eviction
+        os.utime(path)
+    except OSError:
+        pass
+    return data
+
+def write_disk_cache(key: str, data: bytes):
+    global _disk_cache_written
+    path = _cache_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write then rename so concurrent readers never see a partial file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    with _disk_cache_lock:
+        _disk_cache_written += len(data)
+        # Walking the directory is slow; only do it after a tenth of the budget was written
+        if _disk_cache_written < settings.THUMBNAIL_CACHE_MAX_BYTES // 10:
+            return
+        _disk_cache_written = 0
+    prune_disk_cache(settings.THUMBNAIL_CACHE_MAX_BYTES)
+
+def prune_disk_cache(max_bytes: int) -> int:
+    """Delete least recently used files until the cache is under 90% of `max_bytes`.
+
+    Other workers share the directory, so sizes come from the filesystem.
+    Returns the number of bytes freed.
+    """
+    files = []
+    for root, _, names in os.walk(settings.THUMBNAIL_CACHE_DIR):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            # Temp files of crashed writers count too once they are old
+            if name.endswith(".tmp") and stat.st_mtime > time.time() - 3600:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    if total <= max_bytes:
+        return 0
+    freed = 0
+    target = total - max_bytes * 9 // 10
+    for _, size, path in sorted(files):
+        if freed >= target:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        freed += size
+    logger.info(f"Pruned {freed} bytes from the thumbnail disk cache")
+    return freed
+
+def store_thumbnails(s3_client, article_id: int, pdf_s3_key: str, page_count: int,
+                     rendered, width: int) -> Dict[int, str]:
+    """Write rendered pages and the page count next to the article PDFs and to the disk cache.
+
+    The page count lets requests for pages past the end be answered without
+    downloading and parsing the PDF again.
+    """
+    count_key = page_count_key(article_id, pdf_s3_key)
+    count = str(page_count).encode()
+    s3_client.s3.put_object(
+        Bucket=settings.AWS_ARTICLE_QUEUE_BUCKET,
+        Key=count_key,
+        Body=count,
+        ContentType="text/plain",
+        CacheControl="public, max-age=31536000, immutable"
+    )
+    write_disk_cache(count_key, count)
+    keys = {}
+    for page, data, fmt in rendered:
+        key = thumbnail_key(article_id, pdf_s3_key, page, width, fmt)
+        s3_client.s3.put_object(
+            Bucket=settings.AWS_ARTICLE_QUEUE_BUCKET,
+            Key=key,
+            Body=data,
+            ContentType=CONTENT_TYPES[fmt],
+            CacheControl="public, max-age=31536000, immutable"
+        )
+        write_disk_cache(key, data)
+        keys[page] = key
+    return keys
+
+async def stored_page_count(s3_client, article_id: int, pdf_s3_key: str) -> Optional[int]:
+    """Page count recorded when the PDF's thumbnails were rendered; None if never rendered"""
+    data = await fetch_stored(s3_client, page_count_key(article_id, pdf_s3_key))
+    try:
+        return int(data) if data is not None else None
+    except ValueError:
+        return None
+
+async def render_article(s3_client, article_id: int, pdf_s3_key: str,
+                         tier: Optional[str] = None) -> Dict[int, Tuple[bytes, str]]:
+    """Render and store thumbnails for an article's first pages; page -> (bytes, format)"""
+    width = settings.THUMBNAIL_WIDTH
+    # Cold PDFs are read from the cold prefix (RestoreInProgress while archived)
+    response = await asyncio.to_thread(
+        get_object_any_tier, s3_client, settings.AWS_ARTICLE_QUEUE_BUCKET, pdf_s3_key, tier
+    )
+    pdf_bytes = await asyncio.to_thread(response["Body"].read)
+
+    loop = asyncio.get_running_loop()
+    page_count, rendered = await loop.run_in_executor(
+        get_executor(), render_pages,
+        pdf_bytes, settings.THUMBNAIL_PAGES, width, settings.THUMBNAIL_FORMAT
+    )
+    await asyncio.to_thread(store_thumbnails, s3_client, article_id, pdf_s3_key, page_count, rendered, width)
+    logger.info(f"Rendered {len(rendered)} thumbnails for article {article_id}")
+    return {page: (data, fmt) for page, data, fmt in rendered}
@@ -0,0 +1 @@
+"""Performance benchmarks for the PDF Segmenter API"""
@@ -0,0 +1,132 @@
+"""Query plans for the per-document endpoints.
+
+Runs EXPLAIN (ANALYZE, BUFFERS) for the statements behind
+GET /documents/{id}/sections, /text_chunks, the detail view's selectin
+loads and the cascade delete (rolled back), for documents spread across
+the id range. Reports execution time, buffer bytes, the scan nodes used
+and how many text_chunks partitions were touched, so index and
+partitioning changes can be checked before and after:
+
+    python -m benchmarks.bench_plans report --output before.json
+    python -m benchmarks.bench_plans compare before.json after.json
+"""
+import argparse
+import json
+import statistics
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine, delete, select, text
+
+from app.models.document import Document
+from app.models.section import Section
+from app.models.text_chunk import TextChunk
+from benchmarks.db_report import DEFAULT_DATABASE_URL, buffer_counts
+
+# Mirrors SECTION_LIST_COLUMNS / CHUNK_LIST_COLUMNS in the documents endpoints
+STATEMENTS = {
+    "sections": lambda doc: select(
+        Section.id, Section.section_type_id, Section.text, Section.page_num,
+        Section.coordinates, Section.rect, Section.source, Section.confidence
+    ).where(Section.document_id == doc),
+    "text_chunks": lambda doc: select(
+        TextChunk.id, TextChunk.chunk_text, TextChunk.chunk_metadata, TextChunk.created_at
+    ).where(TextChunk.document_id == doc).limit(10),
+    "detail_sections": lambda doc: select(Section).where(Section.document_id.in_([doc])),
+    "detail_chunks": lambda doc: select(TextChunk).where(TextChunk.document_id.in_([doc])),
+    "delete_document": lambda doc: delete(Document).where(Document.id == doc),
+}
+
+def scan_nodes(plan: dict, found: list = None) -> list:
+    found = [] if found is None else found
+    if "Relation Name" in plan:
+        found.append(f"{plan['Node Type']} on {plan['Relation Name']}")
+    for child in plan.get("Plans", []):
+        scan_nodes(child, found)
+    return found
+
+def explain(conn, statement) -> dict:
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    # Writes are rolled back; EXPLAIN ANALYZE still runs the FK cascade triggers
+    result = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")).scalar()[0]
+    conn.rollback()
+    nodes = scan_nodes(result["Plan"])
+    return {
+        "execution_ms": result["Execution Time"],
+        "trigger_ms": sum(t["Time"] for t in result.get("Triggers", [])),
+        "scans": nodes,
+        "chunk_partitions": sum(1 for n in nodes if " on text_chunks" in n),
+        **buffer_counts(result["Plan"]),
+    }
+
+def sample_documents(conn, count: int) -> list:
+    fractions = [(i + 0.5) / count for i in range(count)]
+    return conn.execute(text(
+        "SELECT percentile_disc(CAST(:fractions AS float8[])) WITHIN GROUP (ORDER BY id) FROM documents"
+    ), {"fractions": fractions}).scalar() or []
+
+def cmd_report(args):
+    engine = create_engine(args.database_url)
+    queries = {}
+    with engine.connect() as conn:
+        documents = args.document_ids or sample_documents(conn, args.documents)
+        for name, build in STATEMENTS.items():
+            runs = [explain(conn, build(doc)) for doc in documents for _ in range(args.repeat)]
+            queries[name] = {
+                "execution_ms": statistics.median(r["execution_ms"] for r in runs),
+                "trigger_ms": statistics.median(r["trigger_ms"] for r in runs),
+                "shared_hit_bytes": statistics.median(r["shared_hit_bytes"] for r in runs),
+                "shared_read_bytes": statistics.median(r["shared_read_bytes"] for r in runs),
+                "chunk_partitions": max(r["chunk_partitions"] for r in runs),
+                "scans": sorted({scan for r in runs for scan in r["scans"]}),
+            }
+    engine.dispose()
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "documents": documents,
+            "repeat": args.repeat,
+        },
+        "queries": queries,
+    }
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    print(output)
+
+def cmd_compare(args):
+    base = json.loads(Path(args.base).read_text())
+    head = json.loads(Path(args.head).read_text())
+    print(f"{'query':>16} {'metric':>18} {'base':>12} {'head':>12} {'change':>8}")
+    for name in sorted(set(base["queries"]) & set(head["queries"])):
+        b, h = base["queries"][name], head["queries"][name]
+        for metric in ("execution_ms", "trigger_ms", "shared_hit_bytes", "shared_read_bytes", "chunk_partitions"):
+            old, new = b[metric], h[metric]
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            print(f"{name:>16} {metric:>18} {old:>12.1f} {new:>12.1f} {change:>8}")
+        if b["scans"] != h["scans"]:
+            print(f"{name:>16} {'scans':>18} {', '.join(b['scans'])}")
+            print(f"{'':>16} {'':>18} -> {', '.join(h['scans'])}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    report = sub.add_parser("report", help="explain the per-document queries and print a JSON report")
+    report.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    report.add_argument("--documents", type=int, default=5, help="documents sampled across the id range")
+    report.add_argument("--document-ids", type=lambda s: [int(i) for i in s.split(",")])
+    report.add_argument("--repeat", type=int, default=3)
+    report.add_argument("--output", help="write the JSON report to this file")
+    report.set_defaults(func=cmd_report)
+
+    compare = sub.add_parser("compare", help="diff two JSON reports")
+    compare.add_argument("base")
+    compare.add_argument("head")
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
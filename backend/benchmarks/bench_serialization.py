@@ -0,0 +1,115 @@
+"""Compare the response_model serialization path with the orjson row fast path.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_serialization --rows 1000 --repeat 20
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from app.schemas.article_queue import ArticleResponse
+
+ARTICLE_KEYS = (
+    "id", "doi", "title", "authors", "journal", "publication_date",
+    "description", "status", "pdf_s3_key", "created_at", "updated_at",
+    "annotation_data"
+)
+
+def make_annotation_data(rng: random.Random, count: int) -> dict:
+    """Annotation payload shaped like the one PdfViewer saves"""
+    labels = ["Abstract", "Methods", "Results", "Discussion", "References"]
+    return {
+        "annotation_data": {
+            "annotations": [
+                {
+                    "coordinates": {
+                        "left": rng.randint(0, 300),
+                        "top": rng.randint(0, 600),
+                        "right": rng.randint(300, 600),
+                        "bottom": rng.randint(600, 800)
+                    },
+                    "page_num": rng.randint(1, 20),
+                    "section_type": rng.choice(labels),
+                    "text": " ".join("lorem" for _ in range(rng.randint(20, 120)))
+                }
+                for _ in range(count)
+            ]
+        }
+    }
+
+def make_rows(count: int, annotations: int, seed: int = 42) -> List[tuple]:
+    rng = random.Random(seed)
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        (
+            i,
+            f"10.1234/bench.{i}",
+            f"Benchmark article {i}",
+            "A. Author, B. Author",
+            "Journal of Benchmarks",
+            date(2020, 1, 1) + timedelta(days=i % 1000),
+            "Synthetic description " * 5,
+            "pending",
+            f"articles/{i}.pdf",
+            created + timedelta(minutes=i),
+            None,
+            make_annotation_data(rng, annotations)
+        )
+        for i in range(1, count + 1)
+    ]
+
+def response_model_path(rows) -> bytes:
+    """What FastAPI does for response_model=List[ArticleResponse] on ORM rows"""
+    objects = [SimpleNamespace(**dict(zip(ARTICLE_KEYS, row))) for row in rows]
+    models = [ArticleResponse.model_validate(obj, from_attributes=True) for obj in objects]
+    return json.dumps(jsonable_encoder(models)).encode("utf-8")
+
+def orjson_row_path(rows) -> bytes:
+    """The fast path used by the list endpoints: Row tuples -> dicts -> orjson"""
+    return orjson.dumps([dict(zip(ARTICLE_KEYS, row)) for row in rows])
+
+def measure(fn, rows, repeat: int) -> dict:
+    fn(rows)  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(rows)
+        timings.append(time.perf_counter() - start)
+    return {
+        "mean_ms": statistics.mean(timings) * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "body_bytes": len(body)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--annotations", type=int, default=25,
+                        help="annotations per article")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.annotations)
+    results = {
+        "rows": args.rows,
+        "annotations_per_row": args.annotations,
+        "response_model": measure(response_model_path, rows, args.repeat),
+        "orjson_rows": measure(orjson_row_path, rows, args.repeat)
+    }
+    results["speedup"] = (
+        results["response_model"]["median_ms"] / results["orjson_rows"]["median_ms"]
+    )
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Dependency-free writer for small, valid multi-page PDFs used as test corpus"""
+from typing import List, Sequence, Tuple
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 72
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def _content_stream(lines: Sequence[Tuple[float, str]]) -> bytes:
+    """Lay lines out top to bottom; a line is (font_size, text), size 0 = blank gap"""
+    ops = ["BT"]
+    y = PAGE_HEIGHT - MARGIN
+    for size, text in lines:
+        if size <= 0:
+            y -= 14
+            continue
+        y -= size * 1.4
+        if y < MARGIN:
+            break
+        font = "/F2" if size >= 13 else "/F1"
+        ops.append(f"{font} {size:g} Tf 1 0 0 1 {MARGIN} {y:.1f} Tm ({_escape(text)}) Tj")
+    ops.append("ET")
+    return "\n".join(ops).encode("latin-1", "replace")
+
+def make_pdf(pages: List[Sequence[Tuple[float, str]]]) -> bytes:
+    """Build a PDF with one page per entry of `pages`"""
+    objects = []  # object bodies, object number = index + 1
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # patched once the page tree exists
+    pages_obj = add(b"")
+    regular = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    bold = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>")
+
+    kids = []
+    for lines in pages:
+        stream = _content_stream(lines)
+        content = add(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+        kids.append(add(
+            (
+                f"<< /Type /Page /Parent {pages_obj} 0 R "
+                f"/MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 {regular} 0 R /F2 {bold} 0 R >> >> "
+                f"/Contents {content} 0 R >>"
+            ).encode()
+        ))
+
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {pages_obj} 0 R >>".encode()
+    objects[pages_obj - 1] = (
+        f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] "
+        f"/Count {len(kids)} >>"
+    ).encode()
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += (
+        b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, catalog, xref)
+    )
+    return bytes(out)
@@ -0,0 +1,31 @@
+"""Schema and reference data for the benchmark database"""
+from sqlalchemy import insert, select
+
+from app.db.base_class import Base as ArticleBase
+from app.models.base import Base
+from app.models.article_queue import ArticleQueue  # noqa: F401 - registers the table
+from app.models.document import Document  # noqa: F401
+from app.models.document_status import DocumentStatus
+from app.models.section import Section  # noqa: F401
+from app.models.section_type import SectionType
+from app.models.text_chunk import TextChunk  # noqa: F401
+
+DOCUMENT_STATUSES = ["pending", "processed", "failed"]
+SECTION_TYPES = ["Abstract", "Introduction", "Methods", "Results", "Discussion", "References"]
+
+def create_schema(engine):
+    """Create all tables for both declarative bases used by the models"""
+    Base.metadata.create_all(engine)
+    ArticleBase.metadata.create_all(engine)
+
+def seed_reference_data(engine):
+    """Insert document statuses and section types if they are missing"""
+    with engine.begin() as conn:
+        if conn.execute(select(DocumentStatus.id).limit(1)).first() is None:
+            conn.execute(insert(DocumentStatus), [
+                {"id": i, "name": name} for i, name in enumerate(DOCUMENT_STATUSES, start=1)
+            ])
+        if conn.execute(select(SectionType.id).limit(1)).first() is None:
+            conn.execute(insert(SectionType), [
+                {"id": i, "name": name} for i, name in enumerate(SECTION_TYPES, start=1)
+            ])
@@ -0,0 +1,67 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.core.s3 import shared_s3_client
+from app.services.minhash import candidate_pairs, index_articles, index_documents, numpy_available
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compute MinHash signatures for documents and list near-duplicate pairs"
+    )
+    parser.add_argument("--batch-size", type=int, default=200, help="Documents per transaction")
+    parser.add_argument("--limit", type=int, help="Stop after this many documents")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="0 hashes in this process")
+    parser.add_argument("--recompute", action="store_true", help="Recompute up-to-date signatures too")
+    parser.add_argument("--articles", action="store_true",
+                        help="Also fingerprint article_queue PDFs (requires pymupdf)")
+    parser.add_argument("--pairs", help="Write verified candidate pairs to this JSONL file")
+    parser.add_argument("--min-similarity", type=float, default=settings.MINHASH_THRESHOLD)
+    args = parser.parse_args()
+
+    if not numpy_available():
+        sys.exit("numpy is required to compute signatures")
+
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        if args.workers:
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                totals = index_documents(db, args.batch_size, args.limit, args.recompute, executor=pool)
+        else:
+            totals = index_documents(db, args.batch_size, args.limit, args.recompute)
+        totals["index_seconds"] = round(time.perf_counter() - start, 2)
+
+        if args.articles:
+            s3_client, bucket = shared_s3_client(), settings.AWS_ARTICLE_QUEUE_BUCKET
+            if args.workers:
+                with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                    totals["articles"] = index_articles(
+                        db, s3_client, bucket, limit=args.limit, recompute=args.recompute, executor=pool
+                    )
+            else:
+                totals["articles"] = index_articles(db, s3_client, bucket, limit=args.limit, recompute=args.recompute)
+
+        if args.pairs:
+            totals["pairs"] = 0
+            cursor = 0
+            with open(args.pairs, "w") as out:
+                while cursor is not None:
+                    pairs, cursor = candidate_pairs(db, args.min_similarity, 1000, cursor)
+                    for pair in pairs:
+                        out.write(json.dumps(pair) + "\n")
+                    totals["pairs"] += len(pairs)
+    finally:
+        db.close()
+    totals["seconds"] = round(time.perf_counter() - start, 2)
+    print(json.dumps(totals, indent=2))
+
+if __name__ == "__main__":
+    main()
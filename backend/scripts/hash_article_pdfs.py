@@ -0,0 +1,80 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, update
+from app.core.config import settings
+from app.core.s3 import S3Client
+from app.db.session import SessionLocal
+from app.models.article_queue import ArticleQueue
+
+READ_SIZE = 1024 * 1024
+
+def unhashed_rows(db, after_id: int, limit: int):
+    """Hot articles whose PDF has no recorded SHA-256 yet"""
+    return db.execute(
+        select(ArticleQueue.id, ArticleQueue.pdf_s3_key).where(
+            ArticleQueue.pdf_s3_key.isnot(None),
+            ArticleQueue.content_hash.is_(None),
+            ArticleQueue.storage_tier == "hot",
+            ArticleQueue.id > after_id
+        ).order_by(ArticleQueue.id).limit(limit)
+    ).all()
+
+def object_hash(s3_client: S3Client, bucket: str, key: str) -> str:
+    """SHA-256 of an object, streamed so large PDFs aren't held in memory"""
+    hasher = hashlib.sha256()
+    body = s3_client.s3.get_object(Bucket=bucket, Key=key)["Body"]
+    for chunk in body.iter_chunks(READ_SIZE):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+def main():
+    parser = argparse.ArgumentParser(description="Record the SHA-256 of article PDFs that lack one")
+    parser.add_argument("--batch-size", type=int, default=200, help="Articles per transaction")
+    parser.add_argument("--limit", type=int, help="Stop after this many articles")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent S3 downloads")
+    args = parser.parse_args()
+
+    bucket = settings.AWS_ARTICLE_QUEUE_BUCKET
+    s3_client = S3Client(bucket_name=bucket)
+    start = time.perf_counter()
+    totals = {"hashed": 0, "failed": 0}
+    after_id, remaining = 0, args.limit
+    db = SessionLocal()
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            while remaining is None or remaining > 0:
+                size = args.batch_size if remaining is None else min(args.batch_size, remaining)
+                rows = unhashed_rows(db, after_id, size)
+                if not rows:
+                    break
+                after_id = rows[-1].id
+                if remaining is not None:
+                    remaining -= len(rows)
+                futures = {row.id: pool.submit(object_hash, s3_client, bucket, row.pdf_s3_key) for row in rows}
+                for article_id, future in futures.items():
+                    try:
+                        content_hash = future.result()
+                    except Exception as e:
+                        print(f"article {article_id}: {e}", file=sys.stderr)
+                        totals["failed"] += 1
+                        continue
+                    db.execute(
+                        update(ArticleQueue).where(ArticleQueue.id == article_id).values(content_hash=content_hash)
+                    )
+                    totals["hashed"] += 1
+                db.commit()
+    finally:
+        db.close()
+    totals["seconds"] = round(time.perf_counter() - start, 2)
+    print(json.dumps(totals, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.article_import import iter_records, import_articles
+
+def main():
+    parser = argparse.ArgumentParser(description="Upsert article_queue rows from a CSV/JSONL feed")
+    parser.add_argument("path", help="Feed file, or - for stdin")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    fmt = args.format or args.path.rsplit(".", 1)[-1].lower()
+    if fmt not in ("csv", "jsonl"):
+        parser.error("Cannot infer format; pass --format csv|jsonl")
+
+    start = time.perf_counter()
+    stream = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    db = SessionLocal()
+    try:
+        counts = import_articles(db, iter_records(stream, fmt), batch_size=args.batch_size)
+    finally:
+        db.close()
+        stream.close()
+
+    elapsed = time.perf_counter() - start
+    total = counts["inserted"] + counts["updated"] + counts["skipped"]
+    counts["seconds"] = round(elapsed, 2)
+    counts["rows_per_sec"] = round(total / elapsed, 1) if elapsed else None
+    print(json.dumps(counts, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, update
+from app.core.config import settings
+from app.core.s3 import S3Client
+from app.db.session import SessionLocal
+from app.models.article_queue import ArticleQueue
+from app.models.pdf import PDF
+from app.services.pdf_optimize import optimize_pdf, store_optimized
+from app.services.storage_tiering import HOT, get_object_any_tier
+
+def pending_rows(db, table: str, limit: int, max_attempts: int):
+    """(id, source key) pairs that don't have an optimized copy yet and haven't failed too often"""
+    if table == "articles":
+        query = select(ArticleQueue.id, ArticleQueue.pdf_s3_key).where(
+            ArticleQueue.pdf_s3_key.isnot(None),
+            ArticleQueue.pdf_optimized_s3_key.is_(None),
+            ArticleQueue.pdf_optimize_attempts < max_attempts,
+            # Cold PDFs are rarely read; optimizing them isn't worth a restore
+            ArticleQueue.storage_tier == HOT
+        ).order_by(ArticleQueue.id)
+    else:
+        query = select(PDF.id, PDF.s3_key).where(
+            PDF.optimized_s3_key.is_(None),
+            PDF.optimize_attempts < max_attempts
+        ).order_by(PDF.id)
+    return db.execute(query.limit(limit)).all()
+
+def fetch(s3_client, bucket: str, table: str, key: str) -> bytes:
+    if table == "articles":
+        # Follows an article the tiering job moved after pending_rows read it
+        return get_object_any_tier(s3_client, bucket, key)["Body"].read()
+    return s3_client.s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+
+def record(db, table: str, row_id: int, size: int, key, optimized_size):
+    if table == "articles":
+        db.execute(update(ArticleQueue).where(ArticleQueue.id == row_id).values(
+            pdf_original_size=size, pdf_optimized_s3_key=key, pdf_optimized_size=optimized_size
+        ))
+    else:
+        db.execute(update(PDF).where(PDF.id == row_id).values(
+            original_size=size, optimized_s3_key=key, optimized_size=optimized_size
+        ))
+    db.commit()
+
+def record_failure(db, table: str, row_id: int):
+    """Count a failed attempt so a broken PDF stops being picked up every run"""
+    if table == "articles":
+        db.execute(update(ArticleQueue).where(ArticleQueue.id == row_id).values(
+            pdf_optimize_attempts=ArticleQueue.pdf_optimize_attempts + 1
+        ))
+    else:
+        db.execute(update(PDF).where(PDF.id == row_id).values(optimize_attempts=PDF.optimize_attempts + 1))
+    db.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description="Linearize stored PDFs and record optimized copies")
+    parser.add_argument("--table", choices=["articles", "pdfs"], default="articles")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-attempts", type=int, default=3,
+                        help="skip PDFs that failed this many times")
+    args = parser.parse_args()
+
+    bucket = settings.AWS_ARTICLE_QUEUE_BUCKET if args.table == "articles" else settings.AWS_BUCKET_NAME
+    s3_client = S3Client(bucket_name=bucket)
+    db = SessionLocal()
+    start = time.perf_counter()
+    totals = {"optimized": 0, "unchanged": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0}
+    try:
+        rows = pending_rows(db, args.table, args.limit, args.max_attempts)
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {}
+            for row_id, source_key in rows:
+                try:
+                    data = fetch(s3_client, bucket, args.table, source_key)
+                except Exception as e:
+                    # One missing or unreadable object must not abort the run
+                    print(f"{args.table} {row_id}: {e}", file=sys.stderr)
+                    totals["failed"] += 1
+                    record_failure(db, args.table, row_id)
+                    continue
+                futures[pool.submit(optimize_pdf, data)] = (row_id, source_key, data)
+                # Bound in-flight PDFs so memory doesn't grow with --limit
+                if len(futures) >= args.workers * 2:
+                    _finish(db, s3_client, bucket, args.table, futures, next(as_completed(futures)), totals)
+            for future in as_completed(list(futures)):
+                _finish(db, s3_client, bucket, args.table, futures, future, totals)
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - start
+    saved = totals["bytes_before"] - totals["bytes_after"]
+    print(f"{len(rows)} PDFs in {elapsed:.1f}s: {totals['optimized']} optimized, "
+          f"{totals['unchanged']} already optimal, {totals['failed']} failed; "
+          f"{saved / 1024 / 1024:.1f} MiB saved")
+
+def _finish(db, s3_client, bucket, table, futures, future, totals):
+    row_id, source_key, data = futures.pop(future)
+    try:
+        optimized = future.result()
+    except Exception as e:
+        print(f"{table} {row_id}: {e}", file=sys.stderr)
+        totals["failed"] += 1
+        record_failure(db, table, row_id)
+        return
+    totals["bytes_before"] += len(data)
+    if optimized is None:
+        totals["unchanged"] += 1
+        totals["bytes_after"] += len(data)
+        # The original already is the web-optimized variant
+        record(db, table, row_id, len(data), source_key, len(data))
+        return
+    key = store_optimized(s3_client, bucket, hashlib.sha256(data).hexdigest(), optimized)
+    totals["optimized"] += 1
+    totals["bytes_after"] += len(optimized)
+    record(db, table, row_id, len(data), key, len(optimized))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.promotion import promote_annotations
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Materialize completed articles' annotations into documents, sections and text chunks"
+    )
+    parser.add_argument("--batch-size", type=int, default=200, help="Articles per transaction")
+    parser.add_argument("--limit", type=int, help="Stop after this many articles")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        totals = promote_annotations(db, batch_size=args.batch_size, limit=args.limit)
+    finally:
+        db.close()
+    totals["seconds"] = round(time.perf_counter() - start, 2)
+    print(json.dumps(totals, indent=2))
+
+if __name__ == "__main__":
+    main()
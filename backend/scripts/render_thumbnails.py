@@ -0,0 +1,90 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from app.core.config import settings
+from app.core.s3 import S3Client
+from app.db.session import SessionLocal
+from app.models.article_queue import ArticleQueue
+from app.services.storage_tiering import HOT, get_object_any_tier
+from app.services.thumbnails import page_count_key, render_pages, store_thumbnails, thumbnail_key
+
+def has_thumbnails(s3_client: S3Client, article_id: int, pdf_s3_key: str) -> bool:
+    # PDFs without pages only have their page count stored
+    return any(
+        s3_client.object_exists(thumbnail_key(article_id, pdf_s3_key, 1, settings.THUMBNAIL_WIDTH, fmt))
+        for fmt in dict.fromkeys([settings.THUMBNAIL_FORMAT, "png"])
+    ) or s3_client.object_exists(page_count_key(article_id, pdf_s3_key))
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render page thumbnails for ingested articles")
+    parser.add_argument("--article-id", type=int, action="append", help="Only these articles (repeatable)")
+    parser.add_argument("--force", action="store_true", help="Re-render even if thumbnails exist")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    s3_client = S3Client(bucket_name=settings.AWS_ARTICLE_QUEUE_BUCKET)
+    db = SessionLocal()
+    try:
+        # Cold PDFs may be archived; pre-rendering must not request restores for them
+        query = select(ArticleQueue.id, ArticleQueue.pdf_s3_key).where(
+            ArticleQueue.pdf_s3_key.isnot(None), ArticleQueue.storage_tier == HOT
+        )
+        if args.article_id:
+            query = query.where(ArticleQueue.id.in_(args.article_id))
+        articles = db.execute(query.order_by(ArticleQueue.id)).all()
+    finally:
+        db.close()
+
+    start = time.perf_counter()
+    rendered_pages = failed = skipped = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {}
+        # Downloads stay in this process; workers only rasterize
+        for article in articles:
+            if not args.force and has_thumbnails(s3_client, article.id, article.pdf_s3_key):
+                skipped += 1
+                continue
+            try:
+                # Falls back to the cold copy if the tiering job moved it meanwhile
+                pdf_bytes = get_object_any_tier(
+                    s3_client, settings.AWS_ARTICLE_QUEUE_BUCKET, article.pdf_s3_key
+                )["Body"].read()
+            except Exception as e:
+                print(f"Article {article.id}: {e}", file=sys.stderr)
+                failed += 1
+                continue
+            future = pool.submit(
+                render_pages, pdf_bytes,
+                settings.THUMBNAIL_PAGES, settings.THUMBNAIL_WIDTH, settings.THUMBNAIL_FORMAT
+            )
+            futures[future] = article
+            # Bound in-flight PDFs so memory doesn't grow with the backlog
+            if len(futures) >= args.workers * 2:
+                future = next(as_completed(futures))
+                rendered_pages, failed = _collect(s3_client, futures, future, rendered_pages, failed)
+        for future in as_completed(list(futures)):
+            rendered_pages, failed = _collect(s3_client, futures, future, rendered_pages, failed)
+
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {rendered_pages} pages in {elapsed:.1f}s "
+          f"({rendered_pages / elapsed if elapsed else 0:.1f} pages/sec); "
+          f"{skipped} articles skipped, {failed} failed")
+
+def _collect(s3_client, futures, future, rendered_pages, failed):
+    article = futures.pop(future)
+    try:
+        page_count, rendered = future.result()
+    except Exception as e:
+        print(f"Article {article.id}: {e}", file=sys.stderr)
+        return rendered_pages, failed + 1
+    store_thumbnails(s3_client, article.id, article.pdf_s3_key, page_count, rendered, settings.THUMBNAIL_WIDTH)
+    return rendered_pages + len(rendered), failed
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, exists, insert, select
+from app.core.config import settings
+from app.core.s3 import S3Client, pdf_location
+from app.db.session import SessionLocal
+from app.models.document import Document
+from app.models.section import Section
+from app.services.section_types import section_types
+from app.services.storage_tiering import get_object_any_tier
+from app.services.segmentation import SECTION_TYPE_NAMES, section_rows, segment_pdf
+
+def pending_documents(db, args):
+    query = select(Document.id, Document.pdf_s3_url).where(Document.pdf_s3_url.isnot(None))
+    if args.document_id:
+        query = query.where(Document.id.in_(args.document_id))
+    elif not args.replace:
+        # Documents that already have sections (drawn or proposed) are left alone
+        query = query.where(~exists().where(Section.document_id == Document.id))
+    return db.execute(query.order_by(Document.id).limit(args.limit)).all()
+
+def main():
+    parser = argparse.ArgumentParser(description="Propose Sections for documents with heuristic segmentation")
+    parser.add_argument("--document-id", type=int, action="append", help="Only these documents (repeatable)")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--replace", action="store_true", help="Replace earlier auto proposals")
+    parser.add_argument("--batch-size", type=int, default=500, help="Section rows per insert")
+    args = parser.parse_args()
+
+    s3_client = S3Client(bucket_name=settings.AWS_BUCKET_NAME)
+    db = SessionLocal()
+    start = time.perf_counter()
+    stats = {"documents": 0, "pages": 0, "sections": 0, "failed": 0}
+    pending_rows = []
+
+    def flush():
+        if pending_rows:
+            db.execute(insert(Section), pending_rows)
+            db.commit()
+            pending_rows.clear()
+
+    try:
+        type_ids = section_types.ids(db, SECTION_TYPE_NAMES)
+        db.commit()
+        documents = pending_documents(db, args)
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {}
+
+            def finish(future):
+                document_id = futures.pop(future)
+                try:
+                    page_count, candidates = future.result()
+                except Exception as e:
+                    print(f"Document {document_id}: {e}", file=sys.stderr)
+                    stats["failed"] += 1
+                    return
+                if args.replace:
+                    db.execute(delete(Section).where(
+                        Section.document_id == document_id, Section.source == "auto"
+                    ))
+                pending_rows.extend(section_rows(document_id, candidates, type_ids))
+                stats["documents"] += 1
+                stats["pages"] += page_count
+                stats["sections"] += len(candidates)
+                if len(pending_rows) >= args.batch_size:
+                    flush()
+
+            for document_id, pdf_s3_url in documents:
+                # Promoted documents point into the article queue bucket
+                bucket, s3_key = pdf_location(pdf_s3_url, s3_client.bucket_name)
+                try:
+                    if bucket == settings.AWS_ARTICLE_QUEUE_BUCKET:
+                        # Article PDFs may have moved to the cold tier
+                        response = get_object_any_tier(s3_client, bucket, s3_key)
+                    else:
+                        response = s3_client.s3.get_object(Bucket=bucket, Key=s3_key)
+                    pdf_bytes = response["Body"].read()
+                except Exception as e:
+                    print(f"Document {document_id}: {e}", file=sys.stderr)
+                    stats["failed"] += 1
+                    continue
+                futures[pool.submit(segment_pdf, pdf_bytes)] = document_id
+                # Bound in-flight PDFs so memory doesn't grow with --limit
+                if len(futures) >= args.workers * 2:
+                    finish(next(as_completed(futures)))
+            for future in as_completed(list(futures)):
+                finish(future)
+        flush()
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Segmented {stats['documents']} documents ({stats['pages']} pages) in {elapsed:.1f}s: "
+          f"{stats['pages'] / elapsed if elapsed else 0:.1f} pages/sec, "
+          f"{stats['sections']} sections proposed, {stats['failed']} failed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.s3 import S3Client
+from app.db.session import SessionLocal
+from app.services.storage_tiering import bytes_per_tier, rehydrate_articles, tier_completed_articles
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Move PDFs of promoted articles to the cold tier and report bytes per tier"
+    )
+    parser.add_argument("--batch-size", type=int, default=100, help="Articles per transaction")
+    parser.add_argument("--limit", type=int, help="Stop after this many articles")
+    parser.add_argument("--rehydrate", type=lambda s: [int(i) for i in s.split(",")],
+                        help="Comma-separated article ids to move back to the hot tier instead")
+    parser.add_argument("--report-only", action="store_true", help="Only report bytes per tier")
+    args = parser.parse_args()
+
+    bucket = settings.AWS_ARTICLE_QUEUE_BUCKET
+    s3_client = S3Client(bucket_name=bucket)
+    start = time.perf_counter()
+    output = {}
+    db = SessionLocal()
+    try:
+        if args.rehydrate:
+            output["rehydrated"] = rehydrate_articles(db, s3_client, bucket, args.rehydrate)
+        elif not args.report_only:
+            output["tiered"] = tier_completed_articles(db, s3_client, bucket, args.batch_size, args.limit)
+    finally:
+        db.close()
+    output["tiers"] = bytes_per_tier(s3_client, bucket)
+    output["seconds"] = round(time.perf_counter() - start, 2)
+    print(json.dumps(output, indent=2))
+
+if __name__ == "__main__":
+    main()
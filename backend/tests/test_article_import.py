@@ -0,0 +1,43 @@
+import io
+
+from app.core.s3 import content_hash_from_key, pdf_location
+from app.services.article_import import iter_records, normalize
+
+SHA = "ab" * 32
+
+
+def test_normalize_cleans_and_validates():
+    row = normalize({"doi": " 10.1/x ", "title": "T", "publication_date": "2024-05-06T00:00:00", "extra": 1})
+    assert row["doi"] == "10.1/x"
+    assert str(row["publication_date"]) == "2024-05-06"
+    assert "extra" not in row
+    assert normalize({"doi": "10.1/x"}) is None
+    assert normalize(None) is None
+
+
+def test_normalize_takes_content_hash_from_feed_or_key():
+    assert normalize({"doi": "d", "title": "t", "content_hash": SHA.upper()})["content_hash"] == SHA
+    assert normalize({"doi": "d", "title": "t", "pdf_s3_key": f"pdfs/{SHA}.pdf"})["content_hash"] == SHA
+    assert normalize({"doi": "d", "title": "t", "pdf_s3_key": "feeds/1.pdf"})["content_hash"] is None
+    assert normalize({"doi": "d", "title": "t", "content_hash": "not-a-hash"})["content_hash"] is None
+
+
+def test_iter_records_jsonl_and_csv():
+    jsonl = io.BytesIO(b'{"doi": "a", "title": "A"}\n\nnot json\n[1]\n')
+    assert list(iter_records(jsonl, "jsonl")) == [{"doi": "a", "title": "A"}, None, None]
+    csv_feed = io.BytesIO("\ufeffdoi,title\nb,B\n".encode("utf-8"))
+    assert list(iter_records(csv_feed, "csv")) == [{"doi": "b", "title": "B"}]
+
+
+def test_content_hash_from_key():
+    assert content_hash_from_key(f"pdfs/{SHA}.pdf") == SHA
+    assert content_hash_from_key(f"{SHA}.pdf") == SHA
+    assert content_hash_from_key(f"pdfs/x{SHA}.pdf") is None
+    assert content_hash_from_key(None) is None
+
+
+def test_pdf_location():
+    assert pdf_location("pdfs/a.pdf", "docs") == ("docs", "pdfs/a.pdf")
+    assert pdf_location("s3://articles/pdfs/a.pdf", "docs") == ("articles", "pdfs/a.pdf")
+    assert pdf_location("https://s3.amazonaws.com/docs/pdfs/a%20b.pdf", "docs") == ("docs", "pdfs/a b.pdf")
+    assert pdf_location("https://docs.s3.amazonaws.com/pdfs/a.pdf", "docs") == ("docs", "pdfs/a.pdf")
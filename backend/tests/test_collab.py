@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+from app.core.config import settings
+from app.services import collab
+from app.services.collab import Room, RoomRegistry
+
+
+def test_upsert_keeps_fields_the_client_did_not_send(monkeypatch):
+    monkeypatch.setattr(collab, "_save_annotations", lambda article_id, data: None)
+
+    async def run():
+        room = Room(1, [{"id": "r1", "text": "old", "page_num": 1, "reviewer": "ann"}])
+        result = room.apply({"op": "upsert", "id": "r1", "base_seq": 0, "annotation": {"text": "new"}})
+        await room.flush()
+        return result
+
+    result = asyncio.run(run())
+    assert result["type"] == "op"
+    assert result["annotation"] == {
+        "id": "r1", "text": "new", "page_num": 1, "reviewer": "ann",
+        "coordinates": None, "section_type": None
+    }
+
+
+def test_stale_edit_is_rejected(monkeypatch):
+    monkeypatch.setattr(collab, "_save_annotations", lambda article_id, data: None)
+
+    async def run():
+        room = Room(1, [{"id": "r1", "text": "a"}])
+        room.apply({"op": "upsert", "id": "r1", "base_seq": 0, "annotation": {"text": "b"}})
+        result = room.apply({"op": "upsert", "id": "r1", "base_seq": 0, "annotation": {"text": "c"}})
+        await room.flush()
+        return result
+
+    assert asyncio.run(run())["type"] == "reject"
+
+
+def test_join_after_leave_sees_the_flushed_state(monkeypatch):
+    stored = {"annotations": [{"id": "r1", "text": "a"}]}
+
+    def save(article_id, data):
+        # A slow write widens the window a join could slip into
+        time.sleep(0.05)
+        stored.update(data)
+
+    monkeypatch.setattr(collab, "_save_annotations", save)
+    monkeypatch.setattr(collab, "_load_annotations", lambda article_id: list(stored["annotations"]))
+
+    async def run():
+        registry = RoomRegistry()
+        room = await registry.join(1, "first")
+        room.apply({"op": "upsert", "id": "r1", "base_seq": 0, "annotation": {"text": "b"}})
+        leaving = asyncio.create_task(registry.leave(room, "first"))
+        await asyncio.sleep(0)
+        rejoined = await registry.join(1, "second")
+        await leaving
+        return rejoined
+
+    rejoined = asyncio.run(run())
+    assert rejoined.annotations["r1"]["text"] == "b"
+
+
+def test_collab_needs_a_single_worker(monkeypatch):
+    monkeypatch.setattr(settings, "COLLAB_ENABLED", True)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 1)
+    assert collab.collab_available()
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    assert not collab.collab_available()
+
+
+def test_consecutive_ops_from_one_client_before_the_ack(monkeypatch):
+    monkeypatch.setattr(collab, "_save_annotations", lambda article_id, data: None)
+
+    async def run():
+        room = Room(1, [{"id": "r1", "text": "a"}])
+        # A drag: both ops are based on the snapshot, the echo of the first hasn't arrived
+        first = room.apply({"op": "upsert", "id": "r1", "base_seq": 0, "annotation": {"text": "b"}}, "dragger")
+        second = room.apply({"op": "upsert", "id": "r1", "base_seq": 0, "annotation": {"text": "c"}}, "dragger")
+        other = room.apply({"op": "upsert", "id": "r1", "base_seq": 0, "annotation": {"text": "x"}}, "other")
+        await room.flush()
+        return first, second, other, room
+
+    first, second, other, room = asyncio.run(run())
+    assert (first["type"], second["type"], other["type"]) == ("op", "op", "reject")
+    assert room.annotations["r1"]["text"] == "c"
+
+
+def test_room_is_released_once_the_retried_flush_succeeds(monkeypatch):
+    attempts = []
+
+    def save(article_id, data):
+        attempts.append(data)
+        if len(attempts) == 1:
+            raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(collab, "_save_annotations", save)
+    monkeypatch.setattr(collab, "_load_annotations", lambda article_id: [{"id": "r1", "text": "a"}])
+    monkeypatch.setattr(settings, "COLLAB_FLUSH_MS", 10)
+
+    async def run():
+        registry = RoomRegistry()
+        room = await registry.join(1, "only")
+        room.apply({"op": "upsert", "id": "r1", "base_seq": 0, "annotation": {"text": "b"}}, "only")
+        await registry.leave(room, "only")
+        kept = registry.get(1) is room
+        await asyncio.sleep(0.1)
+        return kept, registry.get(1)
+
+    kept, after_retry = asyncio.run(run())
+    assert kept
+    assert after_retry is None
+    assert len(attempts) == 2
@@ -0,0 +1,71 @@
+import pytest
+
+from app.core.config import Settings
+from app.db import types
+from app.db.types import RAW, ZSTD, CompressedText
+
+REQUIRED = {
+    "SECRET_KEY": "test-secret",
+    "ADMIN_EMAIL": "admin@example.com",
+    "DATABASE_URL": "postgresql://localhost/test",
+    "OPENAI_API_KEY": "test-openai-key",
+}
+
+
+@pytest.fixture
+def compression(monkeypatch):
+    def use(mode, min_bytes=16):
+        monkeypatch.setattr(types, "_compression", (mode, min_bytes, 3))
+        monkeypatch.setattr(types, "_compressor", None)
+        monkeypatch.setattr(types, "_decompressor", None)
+    return use
+
+
+def round_trip(value):
+    column = CompressedText()
+    stored = column.process_bind_param(value, None)
+    return stored, column.process_result_value(stored, None)
+
+
+def test_raw_values_round_trip(compression):
+    compression("none")
+    stored, value = round_trip("Größe ✓ " * 100)
+    assert stored[:1] == RAW
+    assert value == "Größe ✓ " * 100
+    assert round_trip(None) == (None, None)
+
+
+def test_small_values_stay_raw(compression):
+    pytest.importorskip("zstandard")
+    compression("zstd", min_bytes=1024)
+    stored, value = round_trip("short text")
+    assert stored[:1] == RAW and value == "short text"
+
+
+def test_zstd_values_round_trip(compression):
+    pytest.importorskip("zstandard")
+    compression("zstd")
+    text = "repeated chunk text " * 200
+    stored, value = round_trip(text)
+    assert stored[:1] == ZSTD and len(stored) < len(text)
+    assert value == text
+
+
+def test_raw_rows_read_after_enabling_zstd(compression):
+    compression("none")
+    stored, _ = round_trip("written before compression was enabled")
+    compression("zstd")
+    assert CompressedText().process_result_value(memoryview(stored), None) == (
+        "written before compression was enabled"
+    )
+
+
+def test_unknown_compression_is_rejected():
+    with pytest.raises(ValueError, match="TEXT_COMPRESSION"):
+        Settings(**REQUIRED, TEXT_COMPRESSION="brotli")
+
+
+def test_zstd_requires_zstandard(monkeypatch):
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+    with pytest.raises(ValueError, match="zstandard"):
+        Settings(**REQUIRED, TEXT_COMPRESSION="zstd")
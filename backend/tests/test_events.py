@@ -0,0 +1,27 @@
+from app.core.cache import response_cache
+from app.core.events import RESYNC, EventBroker
+
+
+def test_publish_filters_and_invalidates():
+    broker = EventBroker()
+    articles = broker.subscribe(tables={"article"})
+    documents = broker.subscribe(tables={"document"})
+    response_cache.set("article", 5, b"{}")
+
+    broker.publish({"table": "article", "op": "update", "id": 5, "status": "completed", "version": 1})
+
+    assert response_cache.get("article", 5) is None
+    assert articles.queue.get_nowait()["id"] == 5
+    assert documents.queue.empty()
+
+
+def test_resync_clears_the_cache_and_notifies_every_subscriber():
+    broker = EventBroker()
+    first, second = broker.subscribe(), broker.subscribe(ids={9})
+    response_cache.set("document", 1, b"{}")
+
+    broker.resync()
+
+    assert response_cache.get("document", 1) is None
+    assert first.queue.get_nowait() is RESYNC
+    assert second.queue.get_nowait() is RESYNC
@@ -0,0 +1,49 @@
+import hashlib
+
+import boto3
+
+from benchmarks.generate_corpus import CorpusGenerator, build_parser, document_pdf, stored_text, upload_pdfs
+
+
+def _args(*argv):
+    return build_parser().parse_args(["--database-url", "postgresql://unused", *argv])
+
+
+class FakeS3:
+    def __init__(self):
+        self.keys = []
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        assert Body.startswith(b"%PDF")
+        self.keys.append(Key)
+
+
+def test_rows_are_deterministic():
+    args = _args("--documents", "3", "--articles", "3", "--embedding-dim", "0")
+    first = list(CorpusGenerator(args).article_rows(1))
+    second = list(CorpusGenerator(args).article_rows(1))
+    assert first == second
+
+
+def test_every_article_pdf_is_uploaded(monkeypatch):
+    fake = FakeS3()
+    monkeypatch.setattr(boto3, "client", lambda *a, **kw: fake)
+    args = _args("--documents", "2", "--articles", "5", "--bucket", "bench", "--upload-workers", "2")
+    generator = CorpusGenerator(args)
+
+    report = upload_pdfs(generator, args)
+
+    article_keys = {row[8] for row in generator.article_rows(1) if row[8]}
+    assert len(article_keys) == 5
+    assert set(fake.keys) == article_keys
+    assert report["objects"] == 5
+
+
+def test_article_rows_carry_the_pdf_hash():
+    args = _args("--documents", "2", "--articles", "3", "--pdf-fraction", "1")
+    for index, row in enumerate(CorpusGenerator(args).article_rows(1)):
+        assert row[9] == hashlib.sha256(document_pdf(args.seed, index)).hexdigest()
+
+
+def test_stored_text_has_raw_header():
+    assert stored_text("ab") == "\\x006162"
@@ -0,0 +1,31 @@
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.db.lookups import article_id_by_content_hash, article_pdf_keys, get_by_id
+from app.models.article_queue import ArticleQueue
+
+
+def article_engine():
+    engine = create_engine("sqlite://")
+    ArticleQueue.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(ArticleQueue), [
+            {"id": 1, "doi": "10.1/a", "pdf_s3_key": "pdfs/a.pdf", "content_hash": "f" * 64},
+            {"id": 2, "doi": "10.1/b", "pdf_s3_key": "pdfs/b.pdf", "content_hash": "f" * 64},
+        ])
+    return engine
+
+
+def test_get_by_id_binds_each_call():
+    with Session(article_engine()) as db:
+        assert get_by_id(db, ArticleQueue, 1).doi == "10.1/a"
+        assert get_by_id(db, ArticleQueue, 2).doi == "10.1/b"
+        assert get_by_id(db, ArticleQueue, 3) is None
+
+
+def test_key_lookups():
+    with Session(article_engine()) as db:
+        assert article_pdf_keys(db, 2).pdf_s3_key == "pdfs/b.pdf"
+        assert article_pdf_keys(db, 3) is None
+        assert article_id_by_content_hash(db, "f" * 64) == 1
+        assert article_id_by_content_hash(db, "0" * 64) is None
@@ -0,0 +1,58 @@
+import asyncio
+
+from fastapi import FastAPI
+
+from app.core.metrics import Histogram, MetricsRegistry
+from app.core.middleware import MetricsMiddleware, route_label
+
+
+def _request(app, path):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [],
+        "server": ("testserver", 80), "client": ("127.0.0.1", 50000),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return messages[0]["status"]
+
+
+def test_route_label_without_route():
+    assert route_label({}) == "unmatched"
+
+
+def test_requests_are_labelled_by_route_template():
+    registry = MetricsRegistry()
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    assert _request(app, "/items/1") == 200
+    assert _request(app, "/items/2") == 200
+    assert _request(app, "/missing") == 404
+
+    text = registry.render()
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="2xx"} 2' in text
+    assert 'http_requests_total{method="GET",route="unmatched",status="4xx"} 1' in text
+    assert "http_requests_in_flight 0" in text
+
+
+def test_histogram_quantiles():
+    histogram = Histogram((1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+    assert histogram.count == 4
+    assert histogram.counts == [1, 2, 1, 0]
+    assert 1.0 <= histogram.quantile(0.5) <= 2.0
+    assert Histogram().quantile(0.5) == 0.0
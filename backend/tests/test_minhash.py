@@ -0,0 +1,70 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.services.minhash import band_buckets, compute, similarity
+
+TEXT = (
+    "Deep learning models for protein structure prediction have improved rapidly, "
+    "and the accuracy of predicted structures now rivals experimental methods for many "
+    "families of proteins that were previously considered intractable by physics based approaches"
+)
+
+
+def test_signatures_are_deterministic_and_sized():
+    sig, shingles = compute(TEXT, num_perm=128, words=5)
+    assert len(sig) == 128 * 4
+    assert shingles == len(TEXT.split()) - 4
+    assert compute(TEXT, num_perm=128, words=5) == (sig, shingles)
+
+
+def test_similarity_tracks_overlap():
+    sig, _ = compute(TEXT, 128, 5)
+    near, _ = compute(TEXT + " in recent benchmarks", 128, 5)
+    unrelated, _ = compute("Municipal water pricing and household demand in arid regions over two decades", 128, 5)
+    assert similarity(sig, sig) == 1.0
+    assert similarity(sig, near) > 0.7
+    assert similarity(sig, unrelated) < 0.2
+    # Case and punctuation don't change the shingles
+    assert similarity(sig, compute(TEXT.upper().replace(",", ";"), 128, 5)[0]) == 1.0
+
+
+def test_similarity_of_mismatched_or_empty_signatures():
+    sig, _ = compute(TEXT, 128, 5)
+    assert similarity(sig, compute(TEXT, 64, 5)[0]) == 0.0
+    assert similarity(b"", b"") == 0.0
+    assert compute("", 128, 5)[1] == 0
+
+
+def test_identical_text_shares_every_band():
+    import numpy as np
+
+    sig = np.frombuffer(compute(TEXT, 128, 5)[0], dtype="<u4")
+    assert band_buckets(sig, 16) == band_buckets(sig.copy(), 16)
+    assert len(band_buckets(sig, 16)) == 16
+
+
+def test_stale_articles_follow_the_pdf_key():
+    from sqlalchemy import create_engine, insert
+    from app.models.article_queue import ArticleQueue
+    from app.models.article_signature import ArticleSignature
+    from app.services.minhash import stale_articles_query
+
+    engine = create_engine("sqlite://")
+    ArticleQueue.__table__.create(engine)
+    ArticleSignature.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(ArticleQueue), [
+            {"id": 1, "doi": "10.1/new", "pdf_s3_key": "pdfs/a.pdf"},
+            {"id": 2, "doi": "10.1/signed", "pdf_s3_key": "pdfs/b.pdf"},
+            {"id": 3, "doi": "10.1/replaced", "pdf_s3_key": "pdfs/c2.pdf"},
+            {"id": 4, "doi": "10.1/no-pdf", "pdf_s3_key": None},
+        ])
+        conn.execute(insert(ArticleSignature), [
+            {"article_id": 2, "pdf_s3_key": "pdfs/b.pdf", "signature": b"", "num_perm": 128, "shingle_count": 0},
+            {"article_id": 3, "pdf_s3_key": "pdfs/c1.pdf", "signature": b"", "num_perm": 128, "shingle_count": 0},
+        ])
+        stale = conn.execute(stale_articles_query(0, 10)).all()
+        everything = conn.execute(stale_articles_query(0, 10, recompute=True)).all()
+    assert [(row.id, row.pdf_s3_key) for row in stale] == [(1, "pdfs/a.pdf"), (3, "pdfs/c2.pdf")]
+    assert [row.id for row in everything] == [1, 2, 3]
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+
+from app.api.v1.endpoints import s3 as s3_endpoints
+
+
+class FakeBody:
+    def __init__(self, data):
+        self.data = data
+
+    def iter_chunks(self):
+        yield self.data
+
+
+class FakeS3:
+    class exceptions:
+        class NoSuchKey(ClientError):
+            def __init__(self):
+                super().__init__({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.calls = []
+
+    def get_object(self, Bucket, Key, Range=None):
+        self.calls.append((Key, Range))
+        if Key not in self.objects:
+            raise self.exceptions.NoSuchKey()
+        data = self.objects[Key]
+        if Range is None:
+            return {"Body": FakeBody(data), "ContentLength": len(data)}
+        start, end = (int(i) for i in Range[len("bytes="):].split("-"))
+        if start >= len(data):
+            raise ClientError({"Error": {"Code": "InvalidRange"}}, "GetObject")
+        end = min(end, len(data) - 1)
+        return {
+            "Body": FakeBody(data[start:end + 1]),
+            "ContentLength": end - start + 1,
+            "ContentRange": f"bytes {start}-{end}/{len(data)}",
+        }
+
+
+class FakeClient:
+    def __init__(self, objects):
+        self.s3 = FakeS3(objects)
+
+
+def test_full_read_advertises_ranges():
+    client = FakeClient({"pdfs/a.pdf": b"%PDF-1.7 body"})
+    response = asyncio.run(s3_endpoints.get_pdf_by_key("pdfs/a.pdf", byte_range=None, s3_client=client))
+    assert response.status_code == 200
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-length"] == "13"
+
+
+def test_range_is_forwarded_and_returns_206():
+    client = FakeClient({"pdfs/a.pdf": b"%PDF-1.7 body"})
+    response = asyncio.run(s3_endpoints.get_pdf_by_key("pdfs/a.pdf", byte_range="bytes=0-3", s3_client=client))
+    assert client.s3.calls == [("pdfs/a.pdf", "bytes=0-3")]
+    assert response.status_code == 206
+    assert response.headers["content-range"] == "bytes 0-3/13"
+    assert response.headers["content-length"] == "4"
+
+
+def test_unsatisfiable_range_is_416():
+    client = FakeClient({"pdfs/a.pdf": b"%PDF"})
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(s3_endpoints.get_pdf_by_key("pdfs/a.pdf", byte_range="bytes=100-200", s3_client=client))
+    assert error.value.status_code == 416
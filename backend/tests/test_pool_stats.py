@@ -0,0 +1,47 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.pool_stats import InstrumentedQueuePool, PoolMetrics
+
+
+def instrumented_engine(tmp_path, **pool_args):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, **pool_args)
+    metrics = PoolMetrics()
+    metrics.instrument(engine, "primary", pool_args.get("max_overflow", 10))
+    return engine, metrics.pools["primary"]
+
+
+def test_checkouts_are_counted_across_threads(tmp_path):
+    engine, stats = instrumented_engine(tmp_path, pool_size=2, max_overflow=2)
+
+    def work():
+        for _ in range(50):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = stats.snapshot()
+    assert snapshot["checkouts"] == 200
+    assert snapshot["max_overflow"] == 2
+    assert 1 <= snapshot["peak_checked_out"] <= 4
+    assert stats.wait.count == 200
+    engine.dispose()
+
+
+def test_checkout_timeouts_are_counted(tmp_path):
+    engine, stats = instrumented_engine(tmp_path, pool_size=1, max_overflow=0, pool_timeout=0.01)
+    held = engine.connect()
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    held.close()
+    assert stats.timeouts == 1
+    assert stats.snapshot()["recommendation"]["action"] == "increase"
+    engine.dispose()
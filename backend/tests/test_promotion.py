@@ -0,0 +1,39 @@
+import pytest
+
+from app.core.config import settings
+from app.core.s3 import pdf_location
+from app.services.promotion import article_pdf_url
+
+
+def test_promoted_pdf_url_points_at_the_article_bucket(monkeypatch):
+    monkeypatch.setattr(settings, "AWS_ARTICLE_QUEUE_BUCKET", "article-queue")
+    monkeypatch.setattr(settings, "AWS_BUCKET_NAME", "documents")
+    url = article_pdf_url("pdfs/10.1000/abc.pdf")
+    assert url == "s3://article-queue/pdfs/10.1000/abc.pdf"
+    assert pdf_location(url) == ("article-queue", "pdfs/10.1000/abc.pdf")
+    assert article_pdf_url(None) is None
+
+
+def test_promoted_pdf_url_needs_the_article_bucket(monkeypatch):
+    monkeypatch.setattr(settings, "AWS_ARTICLE_QUEUE_BUCKET", None)
+    with pytest.raises(ValueError):
+        article_pdf_url("pdfs/10.1000/abc.pdf")
+    assert article_pdf_url(None) is None
+
+
+def test_pending_articles_follow_the_change_version():
+    from sqlalchemy import create_engine, insert
+    from app.models.article_queue import ArticleQueue
+    from app.services.promotion import pending_articles_query
+
+    engine = create_engine("sqlite://")
+    ArticleQueue.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(ArticleQueue), [
+            {"id": 1, "doi": "10.1/new", "status": "completed", "change_version": 0, "promoted_version": None},
+            {"id": 2, "doi": "10.1/promoted", "status": "completed", "change_version": 3, "promoted_version": 3},
+            {"id": 3, "doi": "10.1/edited", "status": "completed", "change_version": 4, "promoted_version": 3},
+            {"id": 4, "doi": "10.1/pending", "status": "pending", "change_version": 0, "promoted_version": None},
+        ])
+        rows = conn.execute(pending_articles_query(0, 10)).all()
+    assert [(row.id, row.change_version) for row in rows] == [(1, 0), (3, 4)]
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+
+from sqlalchemy import create_engine, text
+
+from app.core import query_stats
+from app.core.config import settings
+from app.core.middleware import QueryStatsMiddleware
+
+
+def _engine(monkeypatch):
+    monkeypatch.setattr(settings, "SQL_INSTRUMENTATION_ENABLED", True)
+    return query_stats.instrument_engine(create_engine("sqlite://"))
+
+
+def _call(middleware, path="/api/v1/articles"):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "headers": []}
+    asyncio.run(middleware(scope, None, send))
+    return {name.decode().lower(): value.decode() for name, value in messages[0]["headers"]}
+
+
+def _app(engine, queries):
+    async def app(scope, receive, send):
+        with engine.connect() as conn:
+            for statement in queries:
+                conn.execute(text(statement))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+    return app
+
+
+def test_db_headers_only_in_debug(monkeypatch):
+    engine = _engine(monkeypatch)
+    middleware = QueryStatsMiddleware(_app(engine, ["SELECT 1", "SELECT 2"]))
+
+    monkeypatch.setattr(settings, "DEBUG", True)
+    headers = _call(middleware)
+    assert headers["x-db-query-count"] == "2"
+    assert float(headers["x-db-query-time-ms"]) >= 0
+    assert headers["x-db-repeated-queries"] == "0"
+
+    monkeypatch.setattr(settings, "DEBUG", False)
+    assert not any(name.startswith("x-db-") for name in _call(middleware))
+
+
+def test_repeated_statement_logs_a_possible_n_plus_one(monkeypatch, caplog):
+    engine = _engine(monkeypatch)
+    monkeypatch.setattr(settings, "DEBUG", True)
+    monkeypatch.setattr(settings, "SQL_REPEATED_QUERY_THRESHOLD", 3)
+    middleware = QueryStatsMiddleware(_app(engine, ["SELECT 1"] * 4 + ["SELECT 2"]))
+
+    with caplog.at_level(logging.WARNING, logger="app.core.query_stats"):
+        headers = _call(middleware, "/api/v1/n-plus-one")
+    assert headers["x-db-query-count"] == "5"
+    assert headers["x-db-repeated-queries"] == "1"
+    assert any("Possible N+1" in r.message and "4x SELECT 1" in r.message for r in caplog.records)
+    assert query_stats.db_metrics.route("GET", "unmatched").repeated >= 1
+
+
+def test_queries_outside_a_request_are_not_attributed(monkeypatch):
+    engine = _engine(monkeypatch)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert query_stats.current_stats() is None
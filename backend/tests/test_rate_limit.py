@@ -0,0 +1,121 @@
+import asyncio
+
+from app.core.config import settings
+from app.core.rate_limit import AdmissionControlMiddleware, InMemoryBackend, client_key, is_light
+
+
+def _scope(path="/api/v1/documents/", method="GET", headers=(), client=("10.0.0.1", 1234)):
+    return {"type": "http", "method": method, "path": path, "headers": list(headers), "client": client}
+
+
+def _api_key_header(value):
+    return (settings.API_KEY_NAME.lower().encode(), value.encode())
+
+
+def test_client_key_uses_a_valid_api_key():
+    key = client_key(_scope(headers=[_api_key_header(settings.API_KEY)]))
+    assert key.startswith("key:")
+    assert settings.API_KEY not in key
+
+
+def test_client_key_ignores_unknown_api_keys():
+    for value in ("random-1", "random-2"):
+        assert client_key(_scope(headers=[_api_key_header(value)])) == "ip:10.0.0.1"
+    assert client_key(_scope(client=None)) == "ip:unknown"
+
+
+def test_light_routes():
+    assert is_light(_scope("/api/v1/thumbnails/12/1"))
+    assert is_light(_scope("/api/v1/article-queue/12"))
+    assert not is_light(_scope("/api/v1/article-queue/12", method="PUT"))
+    assert is_light(_scope("/api/v1/article-queue"))
+    assert is_light(_scope("/api/v1/article-queue/"))
+    assert not is_light(_scope("/api/v1/article-queue/", method="POST"))
+    assert not is_light(_scope("/api/v1/documents/12"))
+
+
+def test_in_memory_token_bucket():
+    backend = InMemoryBackend()
+
+    async def take():
+        return await backend.take_token("ip:1", rate=1.0, capacity=2)
+
+    assert asyncio.run(take())[0]
+    assert asyncio.run(take())[0]
+    allowed, retry_after = asyncio.run(take())
+    assert not allowed
+    assert 0 < retry_after <= 1
+
+
+def test_in_memory_slots():
+    backend = InMemoryBackend()
+
+    async def run():
+        assert await backend.acquire_slot("pdf_stream", 1)
+        assert not await backend.acquire_slot("pdf_stream", 1)
+        await backend.release_slot("pdf_stream")
+        assert await backend.acquire_slot("pdf_stream", 1)
+
+    asyncio.run(run())
+
+
+def test_middleware_limits_per_client_and_budget(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_MINUTE", 2)
+    monkeypatch.setattr(settings, "RATE_LIMIT_BURST", 0)
+    monkeypatch.setattr(settings, "RATE_LIMIT_LIGHT_PER_MINUTE", 5)
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = AdmissionControlMiddleware(app, backend=InMemoryBackend())
+
+    def status(scope):
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(middleware(scope, None, send))
+        return messages[0]["status"]
+
+    assert [status(_scope()) for _ in range(3)] == [200, 200, 429]
+    # A made-up key does not escape the caller's bucket
+    assert status(_scope(headers=[_api_key_header("made-up")])) == 429
+    # Thumbnails have their own budget
+    assert [status(_scope("/api/v1/thumbnails/1/1")) for _ in range(5)] == [200] * 5
+    assert status(_scope(client=("10.0.0.2", 1))) == 200
+
+
+def test_ranged_pdf_reads_skip_the_token_bucket(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_MINUTE", 2)
+    monkeypatch.setattr(settings, "RATE_LIMIT_BURST", 0)
+    monkeypatch.setattr(settings, "CONCURRENCY_LIMIT_PDF_STREAM", 4)
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 206, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = AdmissionControlMiddleware(app, backend=InMemoryBackend())
+
+    async def burst():
+        statuses = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+
+        # pdf.js fetching one large PDF in chunks
+        for start in range(0, 200 * 65536, 65536):
+            scope = _scope("/api/v1/s3/get-pdf-by-key/pdfs/a.pdf",
+                           headers=[(b"range", f"bytes={start}-{start + 65535}".encode())])
+            await middleware(scope, None, send)
+        await middleware(_scope(), None, send)
+        await middleware(_scope(), None, send)
+        await middleware(_scope(), None, send)
+        return statuses
+
+    statuses = asyncio.run(burst())
+    assert statuses[:200] == [206] * 200
+    # Other endpoints still have their budget
+    assert statuses[200:] == [206, 206, 429]
@@ -0,0 +1,79 @@
+from app.core import cache
+from app.core.cache import CachedResponse, ResponseCache
+
+
+def test_set_and_get_variants():
+    rc = ResponseCache(max_entries=10)
+    rc.set("document", 1, b"{}")
+    rc.set("document", 1, b"[]", variant="sections")
+    assert rc.get("document", 1).body == b"{}"
+    assert rc.get("document", 1, "sections").body == b"[]"
+    assert rc.get("document", 2) is None
+
+
+def test_invalidate_drops_every_variant():
+    rc = ResponseCache(max_entries=10)
+    rc.set("document", 1, b"{}")
+    rc.set("document", 1, b"[]", variant="sections")
+    rc.invalidate("document", 1)
+    assert rc.get("document", 1) is None
+    assert rc.get("document", 1, "sections") is None
+
+
+def test_set_after_invalidation_with_old_version_is_ignored():
+    rc = ResponseCache(max_entries=10)
+    version = rc.version("article", 7)
+    rc.invalidate("article", 7)
+    rc.set("article", 7, b"stale", version=version)
+    assert rc.get("article", 7) is None
+    rc.set("article", 7, b"fresh", version=rc.version("article", 7))
+    assert rc.get("article", 7).body == b"fresh"
+
+
+def test_lru_eviction():
+    rc = ResponseCache(max_entries=2)
+    rc.set("document", 1, b"1")
+    rc.set("document", 2, b"2")
+    rc.get("document", 1)
+    rc.set("document", 3, b"3")
+    assert rc.get("document", 2) is None
+    assert rc.get("document", 1) is not None
+    assert rc.get("document", 3) is not None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    rc = ResponseCache(max_entries=10, ttl=30)
+    rc.set("document", 1, b"{}")
+    now[0] += 29
+    assert rc.get("document", 1) is not None
+    now[0] += 2
+    assert rc.get("document", 1) is None
+
+
+def test_disabled_cache_stores_nothing():
+    rc = ResponseCache(enabled=False)
+    entry = rc.set("document", 1, b"{}")
+    assert entry.body == b"{}"
+    assert rc.get("document", 1) is None
+
+
+def test_etag_matching():
+    entry = CachedResponse(b'{"a":1}')
+    assert entry.matches(entry.etag)
+    assert entry.matches(f"W/{entry.etag}")
+    assert entry.matches(f'"other", {entry.etag}')
+    assert entry.matches("*")
+    assert not entry.matches('"other"')
+    assert not entry.matches(None)
+
+
+def test_clear_rejects_reads_started_before_it():
+    rc = ResponseCache(max_entries=10)
+    rc.set("document", 1, b"{}")
+    version = rc.version("document", 2)
+    rc.clear()
+    assert rc.get("document", 1) is None
+    rc.set("document", 2, b"stale", version=version)
+    assert rc.get("document", 2) is None
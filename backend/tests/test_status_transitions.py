@@ -0,0 +1,58 @@
+import pytest
+
+from app.services.status_transitions import (
+    ARTICLE_TRANSITIONS,
+    DOCUMENT_TRANSITIONS,
+    TransitionError,
+    sources_for,
+)
+
+
+def test_all_allowed_sources_by_default():
+    assert sources_for(DOCUMENT_TRANSITIONS, "pending", None) == ["failed", "processed"]
+    assert sources_for(ARTICLE_TRANSITIONS, "completed", []) == ["pending", "processing"]
+
+
+def test_requested_sources_are_validated_and_deduplicated():
+    assert sources_for(ARTICLE_TRANSITIONS, "failed", ["processing", "pending", "processing"]) == [
+        "pending", "processing"
+    ]
+
+
+def test_disallowed_source_is_rejected():
+    with pytest.raises(TransitionError, match="Cannot move completed to 'processing'"):
+        sources_for(ARTICLE_TRANSITIONS, "processing", ["pending", "completed"])
+
+
+def test_unknown_target_is_rejected():
+    with pytest.raises(TransitionError, match="Unknown target status 'archived'"):
+        sources_for(DOCUMENT_TRANSITIONS, "archived", None)
+
+
+def test_document_batch_events_carry_the_status_name():
+    from app.services.status_transitions import BATCH_NOTIFY, document_transitions
+
+    class Result:
+        def scalars(self):
+            return self
+
+        def all(self):
+            return [4, 5]
+
+    class FakeSession:
+        def __init__(self):
+            self.notified = []
+
+        def execute(self, statement, params=None):
+            if statement is BATCH_NOTIFY:
+                self.notified.append(params)
+            return Result()
+
+        def commit(self):
+            pass
+
+    db = FakeSession()
+    # Documents store the DocumentStatus id (3 here); events and audit use the name
+    ids = document_transitions._apply(db, [], 3, "processed")
+    assert ids == [4, 5]
+    assert db.notified == [{"table": "documents", "ids": [4, 5], "status": "processed"}]
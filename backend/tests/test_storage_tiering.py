@@ -0,0 +1,112 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from app.core.config import settings
+from app.services.storage_tiering import (
+    COLD, HOT, RestoreInProgress, bytes_per_tier, cold_key, get_object_any_tier, tier_batch
+)
+
+
+def not_found(operation):
+    return ClientError({"Error": {"Code": "NoSuchKey" if operation == "GetObject" else "404"}}, operation)
+
+
+class FakeS3:
+    def __init__(self, objects, storage_class="STANDARD_IA"):
+        self.objects = objects
+        self.storage_class = storage_class
+        self.restores = []
+
+    def get_object(self, Bucket, Key, **params):
+        if Key not in self.objects:
+            raise not_found("GetObject")
+        return {"Body": self.objects[Key], "Key": Key}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise not_found("HeadObject")
+        return {"StorageClass": self.storage_class, "ContentLength": 1}
+
+    def restore_object(self, Bucket, Key, RestoreRequest):
+        self.restores.append(Key)
+
+    def copy_object(self, Bucket, Key, CopySource, **params):
+        self.objects[Key] = self.objects[CopySource["Key"]]
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def get_paginator(self, operation):
+        return self
+
+    def paginate(self, Bucket):
+        yield {"Contents": [
+            {"Key": key, "Size": len(body), "StorageClass": self.storage_class if key.startswith("cold/") else "STANDARD"}
+            for key, body in self.objects.items()
+        ]}
+
+
+class FakeClient:
+    def __init__(self, s3):
+        self.s3 = s3
+
+
+def test_hot_object_is_read_directly():
+    client = FakeClient(FakeS3({"pdfs/a.pdf": b"hot"}))
+    assert get_object_any_tier(client, "bucket", "pdfs/a.pdf")["Key"] == "pdfs/a.pdf"
+
+
+def test_moved_object_is_read_from_the_cold_prefix():
+    client = FakeClient(FakeS3({cold_key("pdfs/a.pdf"): b"cold"}))
+    assert get_object_any_tier(client, "bucket", "pdfs/a.pdf")["Key"] == cold_key("pdfs/a.pdf")
+    assert get_object_any_tier(client, "bucket", "pdfs/a.pdf", COLD)["Key"] == cold_key("pdfs/a.pdf")
+
+
+def test_missing_object_raises_file_not_found():
+    with pytest.raises(FileNotFoundError):
+        get_object_any_tier(FakeClient(FakeS3({})), "bucket", "pdfs/a.pdf")
+
+
+def test_archived_copy_requests_a_restore(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_COLD_RESTORE_TIER", "Standard")
+    s3 = FakeS3({cold_key("pdfs/a.pdf"): b"cold"}, storage_class="GLACIER")
+    with pytest.raises(RestoreInProgress):
+        get_object_any_tier(FakeClient(s3), "bucket", "pdfs/a.pdf", COLD)
+    assert s3.restores == [cold_key("pdfs/a.pdf")]
+
+
+def test_cold_row_reads_a_shared_key_rehydrated_for_another_article():
+    client = FakeClient(FakeS3({"pdfs/a.pdf": b"hot"}))
+    assert get_object_any_tier(client, "bucket", "pdfs/a.pdf", COLD)["Key"] == "pdfs/a.pdf"
+
+
+def test_shared_source_is_kept_for_articles_left_behind(monkeypatch):
+    from sqlalchemy import create_engine, insert, select
+    from sqlalchemy.orm import Session
+    from app.models.article_queue import ArticleQueue
+
+    monkeypatch.setattr(settings, "PDF_COLD_PREFIX", "cold/")
+    engine = create_engine("sqlite://")
+    ArticleQueue.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(ArticleQueue), [
+            {"id": 1, "doi": "10.1/a", "pdf_s3_key": "pdfs/shared.pdf", "storage_tier": HOT},
+            {"id": 2, "doi": "10.1/b", "pdf_s3_key": "pdfs/shared.pdf", "storage_tier": HOT},
+            {"id": 3, "doi": "10.1/c", "pdf_s3_key": "pdfs/own.pdf", "storage_tier": HOT},
+        ])
+    s3 = FakeS3({"pdfs/shared.pdf": b"shared", "pdfs/own.pdf": b"own"})
+    with Session(engine) as db:
+        rows = db.execute(select(ArticleQueue.id, ArticleQueue.pdf_s3_key, ArticleQueue.pdf_optimized_s3_key)
+                          .where(ArticleQueue.id.in_([1, 3]))).all()
+        counts = tier_batch(db, FakeClient(s3), "bucket", rows)
+    assert counts["articles"] == 2
+    # Article 2 is still hot and reads the shared key
+    assert set(s3.objects) == {"pdfs/shared.pdf", "cold/pdfs/shared.pdf", "cold/pdfs/own.pdf"}
+
+
+def test_hot_bytes_cover_every_key_outside_the_cold_prefix(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_COLD_PREFIX", "cold/")
+    s3 = FakeS3({"pdfs/a.pdf": b"12", "feeds/2024/b.pdf": b"345", "cold/pdfs/c.pdf": b"6"})
+    report = bytes_per_tier(FakeClient(s3), "bucket")
+    assert report[HOT] == {"STANDARD": {"objects": 2, "bytes": 5}}
+    assert report[COLD] == {"STANDARD_IA": {"objects": 1, "bytes": 1}}
@@ -0,0 +1,64 @@
+import os
+
+from app.core.config import settings
+from app.services import thumbnails
+from app.services.thumbnails import prune_disk_cache, read_disk_cache, thumbnail_key, write_disk_cache
+
+
+def test_thumbnail_key_follows_the_pdf():
+    first = thumbnail_key(7, "pdfs/a.pdf", 1, 240, "webp")
+    assert first == thumbnail_key(7, "pdfs/a.pdf", 1, 240, "webp")
+    assert first.startswith("thumbnails/7/") and first.endswith("/p1-w240.webp")
+    assert thumbnail_key(7, "pdfs/b.pdf", 1, 240, "webp") != first
+
+
+def test_disk_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "THUMBNAIL_CACHE_DIR", str(tmp_path))
+    write_disk_cache("thumbnails/1/v/p1-w240.png", b"png")
+    assert read_disk_cache("thumbnails/1/v/p1-w240.png") == b"png"
+    assert read_disk_cache("thumbnails/2/v/p1-w240.png") is None
+
+
+def test_prune_removes_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "THUMBNAIL_CACHE_DIR", str(tmp_path))
+    for i in range(5):
+        path = tmp_path / f"{i}.png"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + i, 1000 + i))
+
+    assert prune_disk_cache(1000) == 0
+    freed = prune_disk_cache(300)
+    assert freed == 300
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["3.png", "4.png"]
+
+
+def test_writes_trigger_pruning(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "THUMBNAIL_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "THUMBNAIL_CACHE_MAX_BYTES", 1000)
+    monkeypatch.setattr(thumbnails, "_disk_cache_written", 0)
+    for i in range(30):
+        write_disk_cache(f"thumbnails/{i}.png", b"x" * 100)
+    total = sum(p.stat().st_size for p in tmp_path.rglob("*") if p.is_file())
+    assert total <= 1000
+
+
+def test_page_count_is_stored_and_read_back(tmp_path, monkeypatch):
+    import asyncio
+
+    monkeypatch.setattr(settings, "THUMBNAIL_CACHE_DIR", str(tmp_path))
+    stored = {}
+
+    class FakeS3:
+        def put_object(self, Bucket, Key, Body, **params):
+            stored[Key] = Body
+
+    class FakeClient:
+        s3 = FakeS3()
+
+    keys = thumbnails.store_thumbnails(FakeClient(), 7, "pdfs/a.pdf", 2, [(1, b"p1", "png"), (2, b"p2", "png")], 240)
+    count_key = thumbnails.page_count_key(7, "pdfs/a.pdf")
+    assert stored[count_key] == b"2"
+    assert count_key.rsplit("/", 1)[0] == keys[1].rsplit("/", 1)[0]
+    # Served from the disk cache: no PDF download or render
+    assert asyncio.run(thumbnails.stored_page_count(FakeClient(), 7, "pdfs/a.pdf")) == 2
+    assert thumbnails.page_count_key(7, "pdfs/b.pdf") != count_key
@@ -173,6 +173,8 @@ const ArticleView = ({ article, onClose }) => {
   );
 };
 
+const RELOAD_DELAY_MS = 500;
+
 const ArticleList = () => {
   const [articles, setArticles] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -195,6 +197,43 @@ const ArticleList = () => {
     fetchArticles();
   }, []);
 
+  // Live updates: changes arriving within RELOAD_DELAY_MS share one reload of
+  // the current page, so bursts cost a single request and the page never grows
+  useEffect(() => {
+    const events = new EventSource('http://localhost:8000/api/v1/events/?table=article');
+    let reloadTimer = null;
+
+    const scheduleReload = () => {
+      if (reloadTimer) return;
+      reloadTimer = setTimeout(async () => {
+        reloadTimer = null;
+        try {
+          const response = await axios.get('http://localhost:8000/api/v1/article-queue');
+          setArticles(response.data);
+        } catch (err) {
+          console.error('Error refreshing articles:', err);
+        }
+      }, RELOAD_DELAY_MS);
+    };
+
+    events.addEventListener('article', (e) => {
+      const change = JSON.parse(e.data);
+      if (change.op === 'delete') {
+        setArticles(prev => prev.filter(a => a.id !== change.id));
+        return;
+      }
+      scheduleReload();
+    });
+
+    // Sent when this client fell behind or the server missed notifications
+    events.addEventListener('resync', scheduleReload);
+
+    return () => {
+      clearTimeout(reloadTimer);
+      events.close();
+    };
+  }, []);
+
   const handleView = (articleId) => {
     const article = articles.find(a => a.id === articleId);
     setSelectedArticle(article);
@@ -240,6 +279,15 @@ const ArticleList = () => {
               <tr key={article.id}>
                 <td>
                   <div className="article-title">
+                    {article.pdf_s3_key && (
+                      <img
+                        className="article-thumbnail"
+                        src={`http://localhost:8000/api/v1/thumbnails/${article.id}/1?pdf=${encodeURIComponent(article.pdf_s3_key)}`}
+                        alt=""
+                        loading="lazy"
+                        onError={(e) => { e.currentTarget.style.display = 'none'; }}
+                      />
+                    )}
                     {article.title}
                     {article.doi && <div className="article-doi">DOI: {article.doi}</div>}
                   </div>
@@ -73,10 +73,118 @@ const PdfViewer = ({ articleId, initialAnnotationData }) => {
     setSelectedLabel(newLabel);
   };
 
+  // Live collaboration: per-rectangle ops over a WebSocket, persisted by the server
+  const wsRef = useRef(null);
+  const rectSeqRef = useRef({});
+  const rectanglesRef = useRef([]);
+  const pendingOpsRef = useRef({});
+  const opTimerRef = useRef(null);
+  const [isLive, setIsLive] = useState(false);
+
+  useEffect(() => {
+    rectanglesRef.current = rectangles;
+  }, [rectangles]);
+
+  const toAnnotation = (rect, text) => ({
+    id: rect.id,
+    coordinates: {
+      left: Math.round(rect.x),
+      top: Math.round(rect.y),
+      right: Math.round(rect.x + rect.width),
+      bottom: Math.round(rect.y + rect.height)
+    },
+    page_num: rect.page,
+    section_type: rect.label,
+    text: text ?? rect.text ?? ''
+  });
+
+  const applyRemote = (id, annotation) => {
+    setRectangles(prev => {
+      const others = prev.filter(r => r.id !== id);
+      if (!annotation) return others;
+      const [rect] = processLoadedAnnotations({ annotations: [annotation] });
+      const index = prev.findIndex(r => r.id === id);
+      if (index === -1) return [...others, rect];
+      const next = [...prev];
+      next[index] = rect;
+      return next;
+    });
+  };
+
+  useEffect(() => {
+    const ws = new WebSocket(`ws://localhost:8000/api/v1/collab/${articleId}`);
+    wsRef.current = ws;
+
+    ws.onopen = () => setIsLive(true);
+    ws.onclose = () => setIsLive(false);
+    ws.onmessage = (e) => {
+      const message = JSON.parse(e.data);
+      if (message.type === 'snapshot') {
+        rectSeqRef.current = { ...message.rect_seq };
+        setRectangles(processLoadedAnnotations({ annotations: message.annotations }));
+      } else if (message.type === 'op') {
+        rectSeqRef.current[message.id] = message.seq;
+        applyRemote(message.id, message.annotation);
+      } else if (message.type === 'reject') {
+        // Someone else changed this rectangle first; show their version
+        rectSeqRef.current[message.id] = message.seq;
+        applyRemote(message.id, message.current);
+      }
+    };
+
+    return () => {
+      clearTimeout(opTimerRef.current);
+      ws.close();
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [articleId]);
+
+  const flushOps = async () => {
+    opTimerRef.current = null;
+    const ops = Object.values(pendingOpsRef.current);
+    pendingOpsRef.current = {};
+    const ws = wsRef.current;
+    if (!ws || ws.readyState !== WebSocket.OPEN) return;
+
+    for (const { op, rect } of ops) {
+      let annotation;
+      if (op === 'upsert' && pdfDoc) {
+        const page = await pdfDoc.getPage(rect.page);
+        annotation = toAnnotation(rect, await extractTextFromPdf(rect, page));
+      } else if (op === 'upsert') {
+        annotation = toAnnotation(rect);
+      }
+      ws.send(JSON.stringify({
+        op,
+        id: rect.id,
+        base_seq: rectSeqRef.current[rect.id] || 0,
+        annotation,
+        client_op_id: `${rect.id}:${Date.now()}`
+      }));
+    }
+  };
+
+  const queueOp = (op, rect) => {
+    // Drags fire on every mouse move; only the latest state of a rectangle is sent
+    pendingOpsRef.current[rect.id] = { op, rect };
+    if (!opTimerRef.current) {
+      opTimerRef.current = setTimeout(flushOps, 100);
+    }
+  };
+
   const handleAnnotationsChange = (newRectangles) => {
-    setRectangles(newRectangles);
-    // Optionally auto-save when rectangles change
-    // handleSaveAnnotations();
+    const withIds = newRectangles.map(r => (r.id ? r : { ...r, id: Math.random().toString(36).slice(2) }));
+    if (isLive) {
+      const previous = Object.fromEntries(rectanglesRef.current.map(r => [r.id, r]));
+      const current = new Set(withIds.map(r => r.id));
+      withIds.forEach(rect => {
+        if (previous[rect.id] !== rect) queueOp('upsert', rect);
+      });
+      rectanglesRef.current.forEach(rect => {
+        if (!current.has(rect.id)) queueOp('delete', rect);
+      });
+    }
+    setRectangles(withIds);
   };
 
   const processLoadedAnnotations = (annotationData) => {
@@ -135,7 +243,9 @@ const PdfViewer = ({ articleId, initialAnnotationData }) => {
           }
         }
 
-        const pdfUrl = `http://localhost:8000/api/v1/s3/get-pdf-by-key/${encodeURIComponent(articleResponse.data.pdf_s3_key)}`;
+        // The linearized copy lets pdf.js render the first page before the download finishes
+        const pdfKey = articleResponse.data.pdf_optimized_s3_key || articleResponse.data.pdf_s3_key;
+        const pdfUrl = `http://localhost:8000/api/v1/s3/get-pdf-by-key/${encodeURIComponent(pdfKey)}`;
         setPdfUrl(pdfUrl);
       } catch (error) {
         console.error('Error loading article data:', error);
@@ -206,6 +316,10 @@ const PdfViewer = ({ articleId, initialAnnotationData }) => {
   };
 
   const handleSaveAnnotations = async () => {
+    if (isLive) {
+      alert('Live editing is on: changes are saved automatically.');
+      return;
+    }
     try {
       const pdfPages = {};
       
@@ -260,6 +260,7 @@ const RectangleAnnotations = ({
       
       setIsDrawing(true);
       setCurrentRect({
+        id: `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`,
         x,
         y,
         width: 0,
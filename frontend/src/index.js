@@ -2,6 +2,7 @@ import React from 'react';
 import { createRoot } from 'react-dom/client';
 import './index.css';
 import App from './App';
+import './services/readYourWrites';
 
 // Get the root element
 const container = document.getElementById('root');
@@ -0,0 +1,21 @@
+import axios from 'axios';
+
+// The API answers writes with this header; echoing it back keeps our reads on
+// the primary database until our own writes have reached the replicas.
+// A cookie would not survive the cross-origin requests from the dev server.
+const HEADER = 'x-read-primary-until';
+
+let primaryUntil = 0;
+
+axios.interceptors.request.use(config => {
+  if (primaryUntil > Date.now() / 1000) {
+    config.headers = { ...config.headers, [HEADER]: String(primaryUntil) };
+  }
+  return config;
+});
+
+axios.interceptors.response.use(response => {
+  const until = Number(response.headers[HEADER]);
+  if (until > primaryUntil) primaryUntil = until;
+  return response;
+});